@@ -12,7 +12,7 @@ import uuid
 
 # Імпорт власних модулів
 from config import config
-from modules.speech_module import get_speech_module
+from modules.speech_module import SynthesisError, get_speech_module
 from modules.chatbot_module import get_chatbot
 from modules.energy_calculator import get_energy_calculator
 
@@ -133,6 +133,68 @@ def show_home_page():
         • Неділя: 10:00-16:00
         """)
 
+def render_chat_history(messages, speech_module):
+    """Відображення повідомлень чату з аудіо відповідей бота"""
+    for message in messages:
+        with st.chat_message(message["role"]):
+            st.markdown(message["content"])
+            
+            # Відтворення аудіо для відповідей бота
+            if message["role"] == "assistant" and "audio" in message:
+                audio_html = speech_module.create_audio_player(message["audio"])
+                st.markdown(audio_html, unsafe_allow_html=True)
+
+def respond_in_chat(user_input, chatbot, speech_module):
+    """
+    Обробка питання користувача в чаті
+    
+    Текст відповіді показується одразу після відповіді чат-бота, а синтез
+    мовлення виконується у фоні: аудіо-плеєр додається до відповіді, щойно
+    аудіо готове.
+    """
+    # Додавання повідомлення користувача
+    st.session_state.messages.append({"role": "user", "content": user_input})
+    
+    # Відображення історії чату перед обробкою (всі крім останнього)
+    with st.container():
+        render_chat_history(st.session_state.messages[:-1], speech_module)
+    
+    # Відображення нового повідомлення користувача
+    with st.chat_message("user"):
+        st.markdown(user_input)
+    
+    # Отримання відповіді від чат-бота
+    with st.chat_message("assistant"):
+        with st.spinner("🤔 Думаю..."):
+            response = chatbot.process_message(user_input, st.session_state.user_id)
+        
+        # Синтез мовлення для відповіді починається у фоні до показу тексту
+        audio_future = None
+        if st.session_state.tts_enabled:
+            audio_future = speech_module.text_to_speech_async(
+                response,
+                voice=st.session_state.selected_voice
+            )
+        
+        # Текст відповіді показується і зберігається без очікування синтезу
+        st.markdown(response)
+        message = {"role": "assistant", "content": response}
+        st.session_state.messages.append(message)
+        
+        if audio_future is not None:
+            audio_placeholder = st.empty()
+            audio_placeholder.caption("🔊 Готую голосову відповідь...")
+            try:
+                audio_data = audio_future.result()
+            except SynthesisError as e:
+                # Помилка з потоку синтезу показується тут, у потоці сценарію
+                audio_placeholder.error(str(e))
+            else:
+                # Відтворення аудіо
+                audio_html = speech_module.create_audio_player(audio_data, autoplay=True)
+                audio_placeholder.markdown(audio_html, unsafe_allow_html=True)
+                message["audio"] = audio_data
+
 def show_chatbot_page():
     """Сторінка чат-бота"""
     st.title("💬 Чат-бот підтримки УкрЕнерго")
@@ -180,142 +242,28 @@ def show_chatbot_page():
         if audio_bytes:
             with st.spinner("🎤 Розпізнаю мовлення..."):
                 recognized_text = speech_module.speech_to_text(audio_data=audio_bytes)
-                if recognized_text:
-                    user_input = recognized_text
-                    
-                    # Додавання повідомлення користувача
-                    st.session_state.messages.append({"role": "user", "content": user_input})
-                    
-                    # Відображення історії чату перед обробкою
-                    chat_container = st.container()
-                    with chat_container:
-                        for message in st.session_state.messages[:-1]:  # Всі крім останнього
-                            with st.chat_message(message["role"]):
-                                st.markdown(message["content"])
-                                if message["role"] == "assistant" and "audio" in message:
-                                    audio_html = speech_module.create_audio_player(message["audio"])
-                                    st.markdown(audio_html, unsafe_allow_html=True)
-                    
-                    # Відображення нового повідомлення користувача
-                    with st.chat_message("user"):
-                        st.markdown(user_input)
-
-                    # Отримання відповіді від чат-бота
-                    with st.chat_message("assistant"):
-                        with st.spinner("🤔 Думаю..."):
-                            response = chatbot.process_message(user_input, st.session_state.user_id)
-                            st.markdown(response)
-                        
-                        # Синтез мовлення для відповіді
-                        if st.session_state.tts_enabled:
-                            audio_data = speech_module.text_to_speech(
-                                response,
-                                voice=st.session_state.selected_voice
-                            )
-                            
-                            if audio_data:
-                                # Відтворення аудіо
-                                audio_html = speech_module.create_audio_player(audio_data, autoplay=True)
-                                st.markdown(audio_html, unsafe_allow_html=True)
-                                
-                                # Додавання відповіді бота з аудіо
-                                st.session_state.messages.append({
-                                    "role": "assistant",
-                                    "content": response,
-                                    "audio": audio_data
-                                })
-                            else:
-                                # Додавання відповіді бота без аудіо
-                                st.session_state.messages.append({
-                                    "role": "assistant",
-                                    "content": response
-                                })
-                        else:
-                            # Додавання відповіді бота без TTS
-                            st.session_state.messages.append({
-                                "role": "assistant",
-                                "content": response
-                            })
-                    
-                    # Очищення запису
-                    st.session_state.audio_recorder_key += 1
-                    st.rerun()
-                else:
-                    st.warning("❌ Не вдалося розпізнати мовлення.")
-                    st.session_state.audio_recorder_key += 1
-                    st.rerun()
+            
+            if recognized_text:
+                respond_in_chat(recognized_text, chatbot, speech_module)
+            else:
+                st.warning("❌ Не вдалося розпізнати мовлення.")
+            
+            # Очищення запису
+            st.session_state.audio_recorder_key += 1
+            st.rerun()
 
     # Відображення історії чату
     chat_container = st.container()
     
     with chat_container:
-        for message in st.session_state.messages:
-            with st.chat_message(message["role"]):
-                st.markdown(message["content"])
-                
-                # Відтворення аудіо для відповідей бота
-                if message["role"] == "assistant" and "audio" in message:
-                    audio_html = speech_module.create_audio_player(message["audio"])
-                    st.markdown(audio_html, unsafe_allow_html=True)
+        render_chat_history(st.session_state.messages, speech_module)
     
     # Введення повідомлення (текстовий ввід)
     user_input = st.chat_input("Введіть ваше питання...")
     
     # Обробка текстового повідомлення
     if user_input:
-        # Додавання повідомлення користувача
-        st.session_state.messages.append({"role": "user", "content": user_input})
-        
-        # Відображення історії чату перед обробкою
-        chat_container = st.container()
-        with chat_container:
-            for message in st.session_state.messages[:-1]:  # Всі крім останнього
-                with st.chat_message(message["role"]):
-                    st.markdown(message["content"])
-                    if message["role"] == "assistant" and "audio" in message:
-                        audio_html = speech_module.create_audio_player(message["audio"])
-                        st.markdown(audio_html, unsafe_allow_html=True)
-        
-        # Відображення нового повідомлення користувача
-        with st.chat_message("user"):
-            st.markdown(user_input)
-        
-        # Отримання відповіді від чат-бота
-        with st.chat_message("assistant"):
-            with st.spinner("🤔 Думаю..."):
-                response = chatbot.process_message(user_input, st.session_state.user_id)
-                st.markdown(response)
-            
-            # Синтез мовлення для відповіді
-            if st.session_state.tts_enabled:
-                audio_data = speech_module.text_to_speech(
-                    response,
-                    voice=st.session_state.selected_voice
-                )
-                
-                if audio_data:
-                    # Відтворення аудіо
-                    audio_html = speech_module.create_audio_player(audio_data, autoplay=True)
-                    st.markdown(audio_html, unsafe_allow_html=True)
-                    
-                    # Додавання відповіді бота з аудіо
-                    st.session_state.messages.append({
-                        "role": "assistant", 
-                        "content": response,
-                        "audio": audio_data
-                    })
-                else:
-                    # Додавання відповіді бота без аудіо
-                    st.session_state.messages.append({
-                        "role": "assistant", 
-                        "content": response
-                    })
-            else:
-                # Додавання відповіді бота без TTS
-                st.session_state.messages.append({
-                    "role": "assistant", 
-                    "content": response
-                })
+        respond_in_chat(user_input, chatbot, speech_module)
         st.rerun()
     
     # Панель з прикладами питань
@@ -325,59 +273,7 @@ def show_chatbot_page():
     # Функція для обробки прикладних питань
     def process_example_question(question):
         """Обробка прикладної кнопки питання"""
-        # Додавання повідомлення користувача
-        st.session_state.messages.append({"role": "user", "content": question})
-        
-        # Відображення історії чату перед обробкою
-        chat_container = st.container()
-        with chat_container:
-            for message in st.session_state.messages[:-1]:  # Всі крім останнього
-                with st.chat_message(message["role"]):
-                    st.markdown(message["content"])
-                    if message["role"] == "assistant" and "audio" in message:
-                        audio_html = speech_module.create_audio_player(message["audio"])
-                        st.markdown(audio_html, unsafe_allow_html=True)
-        
-        # Відображення нового повідомлення користувача
-        with st.chat_message("user"):
-            st.markdown(question)
-        
-        # Отримання відповіді від чат-бота
-        with st.chat_message("assistant"):
-            with st.spinner("🤔 Думаю..."):
-                response = chatbot.process_message(question, st.session_state.user_id)
-                st.markdown(response)
-            
-            # Синтез мовлення для відповіді
-            if st.session_state.tts_enabled:
-                audio_data = speech_module.text_to_speech(
-                    response,
-                    voice=st.session_state.selected_voice
-                )
-                
-                if audio_data:
-                    # Відтворення аудіо
-                    audio_html = speech_module.create_audio_player(audio_data, autoplay=True)
-                    st.markdown(audio_html, unsafe_allow_html=True)
-                    
-                    # Додавання відповіді бота з аудіо
-                    st.session_state.messages.append({
-                        "role": "assistant", 
-                        "content": response,
-                        "audio": audio_data
-                    })
-                else:
-                    # Додавання відповіді бота без аудіо
-                    st.session_state.messages.append({
-                        "role": "assistant", 
-                        "content": response
-                    })
-            else:
-                # Додавання відповіді бота без TTS
-                st.session_state.messages.append({
-                    "role": "assistant", 
-                    "content": response
-                })
+        respond_in_chat(question, chatbot, speech_module)
         st.rerun()
 
     col1, col2 = st.columns(2)
@@ -745,6 +641,63 @@ def show_analytics_page():
         with col4:
             st.metric("STT запитів", speech_stats.get('stt_requests', 0))
         
+        # Ефективність кешу синтезованого аудіо
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("Влучання в кеш аудіо", f"{speech_stats.get('audio_cache_hit_rate', 0):.1f}%")
+        
+        with col2:
+            st.metric("Заощаджено синтезу", f"{speech_stats.get('audio_cache_bytes_saved', 0) / 2**20:.1f} МБ")
+        
+        with col3:
+            st.metric("Розмір кешу аудіо", f"{speech_stats.get('audio_cache_bytes', 0) / 2**20:.1f} МБ")
+        
+        # Повторне використання синтезаторів з відкритим з'єднанням
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.metric("Повторних використань синтезатора", speech_stats.get('synthesizers_reused', 0))
+        
+        with col2:
+            st.metric("Заощаджено на з'єднаннях", f"{speech_stats.get('synthesizer_latency_saved_ms', 0):.0f} мс")
+        
+        # Розподіл часу відповіді чат-бота
+        response_time = bot_stats.get('response_time', {})
+        st.markdown("#### Час відповіді чат-бота")
+        
+        col1, col2, col3, col4, col5 = st.columns(5)
+        
+        with col1:
+            st.metric("Середній", f"{response_time.get('mean', 0) * 1000:.1f} мс")
+        
+        with col2:
+            st.metric("p50", f"{response_time.get('p50', 0) * 1000:.1f} мс")
+        
+        with col3:
+            st.metric("p90", f"{response_time.get('p90', 0) * 1000:.1f} мс")
+        
+        with col4:
+            st.metric("p99", f"{response_time.get('p99', 0) * 1000:.1f} мс")
+        
+        with col5:
+            st.metric("Максимум", f"{response_time.get('max', 0) * 1000:.1f} мс")
+        
+        # Час окремих етапів обробки запиту
+        stages = bot_stats.get('stages', {})
+        if stages:
+            df_stages = pd.DataFrame([
+                {
+                    'Етап': stage,
+                    'Запитів': stage_stats['count'],
+                    'p50, мс': stage_stats['p50'] * 1000,
+                    'p99, мс': stage_stats['p99'] * 1000,
+                    'Максимум, мс': stage_stats['max'] * 1000
+                }
+                for stage, stage_stats in stages.items()
+            ])
+            st.dataframe(df_stages, use_container_width=True, hide_index=True)
+        
         # Графіки
         st.markdown("---")
         st.markdown("#### Графіки активності")
@@ -863,7 +816,7 @@ def show_analytics_page():
                 export_data = {}
                 
                 if "Історія чату" in export_options:
-                    export_data['chat_history'] = chatbot.get_conversation_history()
+                    export_data['chat_history'] = chatbot.get_conversation_history(st.session_state.user_id)
                 
                 if "Статистика" in export_options:
                     export_data['statistics'] = {
@@ -0,0 +1,55 @@
+"""
+Бенчмарк пакетної обробки: цикл process_message проти process_messages
+
+Окрім різних запитів, перевіряється повтор журналу, де більшість
+повідомлень повторюються (як у справжніх журналах запитів).
+
+Запуск з кореня проєкту:
+    python -m benchmarks.bench_batch
+"""
+
+import random
+import time
+from unittest.mock import patch
+
+from benchmarks.common import build_chatbot, make_queries, make_synthetic_faq
+
+FAQ_SIZE = 5000
+MESSAGE_COUNT = 2000
+
+# Кількість різних повідомлень у журналі з повторами
+DISTINCT_LOG_MESSAGES = 300
+
+
+def main():
+    faq_data = make_synthetic_faq(FAQ_SIZE, seed=5)
+    workloads = {
+        'різні': make_queries(faq_data, MESSAGE_COUNT, seed=11),
+    }
+    distinct = make_queries(faq_data, DISTINCT_LOG_MESSAGES, seed=13)
+    rng = random.Random(17)
+    workloads['журнал'] = [rng.choice(distinct) for _ in range(MESSAGE_COUNT)]
+
+    print(f"FAQ: {FAQ_SIZE} питань, повідомлень: {MESSAGE_COUNT} "
+          f"(журнал - {DISTINCT_LOG_MESSAGES} різних)")
+    print(f"{'алгоритм':>9} | {'запити':>7} | {'цикл, пов/с':>12} | {'пакет, пов/с':>13} | {'прискорення':>11}")
+    print('-' * 66)
+
+    for matcher in ('sequence', 'tfidf'):
+        for workload, messages in workloads.items():
+            # Кеш вимкнено, щоб порівнювати саму обробку
+            chatbot = build_chatbot(faq_data, faq_matcher=matcher, response_cache_size=0)
+
+            with patch('modules.chatbot_module.st'):
+                start = time.perf_counter()
+                for message in messages:
+                    chatbot.process_message(message)
+                loop_rate = len(messages) / (time.perf_counter() - start)
+
+            batch_rate = chatbot.process_messages(messages)['messages_per_second']
+            print(f"{matcher:>9} | {workload:>7} | {loop_rate:>12.0f} | {batch_rate:>13.0f} | "
+                  f"{batch_rate / loop_rate:>10.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Бенчмарк холодного старту: розбір faq.json проти скомпільованого артефакту
+
+Запуск з кореня проєкту:
+    python -m benchmarks.bench_cold_start
+"""
+
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from unittest.mock import patch
+
+from benchmarks.common import make_synthetic_faq
+from modules.chatbot_module import UkrenergoChatbot
+from modules.faq_artifact import compile_faq
+
+FAQ_SIZES = [1000, 10000, 50000]
+
+
+def measure(faq_file: str, faq_matcher: str):
+    """Час створення чат-бота та виділена Python-пам'ять"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    with patch('modules.chatbot_module.st'):
+        chatbot = UkrenergoChatbot(faq_file=faq_file, faq_matcher=faq_matcher)
+    chatbot._search_faq('як оплатити рахунок')
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_ms, peak / 2 ** 20
+
+
+def main():
+    print(f"{'FAQ':>7} | {'алгоритм':>9} | {'JSON, мс':>9} | {'JSON, МБ':>9} | {'артефакт, мс':>13} | {'артефакт, МБ':>13}")
+    print('-' * 76)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in FAQ_SIZES:
+            faq_data = make_synthetic_faq(size, seed=size)
+            json_path = os.path.join(directory, f'faq_{size}.json')
+            artifact_path = os.path.join(directory, f'faq_{size}.faqidx')
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(faq_data, f, ensure_ascii=False)
+            compile_faq(faq_data, artifact_path)
+
+            for faq_matcher in ('sequence', 'tfidf'):
+                json_ms, json_mb = measure(json_path, faq_matcher)
+                artifact_ms, artifact_mb = measure(artifact_path, faq_matcher)
+                print(f"{size:>7} | {faq_matcher:>9} | {json_ms:>9.1f} | {json_mb:>9.1f} | "
+                      f"{artifact_ms:>13.1f} | {artifact_mb:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
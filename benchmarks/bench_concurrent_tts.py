@@ -0,0 +1,124 @@
+"""
+Бенчмарк одночасного синтезу мовлення з різними голосами
+
+Замість Azure використовується локальний синтезатор-замінник: встановлення
+з'єднання та синтез імітуються очікуванням (як мережевий виклик, без
+навантаження на процесор). Порівнюється синтез під спільним блокуванням
+(як вимагала спільна змінювана конфігурація) та паралельний синтез
+з окремими конфігураціями голосів. Аудіо замінника містить голос
+конфігурації синтезатора, тож перевіряється, що жоден запит не отримав
+чужий голос.
+
+Запуск з кореня проєкту:
+    python -m benchmarks.bench_concurrent_tts
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from modules.speech_module import UkrenergoSpeechModule
+
+THREAD_COUNTS = [1, 4, 16]
+REQUESTS = 64
+VOICES = ['uk-UA-PolinaNeural', 'uk-UA-OstapNeural']
+
+# Імітована тривалість встановлення з'єднання та синтезу (секунд)
+CONNECT_SECONDS = 0.05
+SYNTHESIS_SECONDS = 0.02
+
+
+class StandInSpeechConfig:
+    """Конфігурація замінника: лише поля, які читає синтезатор"""
+
+    def __init__(self, subscription: str, region: str):
+        self.speech_synthesis_voice_name = None
+        self.speech_recognition_language = None
+
+    def set_speech_synthesis_output_format(self, output_format):
+        self.output_format = output_format
+
+
+class StandInSynthesizer:
+    """Синтезатор, що відповідає голосом своєї конфігурації"""
+
+    def __init__(self, speech_config: StandInSpeechConfig, audio_config=None):
+        self.voice = speech_config.speech_synthesis_voice_name
+        self.connected = False
+
+    def speak_ssml_async(self, ssml: str):
+        return SimpleNamespace(get=lambda: self._speak(ssml))
+
+    def _speak(self, ssml: str):
+        if not self.connected:
+            time.sleep(CONNECT_SECONDS)
+            self.connected = True
+        time.sleep(SYNTHESIS_SECONDS)
+        return SimpleNamespace(reason='completed', audio_data=f'{self.voice}|{hash(ssml)}'.encode('utf-8'))
+
+
+class StandInConnection:
+    """Попереднє з'єднання замінника: встановлюється одразу під час прогріву"""
+
+    def __init__(self, synthesizer: StandInSynthesizer):
+        self.synthesizer = synthesizer
+
+    @classmethod
+    def from_speech_synthesizer(cls, synthesizer: StandInSynthesizer) -> 'StandInConnection':
+        return cls(synthesizer)
+
+    def open(self, for_continuous_recognition: bool):
+        time.sleep(CONNECT_SECONDS)
+        self.synthesizer.connected = True
+
+
+STAND_IN_SDK = SimpleNamespace(
+    SpeechConfig=StandInSpeechConfig,
+    SpeechSynthesizer=StandInSynthesizer,
+    Connection=StandInConnection,
+    SpeechSynthesisOutputFormat=SimpleNamespace(Riff24Khz16BitMonoPcm='riff-24khz-16bit-mono-pcm'),
+    ResultReason=SimpleNamespace(SynthesizingAudioCompleted='completed'),
+)
+
+
+def run(threads: int, serialized: bool) -> tuple:
+    """Запити до свіжого модулю з кількох потоків: (запитів за секунду, запитів з чужим голосом)"""
+    module = UkrenergoSpeechModule(speech_key='stand-in', region='local', synthesizer_pool_size=threads)
+    module.warm_up(VOICES)
+    lock = threading.Lock()
+
+    def synthesize(position: int) -> bool:
+        voice = VOICES[position % len(VOICES)]
+        if serialized:
+            with lock:
+                audio_data = module.text_to_speech(f'Відповідь номер {position}', voice=voice)
+        else:
+            audio_data = module.text_to_speech(f'Відповідь номер {position}', voice=voice)
+        return audio_data.decode('utf-8').split('|')[0] == voice
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        correct = list(executor.map(synthesize, range(REQUESTS)))
+    elapsed = time.perf_counter() - start
+    return REQUESTS / elapsed, correct.count(False)
+
+
+def main():
+    print(f"Запитів: {REQUESTS}, голосів: {len(VOICES)}, "
+          f"синтез {SYNTHESIS_SECONDS * 1000:.0f} мс, з'єднання {CONNECT_SECONDS * 1000:.0f} мс")
+    header = f"{'потоків':>8} | {'під блокуванням, RPS':>21} | {'паралельно, RPS':>16} | {'прискорення':>11} | {'чужий голос':>11}"
+    print(header)
+    print('-' * len(header))
+
+    with patch('modules.speech_module.speechsdk', STAND_IN_SDK), patch('modules.speech_module.st', MagicMock()):
+        for threads in THREAD_COUNTS:
+            serialized_rps, _ = run(threads, serialized=True)
+            parallel_rps, mismatches = run(threads, serialized=False)
+            print(f"{threads:>8} | {serialized_rps:>21.1f} | {parallel_rps:>16.1f} | "
+                  f"{parallel_rps / serialized_rps:>10.1f}x | {mismatches:>11}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Бенчмарк пошуку у FAQ: повний перебір проти інвертованого індексу
+та векторизованого TF-IDF
+
+Запуск з кореня проєкту:
+    python -m benchmarks.bench_faq_search
+"""
+
+import time
+from difflib import SequenceMatcher
+from typing import Optional
+
+from benchmarks.common import build_chatbot, make_queries, make_synthetic_faq
+from modules.text_processing import normalize_text, prepare_text
+
+FAQ_SIZES = [100, 1000, 5000, 20000]
+QUERIES_PER_SIZE = 200
+
+
+def linear_search(faq_data: dict, query: str) -> Optional[str]:
+    """Пошук у FAQ повним перебором (попередня реалізація)"""
+    best_match = None
+    best_score = 0
+
+    for question in faq_data.get('questions', []):
+        if any(keyword in query for keyword in question.get('keywords', [])):
+            return question['answer']
+
+        question_text = normalize_text(question['question'])
+        similarity = SequenceMatcher(None, query, question_text).ratio()
+        if similarity > best_score and similarity > 0.7:
+            best_score = similarity
+            best_match = question['answer']
+
+    return best_match
+
+
+def time_per_query(search, queries) -> float:
+    """Середній час одного запиту в мілісекундах"""
+    start = time.perf_counter()
+    for query in queries:
+        search(query)
+    return (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def main():
+    print(f"{'FAQ':>7} | {'перебір, мс':>12} | {'індекс, мс':>11} | {'TF-IDF, мс':>11}")
+    print('-' * 52)
+
+    for size in FAQ_SIZES:
+        faq_data = make_synthetic_faq(size, seed=size)
+        chatbot = build_chatbot(faq_data)
+        tfidf_chatbot = build_chatbot(faq_data, faq_matcher='tfidf')
+        raw_queries = make_queries(faq_data, QUERIES_PER_SIZE, seed=42)
+        queries = [prepare_text(query) for query in raw_queries]
+
+        # Повний перебір занадто повільний на великих FAQ, тому менше запитів
+        linear_queries = [normalize_text(query) for query in raw_queries[:max(5, QUERIES_PER_SIZE * 100 // size)]]
+        linear_ms = time_per_query(lambda q: linear_search(faq_data, q), linear_queries)
+        indexed_ms = time_per_query(chatbot._search_faq, queries)
+        tfidf_ms = time_per_query(tfidf_chatbot._search_faq, queries)
+
+        print(f"{size:>7} | {linear_ms:>12.3f} | {indexed_ms:>11.3f} | {tfidf_ms:>11.3f}")
+
+
+if __name__ == '__main__':
+    main()
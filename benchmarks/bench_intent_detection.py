@@ -0,0 +1,78 @@
+"""
+Бенчмарк визначення інтентів: нечітке порівняння з кожним шаблоном
+проти автомата Ахо-Корасік
+
+Запуск з кореня проєкту:
+    python -m benchmarks.bench_intent_detection
+"""
+
+import random
+import time
+from difflib import SequenceMatcher
+
+from benchmarks.common import build_chatbot, make_word
+
+PATTERN_COUNTS = [50, 500, 5000]
+MESSAGES = [
+    "привіт як оплатити рахунок",
+    "у мене світла немає вже дві години",
+    "які зараз тарифи на електроенергію",
+    "як передати показники лічильника",
+]
+REPEATS = 50
+
+
+def fuzzy_detect(intents: dict, text: str) -> str:
+    """Визначення інтенту лише нечітким порівнянням (попередня реалізація)"""
+    best_intent = 'unknown'
+    best_score = 0
+
+    for intent_name, intent_data in intents.items():
+        for pattern in intent_data['patterns']:
+            similarity = SequenceMatcher(None, text, pattern).ratio()
+            if similarity > best_score and similarity > 0.6:
+                best_score = similarity
+                best_intent = intent_name
+
+    return best_intent
+
+
+def main():
+    rng = random.Random(7)
+    chatbot = build_chatbot({'categories': {}, 'questions': []})
+    base_intents = chatbot.intents
+    # _detect_intent приймає запит після нормалізації чат-бота
+    queries = [chatbot._normalize_text(message) for message in MESSAGES]
+
+    print(f"{'шаблонів':>9} | {'нечітко, мс':>12} | {'автомат, мс':>12}")
+    print('-' * 40)
+
+    for count in PATTERN_COUNTS:
+        # Додаткові синтетичні інтенти до заданої кількості шаблонів
+        intents = dict(base_intents)
+        for position in range(count // 10):
+            intents[f'synthetic_{position}'] = {
+                'patterns': [make_word(rng) for _ in range(10)],
+                'responses': ['Синтетична відповідь.']
+            }
+        chatbot.intents = intents
+        chatbot.intent_automaton = chatbot._build_intent_automaton()
+
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            for message in MESSAGES:
+                fuzzy_detect(intents, message)
+        fuzzy_ms = (time.perf_counter() - start) * 1000 / (REPEATS * len(MESSAGES))
+
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            for query in queries:
+                chatbot._detect_intent(query)
+        automaton_ms = (time.perf_counter() - start) * 1000 / (REPEATS * len(MESSAGES))
+
+        total_patterns = sum(len(data['patterns']) for data in intents.values())
+        print(f"{total_patterns:>9} | {fuzzy_ms:>12.3f} | {automaton_ms:>12.4f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+"""
+Бенчмарк семантичного пошуку: повнота та затримка на відкладених
+перефразуваннях порівняно з поточними алгоритмами
+
+Питання предметного FAQ доповнюються синтетичними питаннями-завадами,
+щоб показати залежність затримки від розміру FAQ.
+
+Запуск з кореня проєкту:
+    python -m benchmarks.bench_semantic_search
+"""
+
+import time
+
+import numpy as np
+
+from benchmarks.common import build_chatbot, make_synthetic_faq
+from modules.faq_index import FaqIndex
+from modules.faq_matchers import create_faq_matcher
+from modules.text_processing import prepare_text
+
+DISTRACTOR_COUNTS = [0, 1000, 10000, 50000]
+MATCHERS = ['sequence', 'tfidf', 'semantic']
+REPEATS = 10
+
+# Предметні питання: (питання, відкладені перефразування). Перефразування
+# написані незалежно від шаблонів інтентів (понять семантичного пошуку):
+# жоден шаблон не входить у них навіть частиною слова (перевіряє check_held_out),
+# тож повнота показує узагальнення, а не збіг зі словником понять
+DOMAIN_FAQ = [
+    ("Як оплатити рахунок за електроенергію?", [
+        "як розрахуватися за спожиту електрику",
+        "де внести кошти за електроенергію через банк",
+        "чи можна погасити борг за світло через застосунок",
+    ]),
+    ("Що робити при відключенні електроенергії?", [
+        "пропала електрика в усьому будинку",
+        "знеструмили вулицю куди звертатися",
+        "вимкнули світло вже третю годину",
+    ]),
+    ("Які діють тарифи для населення?", [
+        "скільки коштує одна кіловат година для квартири",
+        "почім електрика для побутових споживачів",
+        "скільки беруть за електроенергію з мешканців",
+    ]),
+    ("Як передати показники лічильника?", [
+        "куди повідомити покази приладу обліку",
+        "як подати дані з приладу обліку онлайн",
+        "де вказати спожиті кіловати за місяць",
+    ]),
+    ("Як підключити нову будівлю до мережі?", [
+        "як приєднати щойно збудований будинок до електромереж",
+        "хочу провести електрику в збудований котедж",
+        "що потрібно щоб заживити дачу від мережі",
+    ]),
+    ("Які документи потрібні для укладення договору?", [
+        "що треба принести щоб укласти договір",
+        "з чим іти в центр обслуговування для оформлення договору",
+        "перелік необхідного для договору постачання",
+    ]),
+    ("Як зв'язатися зі службою підтримки?", [
+        "як додзвонитися до оператора",
+        "куди написати якщо маю проблему з обслуговуванням",
+        "чи є гаряча лінія для клієнтів",
+    ]),
+]
+
+
+def build_faq(distractors: int) -> dict:
+    """Предметний FAQ з доданими синтетичними питаннями"""
+    faq_data = make_synthetic_faq(distractors, seed=distractors)
+    domain_questions = [
+        {'id': -position, 'question': question, 'answer': question, 'keywords': []}
+        for position, (question, _) in enumerate(DOMAIN_FAQ, start=1)
+    ]
+    faq_data['questions'] = domain_questions + faq_data['questions']
+    return faq_data
+
+
+def held_out_queries() -> list:
+    """Пари (нормалізоване перефразування, позиція очікуваного питання)"""
+    return [
+        (prepare_text(paraphrase), position)
+        for position, (_, paraphrases) in enumerate(DOMAIN_FAQ)
+        for paraphrase in paraphrases
+    ]
+
+
+def check_held_out(queries, concepts):
+    """
+    Перевірка незалежності перефразувань від понять
+
+    Args:
+        queries: Пари (нормалізоване перефразування, позиція питання)
+        concepts: Пари (нормалізований шаблон, назва поняття)
+
+    Raises:
+        ValueError: Якщо шаблон поняття входить у перефразування
+    """
+    for query, _ in queries:
+        for pattern, _ in concepts:
+            if pattern in query:
+                raise ValueError(f"Перефразування '{query}' містить шаблон поняття '{pattern}'")
+
+
+def evaluate(matcher, queries) -> tuple:
+    """Повнота (частка знайдених очікуваних питань) та середня затримка в мс"""
+    matches = matcher.match_batch([query for query, _ in queries])
+    found = sum(match is not None and match[0] == expected for match, (_, expected) in zip(matches, queries))
+
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for query, _ in queries:
+            matcher.match(query)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / (len(queries) * REPEATS)
+    return found / len(queries), elapsed_ms
+
+
+def exact_semantic_recall(matcher, queries) -> float:
+    """Повнота семантичного пошуку повним перебором (без LSH)"""
+    found = 0
+    for query, expected in queries:
+        scores = matcher.embedder.embed(query) @ matcher.dimension_vectors
+        best = int(np.argmax(scores))
+        found += best == expected and scores[best] > matcher.threshold
+    return found / len(queries)
+
+
+def main():
+    # Поняття - шаблони інтентів чат-бота
+    concepts = build_chatbot({'questions': []})._faq_concepts()
+    queries = held_out_queries()
+    check_held_out(queries, concepts)
+    print(f"Відкладених перефразувань: {len(queries)}")
+
+    header = f"{'FAQ':>7}"
+    for name in MATCHERS:
+        header += f" | {name + ': повнота / мс':>30}"
+    header += f" | {'без LSH':>8} | {'кандидатів':>10}"
+    print(header)
+    print('-' * len(header))
+
+    for distractors in DISTRACTOR_COUNTS:
+        index = FaqIndex(build_faq(distractors))
+        row = f"{len(index):>7}"
+
+        for name in MATCHERS:
+            matcher = create_faq_matcher(name, index, concepts=concepts)
+            recall, latency_ms = evaluate(matcher, queries)
+            row += f" | {f'{recall:.2f} / {latency_ms:.3f}':>30}"
+
+        # matcher - семантичний: повнота точного перебору та частка переглянутих питань
+        candidates = np.mean([len(matcher.lsh.query(matcher.embedder.embed(query))) for query, _ in queries])
+        row += f" | {exact_semantic_recall(matcher, queries):>8.2f} | {candidates:>10.0f}"
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Бенчмарк паралельного пошуку у великому FAQ: один процес проти
+FAQ, розподіленого між процесами
+
+Запуск з кореня проєкту:
+    python -m benchmarks.bench_sharded_search
+"""
+
+import os
+import time
+
+from benchmarks.common import make_queries, make_synthetic_faq
+from modules.faq_index import FaqIndex
+from modules.faq_matchers import create_faq_matcher
+from modules.faq_sharding import ShardedFaqMatcher
+from modules.text_processing import prepare_text
+
+FAQ_SIZES = [5000, 20000, 50000]
+QUERIES_PER_SIZE = 200
+MATCHERS = ['sequence', 'tfidf']
+
+
+def worker_counts() -> list:
+    """1, 2, 4, ... до кількості ядер"""
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cores:
+        counts.append(cores)
+    return counts
+
+
+def time_per_query(search, queries) -> float:
+    """Середній час одного запиту в мілісекундах"""
+    start = time.perf_counter()
+    for query in queries:
+        search(query)
+    return (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def time_batch(match_batch, queries) -> float:
+    """Середній час запиту в пакетній обробці в мілісекундах"""
+    start = time.perf_counter()
+    match_batch(queries)
+    return (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def main():
+    counts = worker_counts()
+    print(f"Ядер: {os.cpu_count()}; час на запит, мс (запит / пакет), у дужках - прискорення запиту")
+
+    for matcher_name in MATCHERS:
+        print(f"\nАлгоритм: {matcher_name}")
+        header = f"{'FAQ':>7} | {'один процес':>17}"
+        for workers in counts:
+            header += f" | {f'{workers} проц.':>24}"
+        print(header)
+        print('-' * len(header))
+
+        for size in FAQ_SIZES:
+            faq_data = make_synthetic_faq(size, seed=size)
+            index = FaqIndex(faq_data)
+            queries = [prepare_text(query) for query in make_queries(faq_data, QUERIES_PER_SIZE, seed=42)]
+
+            single = create_faq_matcher(matcher_name, index)
+            # Прогрів кешів стемінгу та схожості
+            single.match_batch(queries)
+            single_ms = time_per_query(single.match, queries)
+            row = f"{size:>7} | {single_ms:>7.3f} / {time_batch(single.match_batch, queries):>7.3f}"
+
+            for workers in counts:
+                sharded = ShardedFaqMatcher(index, matcher_name, workers)
+                try:
+                    sharded_ms = time_per_query(sharded.match, queries)
+                    batch_ms = time_batch(sharded.match_batch, queries)
+                finally:
+                    sharded.close()
+                cell = f"{sharded_ms:.3f} / {batch_ms:.3f} (x{single_ms / sharded_ms:.1f})"
+                row += f" | {cell:>24}"
+
+            print(row)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Бенчмарк нечіткої схожості: повне порівняння SequenceMatcher
+проти відсіювання за верхніми оцінками
+
+Запуск з кореня проєкту:
+    python -m benchmarks.bench_similarity
+"""
+
+import time
+
+from benchmarks.common import build_chatbot, make_queries, make_synthetic_faq
+from modules.faq_matchers import SequenceFaqMatcher
+from modules.similarity import DifflibSimilarity, SimilarityBackend
+from modules.text_processing import prepare_text
+
+FAQ_SIZE = 2000
+QUERY_COUNT = 300
+# Повідомлення без точних збігів інтентів, щоб спрацювало нечітке порівняння
+INTENT_MESSAGES = ['привт', 'дякуюю', 'лічилник', 'скільки коштує', 'коли дадуть світло']
+
+
+def run(label: str, search, queries) -> list:
+    """Виконання пошуку для всіх запитів з виведенням часу"""
+    start = time.perf_counter()
+    results = [search(query) for query in queries]
+    elapsed_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    print(f"  {label:<22} {elapsed_ms:.4f} мс/запит")
+    return results
+
+
+def main():
+    faq_data = make_synthetic_faq(FAQ_SIZE, seed=1)
+    queries = [prepare_text(query) for query in make_queries(faq_data, QUERY_COUNT, seed=3)]
+    chatbot = build_chatbot(faq_data)
+
+    print(f"Пошук у FAQ ({FAQ_SIZE} питань, {QUERY_COUNT} запитів):")
+    plain = SequenceFaqMatcher(chatbot.faq_index, SimilarityBackend())
+    pruned = SequenceFaqMatcher(chatbot.faq_index, DifflibSimilarity())
+    expected = run('повне порівняння', plain.match, queries)
+    actual = run('з відсіюванням', pruned.match, queries)
+    assert actual == expected, "Результати відрізняються"
+    print(f"  статистика відсіювання: {pruned.similarity.stats}")
+
+    print("Нечітке визначення інтенту:")
+    messages = [chatbot._normalize_text(message) for message in INTENT_MESSAGES] * 200
+    chatbot.similarity = SimilarityBackend()
+    expected = run('повне порівняння', chatbot._detect_intent, messages)
+    chatbot.similarity = DifflibSimilarity()
+    actual = run('з відсіюванням', chatbot._detect_intent, messages)
+    assert actual == expected, "Результати відрізняються"
+    print(f"  статистика відсіювання: {chatbot.similarity.stats}")
+
+
+if __name__ == '__main__':
+    main()
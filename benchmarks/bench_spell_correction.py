@@ -0,0 +1,96 @@
+"""
+Бенчмарк виправлення помилок розпізнавання: частка знайдених відповідей
+на запитах з помилками та затримка виправлення
+
+Запуск з кореня проєкту:
+    python -m benchmarks.bench_spell_correction
+"""
+
+import random
+import time
+
+from benchmarks.bench_semantic_search import DOMAIN_FAQ, build_faq
+from benchmarks.common import build_chatbot
+
+DISTRACTOR_COUNTS = [0, 5000, 50000]
+QUERIES_PER_QUESTION = 30
+LETTERS = 'абвгґдеєжзиіїйклмнопрстуфхцчшщьюя'
+
+
+def misspell(word: str, rng: random.Random) -> str:
+    """Одна випадкова помилка: заміна, пропуск, вставка або перестановка літер"""
+    position = rng.randrange(1, len(word) - 1)
+    kind = rng.choice(['replace', 'delete', 'insert', 'transpose'])
+    if kind == 'replace':
+        return word[:position] + rng.choice(LETTERS) + word[position + 1:]
+    if kind == 'delete':
+        return word[:position] + word[position + 1:]
+    if kind == 'insert':
+        return word[:position] + rng.choice(LETTERS) + word[position:]
+    return word[:position - 1] + word[position] + word[position - 1] + word[position + 1:]
+
+
+def key_words(question: str) -> list:
+    """Два найдовші слова питання (вони ж ключові слова)"""
+    words = question.rstrip('?').lower().split()
+    return sorted(words, key=len, reverse=True)[:2]
+
+
+def build_keyword_faq(distractors: int) -> dict:
+    """Предметний FAQ з ключовими словами та синтетичними питаннями"""
+    faq_data = build_faq(distractors)
+    # Предметні питання йдуть першими
+    for item, (question, _) in zip(faq_data['questions'], DOMAIN_FAQ):
+        item['keywords'] = key_words(question)
+    return faq_data
+
+
+def make_misspelled_queries(seed: int = 0) -> list:
+    """Пари (ключові слова питання з помилками, позиція питання), як у коротких голосових запитах"""
+    rng = random.Random(seed)
+    queries = []
+    for position, (question, _) in enumerate(DOMAIN_FAQ):
+        for _ in range(QUERIES_PER_QUESTION):
+            queries.append((' '.join(misspell(word, rng) for word in key_words(question)), position))
+    return queries
+
+
+def evaluate(chatbot, queries) -> tuple:
+    """Частка правильних відповідей та середній час нормалізації запиту в мкс"""
+    answers = [question for question, _ in DOMAIN_FAQ]
+    start = time.perf_counter()
+    normalized = [chatbot._normalize_text(query) for query, _ in queries]
+    normalization_us = (time.perf_counter() - start) * 1e6 / len(queries)
+
+    found = sum(
+        chatbot._search_faq(query) == answers[expected]
+        for query, (_, expected) in zip(normalized, queries)
+    )
+    return found / len(queries), normalization_us
+
+
+def main():
+    queries = make_misspelled_queries()
+    print(f"Запитів з помилками: {len(queries)}")
+    print(f"{'FAQ':>7} | {'слів':>7} | {'без виправлення':>22} | {'з виправленням':>22} | {'повторно, мкс':>13}")
+    print('-' * 84)
+
+    for distractors in DISTRACTOR_COUNTS:
+        faq_data = build_keyword_faq(distractors)
+        plain = build_chatbot(faq_data)
+        corrected = build_chatbot(faq_data, spell_correction=True)
+
+        plain_found, plain_us = evaluate(plain, queries)
+        # Перший прохід - холодний кеш виправлень, другий - слова вже виправлялись
+        corrected_found, corrected_us = evaluate(corrected, queries)
+        _, warm_us = evaluate(corrected, queries)
+
+        print(
+            f"{len(faq_data['questions']):>7} | {len(corrected.spell_corrector):>7} | "
+            f"{f'{plain_found:.2f} / {plain_us:.0f} мкс':>22} | "
+            f"{f'{corrected_found:.2f} / {corrected_us:.0f} мкс':>22} | {warm_us:>13.0f}"
+        )
+
+
+if __name__ == '__main__':
+    main()
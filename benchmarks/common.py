@@ -0,0 +1,92 @@
+"""
+Спільні допоміжні функції для бенчмарків
+"""
+
+import json
+import os
+import random
+import tempfile
+from typing import List
+from unittest.mock import patch
+
+from modules.chatbot_module import UkrenergoChatbot
+
+SYLLABLES = [
+    'ка', 'ло', 'ре', 'ні', 'ту', 'ва', 'мо', 'ди', 'пе', 'сі',
+    'жа', 'бу', 'го', 'ле', 'чи', 'ра', 'зо', 'ми', 'ху', 'фе',
+]
+COMMON_WORDS = ['як', 'що', 'де', 'коли', 'чи', 'можна', 'потрібно']
+
+
+def make_word(rng: random.Random) -> str:
+    """Випадкове 'слово' з 3-5 складів"""
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(3, 5)))
+
+
+def make_synthetic_faq(size: int, seed: int = 0) -> dict:
+    """
+    Генерація синтетичного FAQ заданого розміру
+
+    Args:
+        size: Кількість питань
+        seed: Зерно генератора випадкових чисел
+
+    Returns:
+        Дані FAQ у форматі data/faq.json
+    """
+    rng = random.Random(seed)
+    questions = []
+
+    for position in range(size):
+        words = [rng.choice(COMMON_WORDS)] + [make_word(rng) for _ in range(rng.randint(3, 5))]
+        questions.append({
+            'id': position + 1,
+            'question': ' '.join(words).capitalize() + '?',
+            'answer': f'Відповідь {position + 1}',
+            'category': 'synthetic',
+            'keywords': [make_word(rng) + make_word(rng)]
+        })
+
+    return {'categories': {'synthetic': 'Синтетичні'}, 'questions': questions}
+
+
+def make_queries(faq_data: dict, count: int, seed: int = 0) -> List[str]:
+    """
+    Генерація запитів: перефразовані питання та згадки ключових слів
+
+    Args:
+        faq_data: Дані FAQ
+        count: Кількість запитів
+        seed: Зерно генератора випадкових чисел
+
+    Returns:
+        Список запитів (ненормалізованих)
+    """
+    rng = random.Random(seed)
+    queries = []
+
+    for _ in range(count):
+        question = rng.choice(faq_data['questions'])
+        if rng.random() < 0.2:
+            queries.append(f"Питання про {question['keywords'][0]}")
+        else:
+            # Зміна закінчення одного зі слів
+            words = question['question'].rstrip('?').split()
+            position = rng.randrange(len(words))
+            words[position] = words[position][:-1] + 'у'
+            queries.append(' '.join(words))
+
+    return queries
+
+
+def build_chatbot(faq_data: dict, **kwargs) -> UkrenergoChatbot:
+    """Створення чат-бота з тимчасового файлу FAQ"""
+    with tempfile.NamedTemporaryFile('w', suffix='.json', encoding='utf-8', delete=False) as f:
+        json.dump(faq_data, f, ensure_ascii=False)
+        faq_file = f.name
+
+    try:
+        with patch('modules.chatbot_module.st'):
+            return UkrenergoChatbot(faq_file=faq_file, **kwargs)
+    finally:
+        os.remove(faq_file)
@@ -0,0 +1,115 @@
+"""
+Навантажувальний тест HTTP-сервісу чат-бота
+
+Запуск з кореня проєкту (сервіс має бути запущений):
+    python -m modules.chat_service --port 8080 --workers 4
+    python -m benchmarks.load_test --port 8080 --connections 32 --duration 10
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from modules.metrics import LatencyHistogram
+
+MESSAGES = [
+    "Як оплатити рахунок?",
+    "Що робити при відключенні світла?",
+    "Які зараз тарифи на електроенергію?",
+    "Як передати показники лічильника?",
+    "Привіт",
+    "Дякую, до побачення",
+    "Як підключити нову будівлю?",
+    "Номер телефону підтримки",
+]
+
+
+async def run_connection(host: str, port: int, deadline: float, histogram: LatencyHistogram,
+                         errors: list, seed: int):
+    """Послідовні запити по одному постійному з'єднанню до завершення тесту"""
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            body = json.dumps(
+                {'message': rng.choice(MESSAGES), 'user_id': f"load-{seed}"}, ensure_ascii=False
+            ).encode('utf-8')
+            request = (
+                f"POST /message HTTP/1.1\r\nHost: {host}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+            ).encode('latin-1') + body
+
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+
+            head = await reader.readuntil(b'\r\n\r\n')
+            status = int(head.split(b' ', 2)[1])
+            content_length = 0
+            for line in head.split(b'\r\n'):
+                if line.lower().startswith(b'content-length:'):
+                    content_length = int(line.split(b':', 1)[1])
+            await reader.readexactly(content_length)
+
+            histogram.record(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_load_test(host: str, port: int, connections: int, duration: float) -> dict:
+    """
+    Навантаження сервісу кількома одночасними з'єднаннями
+
+    Args:
+        host: Адреса сервісу
+        port: Порт сервісу
+        connections: Кількість одночасних з'єднань
+        duration: Тривалість тесту в секундах
+
+    Returns:
+        Кількість запитів, помилок, запитів за секунду та розподіл затримки
+    """
+    histogram = LatencyHistogram()
+    errors = []
+    start = time.perf_counter()
+    deadline = start + duration
+
+    await asyncio.gather(*(
+        run_connection(host, port, deadline, histogram, errors, seed)
+        for seed in range(connections)
+    ))
+    elapsed = time.perf_counter() - start
+
+    return {
+        'requests': histogram.count,
+        'errors': len(errors),
+        'requests_per_second': histogram.count / elapsed if elapsed > 0 else 0,
+        'latency': histogram.get_statistics()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Навантажувальний тест сервісу чат-бота")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--connections', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0)
+    args = parser.parse_args()
+
+    result = asyncio.run(run_load_test(args.host, args.port, args.connections, args.duration))
+    latency = result['latency']
+
+    print(f"Запитів: {result['requests']} (помилок: {result['errors']})")
+    print(f"Запитів за секунду: {result['requests_per_second']:.0f}")
+    print(
+        f"Затримка, мс: середня {latency['mean'] * 1000:.2f}, p50 {latency['p50'] * 1000:.2f}, "
+        f"p90 {latency['p90'] * 1000:.2f}, p99 {latency['p99'] * 1000:.2f}, макс {latency['max'] * 1000:.2f}"
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -26,6 +26,9 @@ class Config:
     BASE_DIR = Path(__file__).parent
     ASSETS_DIR = BASE_DIR / 'assets'
     DATA_DIR = BASE_DIR / 'data'
+    CONVERSATIONS_DIR = DATA_DIR / 'conversations'
+    CHAT_LOG_FILE = DATA_DIR / 'chat_logs.jsonl'
+    TTS_CACHE_DIR = DATA_DIR / 'tts_cache'
     
     # Налаштування додатку
     APP_TITLE = "Голосовий асистент УкрЕнерго"
@@ -42,14 +45,28 @@ class Config:
     TTS_SETTINGS = {
         'rate': 0,      # -100 до 100
         'pitch': 0,     # -100 до 100
-        'volume': 100   # 0 до 100
+        'volume': 100,  # 0 до 100
+        'audio_cache_bytes': 64 * 1024 * 1024,  # бюджет пам'яті кешу синтезованого аудіо
+        'disk_cache_bytes': 512 * 1024 * 1024,  # бюджет дискового кешу аудіо, спільного для процесів
+        'synthesizer_pool_size': 2,  # вільних синтезаторів з відкритим з'єднанням на голос
+        'synthesizer_idle_timeout': 300,  # секунд простою до повторного відкриття з'єднання
+        'synthesis_workers': 4  # потоків фонового синтезу відповідей
     }
     
     # Налаштування чат-бота
     CHATBOT_SETTINGS = {
         'max_history': 10,
         'response_delay': 0.5,
-        'typing_animation': True
+        'typing_animation': True,
+        'faq_matcher': 'sequence',  # 'sequence', 'tfidf' або 'semantic'
+        'response_cache_size': 256,
+        'faq_reload_interval': 5,  # секунд; None вимикає перевірку змін FAQ
+        'common_questions_capacity': 1000,  # кількість відстежуваних популярних запитів
+        'faq_workers': 0,  # процесів для пошуку у великому FAQ; 0 - у процесі застосунку
+        # Виправлення помилок розпізнавання мовлення за словником FAQ. Індекс видалень
+        # будується під час запуску та кожного перезавантаження FAQ і займає час,
+        # пропорційний кількості різних слів (секунди для десятків тисяч питань)
+        'spell_correction': False
     }
     
     # Контактна інформація
@@ -0,0 +1,219 @@
+"""
+Автомат Ахо-Корасік для пошуку багатьох шаблонів за один прохід тексту
+"""
+
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Масиви плоского подання автомата (див. AhoCorasick.to_arrays)
+FLAT_ARRAYS = ('goto_pointers', 'goto_chars', 'goto_targets', 'fail',
+               'output_pointers', 'output_values', 'output_links')
+
+
+class AhoCorasick:
+    """Скомпільований автомат для пошуку всіх входжень набору шаблонів"""
+
+    def __init__(self, patterns: Iterable[Tuple[str, Any]] = ()):
+        """
+        Побудова автомата
+
+        Args:
+            patterns: Пари (шаблон, значення); значення повертається при збігу
+        """
+        # Переходи бору: стан -> {символ: стан}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Шаблони, що закінчуються в стані (з урахуванням суфіксних посилань)
+        self._output: List[List[Tuple[str, Any]]] = [[]]
+
+        for pattern, value in patterns:
+            self._add(pattern, value)
+        self._build_links()
+
+    def __len__(self) -> int:
+        return sum(len(outputs) for outputs in self._output)
+
+    def _add(self, pattern: str, value: Any):
+        """Додавання шаблону до бору"""
+        if not pattern:
+            return
+
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+
+        self._output[state].append((pattern, value))
+
+    def _build_links(self):
+        """Обчислення суфіксних посилань обходом у ширину"""
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+
+                # Шаблони суфіксного стану теж закінчуються тут
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str, Any]]:
+        """
+        Пошук усіх входжень шаблонів у тексті
+
+        Args:
+            text: Текст для пошуку
+
+        Yields:
+            Кортежі (позиція початку, шаблон, значення)
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for pattern, value in output[state]:
+                yield position - len(pattern) + 1, pattern, value
+
+    def to_arrays(self, value_id: Callable[[Any], int]) -> Dict[str, np.ndarray]:
+        """
+        Плоске подання автомата для запису у файл (див. FlatAhoCorasick)
+
+        Args:
+            value_id: Номер значення шаблону в зовнішній таблиці шаблонів
+
+        Returns:
+            Масиви FLAT_ARRAYS
+        """
+        states = len(self._goto)
+
+        # Переходи стану - відсортовані коди символів і цільові стани
+        goto_pointers = np.zeros(states + 1, dtype=np.int64)
+        goto_chars: List[int] = []
+        goto_targets: List[int] = []
+        for state, transitions in enumerate(self._goto):
+            for code, target in sorted((ord(char), target) for char, target in transitions.items()):
+                goto_chars.append(code)
+                goto_targets.append(target)
+            goto_pointers[state + 1] = len(goto_chars)
+
+        # Власні шаблони стану: спершу в _output ідуть вони, потім шаблони суфіксного стану
+        own_outputs = [[]] + [
+            outputs[:len(outputs) - len(self._output[self._fail[state]])]
+            for state, outputs in enumerate(self._output) if state
+        ]
+        output_pointers = np.zeros(states + 1, dtype=np.int64)
+        output_values: List[int] = []
+        for state, outputs in enumerate(own_outputs):
+            output_values.extend(value_id(value) for _, value in outputs)
+            output_pointers[state + 1] = len(output_values)
+
+        # Найближчий суфіксний стан з власними шаблонами (обхід у ширину: суфікси коротші)
+        output_links = np.full(states, -1, dtype=np.int32)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            queue.extend(self._goto[state].values())
+            fail = self._fail[state]
+            output_links[state] = fail if own_outputs[fail] else output_links[fail]
+
+        return {
+            'goto_pointers': goto_pointers,
+            'goto_chars': np.asarray(goto_chars, dtype=np.int32),
+            'goto_targets': np.asarray(goto_targets, dtype=np.int32),
+            'fail': np.asarray(self._fail, dtype=np.int32),
+            'output_pointers': output_pointers,
+            'output_values': np.asarray(output_values, dtype=np.int32),
+            'output_links': output_links,
+        }
+
+
+class FlatAhoCorasick:
+    """
+    Автомат Ахо-Корасік у плоских масивах
+
+    Масиви можуть читатися безпосередньо з файлу через mmap: автомат не
+    будується в пам'яті процесу, а кілька процесів ділять ті самі сторінки.
+    Переходи стану шукаються бінарним пошуком серед його символів.
+    """
+
+    def __init__(self, arrays: Mapping[str, np.ndarray], patterns: Sequence[str],
+                 values: Optional[Sequence] = None):
+        """
+        Args:
+            arrays: Масиви FLAT_ARRAYS (AhoCorasick.to_arrays)
+            patterns: Номер значення -> шаблон
+            values: Номер значення -> значення (за замовчуванням - сам шаблон)
+        """
+        # memoryview дає швидкий доступ до окремих елементів без створення об'єктів numpy
+        self._goto_pointers = memoryview(arrays['goto_pointers'])
+        self._goto_chars = memoryview(arrays['goto_chars'])
+        self._goto_targets = memoryview(arrays['goto_targets'])
+        self._fail = memoryview(arrays['fail'])
+        self._output_pointers = memoryview(arrays['output_pointers'])
+        self._output_values = memoryview(arrays['output_values'])
+        self._output_links = memoryview(arrays['output_links'])
+        self.patterns = patterns
+        self.values = patterns if values is None else values
+
+    def __len__(self) -> int:
+        return len(self._output_values)
+
+    def _transition(self, state: int, code: int) -> int:
+        """Перехід зі стану за символом або -1"""
+        start, end = self._goto_pointers[state], self._goto_pointers[state + 1]
+        position = bisect_left(self._goto_chars, code, start, end)
+        if position < end and self._goto_chars[position] == code:
+            return self._goto_targets[position]
+        return -1
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str, Any]]:
+        """
+        Пошук усіх входжень шаблонів у тексті (як AhoCorasick.iter_matches)
+
+        Args:
+            text: Текст для пошуку
+
+        Yields:
+            Кортежі (позиція початку, шаблон, значення)
+        """
+        fail = self._fail
+        output_pointers = self._output_pointers
+        output_values = self._output_values
+        output_links = self._output_links
+        state = 0
+
+        for position, char in enumerate(text):
+            code = ord(char)
+            next_state = self._transition(state, code)
+            while next_state < 0 and state:
+                state = fail[state]
+                next_state = self._transition(state, code)
+            state = max(next_state, 0)
+
+            output_state = state
+            while output_state >= 0:
+                for output in range(output_pointers[output_state], output_pointers[output_state + 1]):
+                    value_id = output_values[output]
+                    pattern = self.patterns[value_id]
+                    yield position - len(pattern) + 1, pattern, self.values[value_id]
+                output_state = output_links[output_state]
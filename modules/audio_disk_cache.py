@@ -0,0 +1,216 @@
+"""
+Модуль дискового кешу синтезованого аудіо, спільного для процесів
+
+Файли адресуються хешем вмісту запиту на синтез (SSML, голос, формат),
+тому кілька процесів на одному хості без координації читають і
+доповнюють той самий кеш, а після перезапуску він лишається теплим.
+Запис атомарний (тимчасовий файл і os.replace), читання - через mmap,
+витіснення - найдавніше використаних файлів за часом зміни, який
+оновлюється при кожному влучанні.
+
+Дисковий рівень лише прискорює синтез: помилки файлової системи (нестача
+місця, права доступу) рахуються в статистиці й не передаються викликачу.
+"""
+
+import hashlib
+import mmap
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Бюджет дискового кешу синтезованого аудіо (байтів)
+DISK_CACHE_BYTES = 512 * 1024 * 1024
+
+# Частка бюджету, до якої витіснення звільняє місце (запас проти витіснення на кожному записі)
+EVICTION_TARGET = 0.9
+
+AUDIO_SUFFIX = '.wav'
+
+
+def audio_cache_key(*parts: str) -> str:
+    """
+    Адреса вмісту в кеші
+
+    Args:
+        parts: Складові запиту на синтез (SSML, голос, формат аудіо)
+
+    Returns:
+        Шістнадцятковий SHA-256 складових
+    """
+    return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+class DiskAudioCache:
+    """
+    Кеш аудіо у файлах каталогу з обмеженням сумарного розміру
+
+    Файли розкладено в підкаталоги за першими двома символами ключа.
+    Сумарний розмір процес рахує наближено (початкове сканування плюс
+    власні записи); при перевищенні бюджету каталог сканується заново,
+    тож записи інших процесів також враховуються.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DISK_CACHE_BYTES):
+        """
+        Args:
+            directory: Каталог кешу (створюється за відсутності)
+            max_bytes: Найбільший сумарний розмір файлів у байтах
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # Операції, що не вдалися через помилки файлової системи
+        self.errors = 0
+        # Сумарний розмір аудіо, прочитаного з диска замість повторного синтезу
+        self.bytes_saved = 0
+        self._lock = threading.Lock()
+        self.bytes = sum(size for _, _, size in self._scan())
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / (key + AUDIO_SUFFIX)
+
+    def _scan(self) -> List[Tuple[float, Path, int]]:
+        """Файли кешу: (час останнього використання, шлях, розмір)"""
+        entries = []
+        for path in self.directory.glob('*/*' + AUDIO_SUFFIX):
+            try:
+                status = path.stat()
+            except FileNotFoundError:
+                # Видалений іншим процесом під час сканування
+                continue
+            entries.append((status.st_mtime, path, status.st_size))
+        return entries
+
+    def _count_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def __contains__(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Читання аудіо з кешу
+
+        Args:
+            key: Ключ (audio_cache_key)
+
+        Returns:
+            Аудіо дані або None, якщо файлу немає
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size == 0:
+                    raise FileNotFoundError(path)
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    audio_data = buffer[:]
+            # Час зміни - час останнього використання для витіснення
+            os.utime(path)
+        except OSError as error:
+            if not isinstance(error, FileNotFoundError):
+                self._count_error()
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += size
+        return audio_data
+
+    def put(self, key: str, audio_data: bytes):
+        """
+        Атомарне збереження аудіо (помилки запису лише рахуються)
+
+        Args:
+            key: Ключ (audio_cache_key)
+            audio_data: Аудіо дані
+        """
+        size = len(audio_data)
+        if size == 0 or size > self.max_bytes:
+            return
+
+        path = self._path(key)
+        temp_path = None
+        try:
+            if path.exists():
+                # Вміст за адресою вже збережено (можливо, іншим процесом)
+                os.utime(path)
+                return
+
+            path.parent.mkdir(exist_ok=True)
+            with tempfile.NamedTemporaryFile('wb', dir=path.parent, suffix='.tmp', delete=False) as f:
+                temp_path = f.name
+                f.write(audio_data)
+            # Читачі бачать або відсутній файл, або повний
+            os.replace(temp_path, path)
+        except OSError:
+            self._count_error()
+            # Неповний тимчасовий файл не повинен займати місце
+            if temp_path is not None:
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
+            return
+
+        with self._lock:
+            self.bytes += size
+            over_budget = self.bytes > self.max_bytes
+        if over_budget:
+            self.evict()
+
+    def evict(self):
+        """Видалення найдавніше використаних файлів до EVICTION_TARGET бюджету"""
+        entries = sorted(self._scan(), key=lambda entry: entry[0])
+        total = sum(size for _, _, size in entries)
+        target = self.max_bytes * EVICTION_TARGET
+
+        for _, path, size in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError:
+                # Файл лишається на диску й у сумарному розмірі
+                self._count_error()
+                continue
+            total -= size
+
+        with self._lock:
+            self.bytes = total
+
+    def clear(self):
+        """Видалення всіх файлів кешу"""
+        remaining = 0
+        for _, path, size in self._scan():
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError:
+                self._count_error()
+                remaining += size
+        with self._lock:
+            self.bytes = remaining
+
+    def get_statistics(self) -> Dict:
+        """Статистика використання кешу"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'errors': self.errors,
+            'hit_rate': (self.hits / lookups) * 100 if lookups > 0 else 0,
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'bytes_saved': self.bytes_saved
+        }
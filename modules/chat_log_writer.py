@@ -0,0 +1,152 @@
+"""
+Модуль фонового запису журналу чату у JSONL-файл
+"""
+
+import json
+import os
+import queue
+import threading
+from typing import Dict, Optional
+
+# Максимальна кількість записів, що очікують на запис
+LOG_QUEUE_SIZE = 10000
+
+# Максимальна кількість записів в одній групі
+LOG_BATCH_SIZE = 256
+
+# Найдовше очікування нових записів перед скиданням групи (секунд)
+LOG_FLUSH_INTERVAL = 0.5
+
+# Найдовше очікування місця в черзі до відкидання запису (секунд)
+LOG_PUT_TIMEOUT = 0.1
+
+# Ознака завершення роботи потоку запису
+_STOP = object()
+
+
+class ChatLogWriter:
+    """
+    Журнал чату з фоновим груповим записом
+
+    Запит лише додає запис у чергу. Фоновий потік забирає з черги всі
+    доступні записи (до batch_size) і дописує їх у файл одним записом
+    з одним flush. Якщо черга заповнена, запит чекає не довше
+    put_timeout секунд, а потім запис відкидається і враховується в статистиці.
+    """
+
+    def __init__(self, path: str, queue_size: int = LOG_QUEUE_SIZE, batch_size: int = LOG_BATCH_SIZE,
+                 flush_interval: float = LOG_FLUSH_INTERVAL, put_timeout: float = LOG_PUT_TIMEOUT,
+                 fsync: bool = False):
+        """
+        Args:
+            path: Шлях до JSONL-файлу
+            queue_size: Розмір черги записів
+            batch_size: Максимальна кількість записів в одній групі
+            flush_interval: Період скидання неповної групи в секундах
+            put_timeout: Очікування місця в заповненій черзі в секундах
+            fsync: Примусово скидати кожну групу на диск (os.fsync)
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.fsync = fsync
+
+        self.stats = {
+            'written': 0,
+            'dropped': 0,
+            'batches': 0,
+            'errors': 0
+        }
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._dropped_lock = threading.Lock()
+        self._closed = False
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name='chat-log-writer', daemon=True)
+        self._thread.start()
+
+    def write(self, record: Dict) -> bool:
+        """
+        Додавання запису в чергу
+
+        Args:
+            record: Запис (серіалізується у фоновому потоці)
+
+        Returns:
+            True, якщо запис прийнято; False, якщо черга переповнена або журнал закрито
+        """
+        if self._closed:
+            return False
+
+        try:
+            self._queue.put(record, timeout=self.put_timeout)
+            return True
+        except queue.Full:
+            with self._dropped_lock:
+                self.stats['dropped'] += 1
+            return False
+
+    def _next_batch(self) -> list:
+        """Очікування першого запису та вибір усіх доступних до batch_size"""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+
+        while len(batch) < self.batch_size and batch[-1] is not _STOP:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_batch(self, records: list):
+        """Груповий запис: одна операція запису та один flush на групу"""
+        lines = ''.join(json.dumps(record, ensure_ascii=False, default=str) + '\n' for record in records)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+
+    def _run(self):
+        """Цикл фонового потоку"""
+        stopping = False
+        while not stopping:
+            batch = self._next_batch()
+            stopping = bool(batch) and batch[-1] is _STOP
+            records = batch[:-1] if stopping else batch
+
+            if records:
+                try:
+                    self._write_batch(records)
+                    self.stats['written'] += len(records)
+                    self.stats['batches'] += 1
+                except OSError:
+                    # Недоступний диск не повинен зупиняти потік запису
+                    self.stats['errors'] += len(records)
+
+            for _ in batch:
+                self._queue.task_done()
+
+    def flush(self):
+        """Очікування запису всіх записів, прийнятих до виклику"""
+        self._queue.join()
+
+    def close(self, timeout: Optional[float] = None):
+        """
+        Запис залишку черги та зупинка фонового потоку
+
+        Args:
+            timeout: Найдовше очікування зупинки в секундах
+        """
+        self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout)
+
+    def get_statistics(self) -> Dict:
+        """Статистика журналу: записано, відкинуто, груп, помилок, у черзі"""
+        return dict(self.stats, queued=self._queue.qsize())
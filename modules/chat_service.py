@@ -0,0 +1,252 @@
+"""
+HTTP/JSON сервіс чат-бота на asyncio без залежності від Streamlit
+
+Запуск (кілька процесів на одному порту через SO_REUSEPORT):
+    python -m modules.chat_service --port 8080 --workers 4
+
+Запити:
+    POST /message  {"message": "...", "user_id": "..."} -> {"response": "..."}
+    GET  /stats    статистика чат-бота
+    GET  /health   перевірка доступності
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import socket
+from typing import Dict, Optional, Tuple
+
+from modules.chatbot_module import UkrenergoChatbot
+
+logger = logging.getLogger(__name__)
+
+# Найбільший дозволений розмір тіла запиту (байтів)
+MAX_BODY_SIZE = 64 * 1024
+
+HTTP_REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error'
+}
+
+
+class ChatService:
+    """HTTP/1.1 сервіс з постійними з'єднаннями поверх asyncio"""
+
+    def __init__(self, chatbot: UkrenergoChatbot):
+        """
+        Args:
+            chatbot: Екземпляр чат-бота
+        """
+        self.chatbot = chatbot
+
+    def handle_request(self, method: str, path: str, body: bytes) -> Tuple[int, Dict]:
+        """
+        Обробка одного запиту
+
+        Args:
+            method: HTTP-метод
+            path: Шлях запиту
+            body: Тіло запиту
+
+        Returns:
+            (HTTP-статус, JSON-відповідь)
+        """
+        if path == '/message':
+            if method != 'POST':
+                return 405, {'error': "Очікується POST"}
+            try:
+                payload = json.loads(body or b'{}')
+            except ValueError:
+                return 400, {'error': "Некоректний JSON"}
+            message = payload.get('message') if isinstance(payload, dict) else None
+            if not isinstance(message, str) or not message.strip():
+                return 400, {'error': "Поле 'message' обов'язкове"}
+            user_id = payload.get('user_id')
+            if user_id is not None and not isinstance(user_id, str):
+                return 400, {'error': "Поле 'user_id' має бути рядком"}
+
+            # Обробка займає частки мілісекунди, тому виконується в циклі подій;
+            # паралелізм забезпечують окремі процеси
+            response = self.chatbot.process_message(message, user_id)
+            return 200, {'response': response}
+
+        if path == '/stats' and method == 'GET':
+            return 200, self.chatbot.get_statistics()
+
+        if path == '/health' and method == 'GET':
+            return 200, {'status': 'ok', 'pid': os.getpid()}
+
+        return 404, {'error': "Невідомий шлях"}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Обробка з'єднання: послідовні запити, доки клієнт не закриє з'єднання"""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, path, version = lines[0].split(' ', 2)
+                except ValueError:
+                    await self._send(writer, 400, {'error': "Некоректний запит"}, keep_alive=False)
+                    break
+
+                headers = {}
+                for line in lines[1:]:
+                    if ':' in line:
+                        name, value = line.split(':', 1)
+                        headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' and (version == 'HTTP/1.1' or connection == 'keep-alive')
+
+                try:
+                    content_length = int(headers.get('content-length', 0))
+                except ValueError:
+                    content_length = -1
+                if content_length < 0 or content_length > MAX_BODY_SIZE:
+                    await self._send(writer, 413 if content_length > 0 else 400,
+                                     {'error': "Некоректна довжина тіла"}, keep_alive=False)
+                    break
+
+                try:
+                    body = await reader.readexactly(content_length) if content_length else b''
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+
+                try:
+                    status, payload = self.handle_request(method, path.split('?', 1)[0], body)
+                except Exception:
+                    # Помилка обробки одного запиту не повинна обривати з'єднання та процес
+                    logger.exception("Помилка обробки запиту %s %s", method, path)
+                    status, payload = 500, {'error': "Внутрішня помилка сервісу"}
+                await self._send(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, status: int, payload: Dict, keep_alive: bool):
+        """Надсилання JSON-відповіді"""
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        ).encode('latin-1')
+        writer.write(head + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def serve(self, host: str, port: int, reuse_port: bool = False):
+        """
+        Запуск сервера до зупинки процесу
+
+        Args:
+            host: Адреса
+            port: Порт
+            reuse_port: Дозволити кільком процесам слухати той самий порт
+        """
+        server = await asyncio.start_server(self.handle_connection, host, port, reuse_port=reuse_port)
+        async with server:
+            await server.serve_forever()
+
+
+def create_service_chatbot(faq_file: str, faq_matcher: str = 'sequence',
+                           chat_log_file: Optional[str] = None) -> UkrenergoChatbot:
+    """
+    Створення чат-бота для сервісу (без сесій Streamlit)
+
+    Args:
+        faq_file: Шлях до FAQ (JSON або артефакт *.faqidx, спільний для процесів через mmap)
+        faq_matcher: Алгоритм порівняння з питаннями FAQ
+        chat_log_file: JSONL-файл журналу запитів
+
+    Returns:
+        Екземпляр UkrenergoChatbot
+    """
+    return UkrenergoChatbot(
+        faq_file=faq_file,
+        faq_matcher=faq_matcher,
+        chat_log_file=chat_log_file,
+        session_logging=False
+    )
+
+
+def run_worker(host: str, port: int, faq_file: str, faq_matcher: str,
+               chat_log_file: Optional[str], reuse_port: bool):
+    """Точка входу процесу-обробника"""
+    chatbot = create_service_chatbot(faq_file, faq_matcher, chat_log_file)
+    service = ChatService(chatbot)
+    try:
+        asyncio.run(service.serve(host, port, reuse_port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        chatbot.conversation_history.close()
+        if chatbot.chat_log is not None:
+            chatbot.chat_log.close()
+
+
+def main():
+    """Запуск сервісу з кількома процесами-обробниками"""
+    parser = argparse.ArgumentParser(description="HTTP/JSON сервіс чат-бота УкрЕнерго")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=1, help="Кількість процесів")
+    parser.add_argument('--faq-file', default='data/faq.json')
+    parser.add_argument('--faq-matcher', default='sequence', choices=['sequence', 'tfidf', 'semantic'])
+    parser.add_argument('--chat-log', default=None, help="JSONL-журнал запитів (окремий файл на процес)")
+    args = parser.parse_args()
+
+    if args.workers > 1 and not hasattr(socket, 'SO_REUSEPORT'):
+        parser.error("Кілька процесів потребують SO_REUSEPORT")
+
+    def chat_log_file(worker: int) -> Optional[str]:
+        if args.chat_log is None or args.workers == 1:
+            return args.chat_log
+        # Кожен процес пише власний файл, щоб групи записів не перемішувались
+        base, extension = os.path.splitext(args.chat_log)
+        return f"{base}.{worker}{extension}"
+
+    reuse_port = args.workers > 1
+    print(f"Сервіс чат-бота: http://{args.host}:{args.port} ({args.workers} процесів)")
+
+    if args.workers == 1:
+        run_worker(args.host, args.port, args.faq_file, args.faq_matcher, chat_log_file(0), reuse_port)
+        return
+
+    workers = [
+        multiprocessing.Process(
+            target=run_worker,
+            args=(args.host, args.port, args.faq_file, args.faq_matcher, chat_log_file(worker), reuse_port),
+            daemon=True
+        )
+        for worker in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        for worker in workers:
+            worker.terminate()
+
+
+if __name__ == '__main__':
+    main()
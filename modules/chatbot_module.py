@@ -2,39 +2,118 @@
 Модуль чат-бота для УкрЕнерго
 """
 
+import atexit
 import json
-import re
+import logging
+import os
 import random
+import threading
+import time
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
-import streamlit as st
-from difflib import SequenceMatcher
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+try:
+    import streamlit as st
+except ImportError:
+    # Чат-бот працює і поза Streamlit (див. modules/chat_service.py)
+    st = None
+
+from modules.aho_corasick import AhoCorasick
+from modules.chat_log_writer import ChatLogWriter
+from modules.conversation_store import ConversationStore
+from modules.faq_artifact import ARTIFACT_SUFFIX, load_faq_artifact
+from modules.faq_index import FaqIndex
+from modules.faq_matchers import FaqMatcher, create_faq_matcher
+from modules.faq_sharding import ShardedFaqMatcher
+from modules.lru_cache import StripedLRUCache
+from modules.metrics import StripedRequestStats
+from modules.similarity import DifflibSimilarity, SimilarityBackend
+from modules.spell_correction import SpellCorrector
+from modules.text_processing import normalize_text, stem_text, tokenize
+
+logger = logging.getLogger(__name__)
 
 class UkrenergoChatbot:
     """Інтелектуальний чат-бот для клієнтів УкрЕнерго"""
     
-    def __init__(self, faq_file: str = "data/faq.json"):
+    def __init__(self, faq_file: str = "data/faq.json", faq_matcher: str = "sequence",
+                 similarity: Optional[SimilarityBackend] = None,
+                 response_cache_size: int = 256,
+                 faq_reload_interval: Optional[float] = None,
+                 common_questions_capacity: int = 1000,
+                 max_history: int = 10,
+                 history_dir: Optional[str] = None,
+                 chat_log_file: Optional[str] = None,
+                 session_logging: bool = True,
+                 faq_workers: int = 0,
+                 spell_correction: bool = False):
         """
         Ініціалізація чат-бота
         
         Args:
-            faq_file: Шлях до файлу з FAQ
+            faq_file: Шлях до файлу з FAQ (JSON або скомпільований артефакт *.faqidx)
+            faq_matcher: Алгоритм порівняння з питаннями FAQ ('sequence', 'tfidf' або 'semantic')
+            similarity: Алгоритм нечіткої оцінки схожості рядків
+            response_cache_size: Розмір кешу розпізнаних запитів (0 вимикає кеш)
+            faq_reload_interval: Період перевірки змін файлу FAQ у секундах (None вимикає)
+            common_questions_capacity: Кількість відстежуваних популярних запитів
+            max_history: Кількість останніх реплік кожного користувача в пам'яті
+            history_dir: Каталог для старіших реплік (None - не зберігати)
+            chat_log_file: JSONL-файл журналу запитів і відповідей (None - не зберігати)
+            session_logging: Дублювати журнал запитів у сесію Streamlit
+            faq_workers: Кількість процесів для паралельного пошуку у FAQ (0 - у поточному процесі)
+            spell_correction: Виправляти помилки розпізнавання за словником FAQ та інтентів
         """
         self.faq_file = faq_file
-        self.faq_data = self._load_faq()
-        self.conversation_history = []
+        self.faq_matcher_name = faq_matcher
+        self.faq_workers = faq_workers
+        self.spell_correction = spell_correction
+        self.spell_corrector = None
+        self.similarity = similarity or DifflibSimilarity()
+        
+        # Ініціалізація інтентів: дані незмінні, тому читаються з усіх потоків без блокувань
+        # (шаблони інтентів також є поняттями семантичного пошуку у FAQ)
+        self.intents = self._freeze_intents(self._initialize_intents())
+        self.intent_patterns = self._prepare_intent_patterns()
+        self.intent_automaton = self._build_intent_automaton()
+        
+        # Усі похідні дані FAQ (індекс, матриці) належать одному об'єкту FaqMatcher,
+        # який замінюється атомарним присвоєнням при перезавантаженні
+        self._faq_mtime = self._get_faq_mtime()
+        self.faq_matcher = self._build_faq_matcher()
+        self.spell_corrector = self._build_spell_corrector(self.faq_matcher.index)
+        self.faq_reload_interval = faq_reload_interval
+        self._last_reload_check = time.monotonic()
+        self._reload_lock = threading.Lock()
+        self._reload_thread = None
+        
+        # Історія окремо для кожного користувача з обмеженим буфером у пам'яті
+        self.conversation_history = ConversationStore(max_history, history_dir)
+        
+        # Постійний журнал: запит лише додає запис у чергу фонового потоку
+        self.chat_log = self._create_chat_log(chat_log_file) if chat_log_file else None
+        self.session_logging = session_logging and st is not None
         self.user_context = {}
         
-        # Ініціалізація інтентів
-        self.intents = self._initialize_intents()
+        # Кеш: нормалізований запит -> (інтент, відповідь з FAQ); смуги за хешем ключа,
+        # щоб паралельні сесії не чекали на одне блокування
+        self.response_cache = StripedLRUCache(response_cache_size)
         
-        # Статистика
-        self.stats = {
-            'total_questions': 0,
-            'answered_questions': 0,
-            'common_questions': {},
-            'response_times': []
-        }
+        # Статистика: окремі смуги для паралельних сесій, об'єднуються при читанні
+        self.request_stats = StripedRequestStats(common_questions_capacity=common_questions_capacity)
+        
+        # Обробники тривалостей етапів кожного запиту (етап -> наносекунди)
+        self.stage_hooks: List[Callable[[Dict[str, int]], None]] = []
+    
+    @staticmethod
+    def _create_chat_log(chat_log_file: str) -> Optional[ChatLogWriter]:
+        """Постійний журнал чату; недоступний каталог вимикає лише журнал"""
+        try:
+            return ChatLogWriter(chat_log_file)
+        except OSError as e:
+            logger.warning("Журнал чату вимкнено: файл %s недоступний (%s)", chat_log_file, e)
+            return None
     
     def _load_faq(self) -> dict:
         """Завантаження FAQ з файлу"""
@@ -48,6 +127,109 @@ class UkrenergoChatbot:
                 'questions': []
             }
     
+    def _build_faq_matcher(self) -> FaqMatcher:
+        """Побудова пошукового індексу та алгоритму порівняння для файлу FAQ"""
+        if self.faq_file.endswith(ARTIFACT_SUFFIX):
+            # Скомпільований артефакт відображається в пам'ять без розбору JSON
+            faq_index = load_faq_artifact(self.faq_file)
+        else:
+            # Індекс будується один раз, а не на кожен запит
+            faq_index = FaqIndex(self._load_faq())
+        
+        if self.faq_workers:
+            # Великий FAQ ділиться між процесами, що оцінюють свої частини паралельно
+            return ShardedFaqMatcher(faq_index, self.faq_matcher_name, self.faq_workers,
+                                     self.similarity, self._faq_concepts())
+        return create_faq_matcher(self.faq_matcher_name, faq_index, self.similarity, self._faq_concepts())
+    
+    def _build_spell_corrector(self, faq_index: FaqIndex) -> Optional[SpellCorrector]:
+        """Словник виправлень зі слів питань, ключових слів FAQ та шаблонів інтентів"""
+        if not self.spell_correction:
+            return None
+        
+        # Слова FAQ артефакт зберігає готовими; шаблони інтентів додаються тут
+        words = faq_index.vocabulary()
+        patterns = [pattern for intent_data in self.intents.values() for pattern in intent_data['patterns']]
+        words.update(word for pattern in patterns for word in tokenize(normalize_text(pattern)))
+        return SpellCorrector(words)
+    
+    def _faq_concepts(self) -> List[Tuple[str, str]]:
+        """Поняття семантичного пошуку: (нормалізований шаблон, назва інтенту)"""
+        return [(pattern, intent_name) for _, intent_name, pattern in self.intent_patterns]
+    
+    @property
+    def faq_index(self) -> FaqIndex:
+        """Поточний індекс FAQ"""
+        return self.faq_matcher.index
+    
+    @property
+    def faq_data(self) -> dict:
+        """Поточні дані FAQ"""
+        return self.faq_matcher.index.faq_data
+    
+    def _get_faq_mtime(self) -> Optional[int]:
+        """Час зміни файлу FAQ (None, якщо файлу немає)"""
+        try:
+            return os.stat(self.faq_file).st_mtime_ns
+        except OSError:
+            return None
+    
+    def reload_faq_if_changed(self, background: bool = True) -> bool:
+        """
+        Перезавантаження FAQ, якщо файл змінився
+        
+        Новий індекс будується окремо і підставляється одним присвоєнням, тому
+        запити, що виконуються, бачать або старий, або новий індекс повністю.
+        
+        Args:
+            background: Будувати індекс у фоновому потоці
+            
+        Returns:
+            True, якщо перезавантаження запущено
+        """
+        mtime = self._get_faq_mtime()
+        if mtime == self._faq_mtime:
+            return False
+        
+        # Перебудова вже триває
+        if not self._reload_lock.acquire(blocking=False):
+            return False
+        
+        if background:
+            self._reload_thread = threading.Thread(
+                target=self._rebuild_faq, args=(mtime,), daemon=True
+            )
+            self._reload_thread.start()
+        else:
+            self._rebuild_faq(mtime)
+        return True
+    
+    def _rebuild_faq(self, mtime: Optional[int]):
+        """Побудова нового індексу FAQ та атомарна заміна поточного"""
+        try:
+            try:
+                faq_matcher = self._build_faq_matcher()
+                spell_corrector = self._build_spell_corrector(faq_matcher.index)
+            except (OSError, ValueError):
+                # Файл може бути записаний не повністю - повторимо при наступній перевірці
+                return
+            
+            self.faq_matcher = faq_matcher
+            self.spell_corrector = spell_corrector
+            self._faq_mtime = mtime
+        finally:
+            self._reload_lock.release()
+    
+    def _check_faq_reload(self):
+        """Періодична перевірка змін файлу FAQ"""
+        if self.faq_reload_interval is None:
+            return
+        
+        now = time.monotonic()
+        if now - self._last_reload_check >= self.faq_reload_interval:
+            self._last_reload_check = now
+            self.reload_faq_if_changed()
+    
     def _initialize_intents(self) -> Dict[str, dict]:
         """Ініціалізація інтентів (намірів)"""
         return {
@@ -97,6 +279,29 @@ class UkrenergoChatbot:
             }
         }
     
+    @staticmethod
+    def _freeze_intents(intents: Dict[str, dict]) -> Mapping[str, Mapping]:
+        """Незмінна копія інтентів"""
+        return MappingProxyType({
+            intent_name: MappingProxyType({key: tuple(values) for key, values in intent_data.items()})
+            for intent_name, intent_data in intents.items()
+        })
+    
+    def _prepare_intent_patterns(self) -> Tuple[Tuple[int, str, str], ...]:
+        """Шаблони інтентів після нормалізації та стемінгу, без повторів словоформ"""
+        prepared = []
+        for order, (intent_name, intent_data) in enumerate(self.intents.items()):
+            patterns = dict.fromkeys(self._normalize_text(pattern) for pattern in intent_data['patterns'])
+            prepared.extend((order, intent_name, pattern) for pattern in patterns if pattern)
+        return tuple(prepared)
+    
+    def _build_intent_automaton(self) -> AhoCorasick:
+        """Компіляція шаблонів усіх інтентів в один автомат"""
+        # Значення - (порядок оголошення, назва інтенту)
+        return AhoCorasick(
+            (pattern, (order, intent_name)) for order, intent_name, pattern in self.intent_patterns
+        )
+    
     def process_message(self, message: str, user_id: str = None) -> str:
         """
         Обробка повідомлення від користувача
@@ -108,61 +313,156 @@ class UkrenergoChatbot:
         Returns:
             Відповідь чат-бота
         """
-        start_time = datetime.now()
+        # Тривалості етапів у наносекундах
+        stages = {}
+        start = time.perf_counter_ns()
+        
+        # Підхоплення оновленого FAQ (перебудова не блокує запит)
+        self._check_faq_reload()
+        mark = self._end_stage(stages, 'reload_check', start)
         
         # Логування запиту
         self._log_request(message, user_id)
+        mark = self._end_stage(stages, 'logging', mark)
         
         # Нормалізація тексту
         normalized_message = self._normalize_text(message)
+        self._end_stage(stages, 'normalization', mark)
         
-        # Визначення наміру
-        intent = self._detect_intent(normalized_message)
+        # Визначення наміру та пошук в FAQ (етапи фіксуються всередині)
+        intent, faq_answer = self._resolve_message(normalized_message, stages)
+        mark = time.perf_counter_ns()
         
-        # Пошук відповіді
-        response = self._find_response(normalized_message, intent)
+        # Формування відповіді
+        response = self._find_response(intent, faq_answer)
+        mark = self._end_stage(stages, 'response', mark)
         
         # Збереження в історію
         self._save_to_history(user_id, message, response)
+        mark = self._end_stage(stages, 'history', mark)
+        stages['total'] = mark - start
         
-        # Оновлення статистики
-        self._update_stats(start_time, message, response)
+        # Оновлення статистики: популярні запити - в читабельному вигляді, без основ слів
+        self._update_stats(normalize_text(message), response, stages)
         
         return response
     
-    def _normalize_text(self, text: str) -> str:
-        """Нормалізація тексту"""
-        # Приведення до нижнього регістру
-        text = text.lower()
+    @staticmethod
+    def _end_stage(stages: Dict[str, int], stage: str, start_ns: int) -> int:
+        """
+        Фіксація тривалості етапу
         
-        # Видалення зайвих пробілів
-        text = ' '.join(text.split())
+        Args:
+            stages: Тривалості етапів запиту
+            stage: Назва етапу
+            start_ns: Початок етапу (perf_counter_ns)
+            
+        Returns:
+            Кінець етапу, він же початок наступного
+        """
+        now = time.perf_counter_ns()
+        stages[stage] = now - start_ns
+        return now
+    
+    def add_stage_hook(self, hook: Callable[[Dict[str, int]], None]):
+        """
+        Підписка на тривалості етапів кожного запиту
         
-        # Видалення пунктуації
-        text = re.sub(r'[^\w\s]', '', text)
+        Обробник викликається синхронно в потоці запиту, тому має бути швидким.
+        Винятки обробника записуються в журнал і не впливають на відповідь.
         
-        return text
+        Args:
+            hook: Функція, що отримує словник етап -> тривалість у наносекундах
+        """
+        self.stage_hooks.append(hook)
+    
+    def _normalize_text(self, text: str) -> str:
+        """Нормалізація, виправлення помилок розпізнавання (якщо увімкнено) та зведення слів до основ"""
+        text = normalize_text(text)
+        spell_corrector = self.spell_corrector
+        if spell_corrector is not None:
+            text = spell_corrector.correct_text(text)
+        return stem_text(text)
     
     def _detect_intent(self, text: str) -> str:
-        """Визначення наміру користувача"""
-        best_intent = 'unknown'
-        best_score = 0
-        
-        for intent_name, intent_data in self.intents.items():
-            for pattern in intent_data['patterns']:
-                similarity = SequenceMatcher(None, text, pattern).ratio()
-                if similarity > best_score and similarity > 0.6:
-                    best_score = similarity
-                    best_intent = intent_name
-        
-        return best_intent
-    
-    def _find_response(self, query: str, intent: str) -> str:
-        """Пошук відповіді на запит"""
-        # Пошук в FAQ
-        faq_response = self._search_faq(query)
-        if faq_response:
-            return faq_response
+        """
+        Визначення наміру користувача
+        
+        Args:
+            text: Запит після _normalize_text (той самий, що для пошуку в FAQ і ключа кешу)
+            
+        Returns:
+            Назва інтенту або 'unknown'
+        """
+        # Точні збіги шаблонів за один прохід автомата: зараховуються лише цілі слова,
+        # тобто основа слова запиту має дорівнювати основі шаблону ("хай" не збігається з "хайп")
+        matched_lengths = {}
+        # Шаблони, з яких лише починається довше слово запиту: це інше слово, а не помилка
+        prefixes = set()
+        for start, pattern, intent_key in self.intent_automaton.iter_matches(text):
+            if start and text[start - 1] != ' ':
+                continue
+            end = start + len(pattern)
+            if end == len(text) or text[end] == ' ':
+                matched_lengths[intent_key] = matched_lengths.get(intent_key, 0) + len(pattern)
+            else:
+                prefixes.add(pattern)
+        
+        if matched_lengths:
+            # Перемагає інтент з найбільшою сумарною довжиною збігів,
+            # при рівності - оголошений раніше
+            order, intent_name = max(matched_lengths, key=lambda key: (matched_lengths[key], -key[0]))
+            return intent_name
+        
+        # Нечітке порівняння лише за відсутності точних збігів
+        match = self.similarity.best_match(
+            text,
+            ((intent_name, pattern) for _, intent_name, pattern in self.intent_patterns
+             if pattern not in prefixes),
+            0.6
+        )
+        
+        return match[0] if match else 'unknown'
+    
+    def _resolve_message(self, query: str,
+                         stages: Optional[Dict[str, int]] = None) -> Tuple[str, Optional[str]]:
+        """
+        Визначення наміру та відповіді з FAQ з використанням кешу
+        
+        Args:
+            query: Нормалізований запит
+            stages: Словник для тривалостей етапів (cache_lookup, intent_detection, faq_search)
+            
+        Returns:
+            (інтент, відповідь з FAQ або None)
+        """
+        stages = {} if stages is None else stages
+        mark = time.perf_counter_ns()
+        
+        # Один знімок FAQ на весь запит, навіть якщо паралельно відбувається заміна
+        faq_matcher = self.faq_matcher
+        
+        # Версія FAQ у ключі робить записи для старих даних недосяжними
+        cache_key = (faq_matcher.index.version, query)
+        resolved = self.response_cache.get(cache_key)
+        mark = self._end_stage(stages, 'cache_lookup', mark)
+        
+        if resolved is None:
+            intent = self._detect_intent(query)
+            mark = self._end_stage(stages, 'intent_detection', mark)
+            faq_answer = self._search_faq(query, faq_matcher)
+            self._end_stage(stages, 'faq_search', mark)
+            
+            resolved = (intent, faq_answer)
+            self.response_cache.put(cache_key, resolved)
+        
+        return resolved
+    
+    def _find_response(self, intent: str, faq_answer: Optional[str]) -> str:
+        """Формування відповіді на запит"""
+        # Відповідь з FAQ
+        if faq_answer:
+            return faq_answer
         
         # Генерація відповіді за наміром
         if intent in self.intents and intent != 'unknown':
@@ -172,28 +472,101 @@ class UkrenergoChatbot:
         # Загальна відповідь
         return self._get_fallback_response()
     
-    def _search_faq(self, query: str) -> Optional[str]:
+    def _search_faq(self, query: str, faq_matcher: Optional[FaqMatcher] = None) -> Optional[str]:
         """Пошук відповіді в FAQ"""
-        best_match = None
-        best_score = 0
+        faq_matcher = faq_matcher or self.faq_matcher
+        match = self._match_faq(query, faq_matcher)
+        if match is not None:
+            return faq_matcher.index.questions[match[0]]['answer']
         
-        for question in self.faq_data.get('questions', []):
-            # Перевірка ключових слів
-            keywords = question.get('keywords', [])
-            keyword_match = any(keyword in query for keyword in keywords)
-            
-            if keyword_match:
-                return question['answer']
+        return None
+    
+    def _match_faq(self, query: str,
+                   faq_matcher: Optional[FaqMatcher] = None) -> Optional[Tuple[int, Optional[float]]]:
+        """
+        Пошук питання FAQ для запиту
+        
+        Args:
+            query: Нормалізований запит
+            faq_matcher: Знімок FAQ для пошуку (за замовчуванням - поточний)
             
-            # Порівняння з питанням
-            question_text = self._normalize_text(question['question'])
-            similarity = SequenceMatcher(None, query, question_text).ratio()
+        Returns:
+            (позиція питання, оцінка схожості) або None;
+            для збігу за ключовим словом оцінка - None
+        """
+        faq_matcher = faq_matcher or self.faq_matcher
+        
+        # Перевірка ключових слів
+        keyword_position = faq_matcher.index.find_keyword_match(query)
+        if keyword_position is not None:
+            return keyword_position, None
+        
+        # Порівняння з питаннями
+        return faq_matcher.match(query)
+    
+    def process_messages(self, messages: List[str]) -> Dict:
+        """
+        Пакетна обробка повідомлень (наприклад, для перевірки змін у FAQ на журналах запитів)
+        
+        На відміну від process_message не пише в сесію Streamlit, історію та статистику.
+        Однакові запити обробляються один раз, а порівняння з питаннями FAQ
+        виконується пакетом (для 'sequence' - з векторизованими оцінками
+        DifflibSimilarity.best_match_batch); результати збігаються з process_message.
+        
+        Args:
+            messages: Список повідомлень
             
-            if similarity > best_score and similarity > 0.7:
-                best_score = similarity
-                best_match = question['answer']
+        Returns:
+            Словник з результатами для кожного повідомлення та часом етапів у секундах
+        """
+        timings = {}
+        start = time.perf_counter()
+        
+        # Журнали запитів складаються переважно з повторів: кожен різний текст
+        # нормалізується, а кожен різний нормалізований запит оцінюється один раз
+        normalized = {message: self._normalize_text(message) for message in dict.fromkeys(messages)}
+        normalized_messages = [normalized[message] for message in messages]
+        queries = list(dict.fromkeys(normalized.values()))
+        timings['normalization'] = time.perf_counter() - start
+        
+        stage_start = time.perf_counter()
+        intents = {query: self._detect_intent(query) for query in queries}
+        timings['intent_detection'] = time.perf_counter() - stage_start
+        
+        stage_start = time.perf_counter()
+        faq_matcher = self.faq_matcher
+        index = faq_matcher.index
+        matches = {}
+        for query in queries:
+            position = index.find_keyword_match(query)
+            if position is not None:
+                matches[query] = (position, None)
+        
+        # Запити без збігу за ключовими словами оцінюються одним пакетом
+        remaining = [query for query in queries if query not in matches]
+        matches.update(zip(remaining, faq_matcher.match_batch(remaining)))
+        timings['faq_search'] = time.perf_counter() - stage_start
+        
+        results = []
+        for message, query in zip(messages, normalized_messages):
+            intent, match = intents[query], matches[query]
+            question = index.questions[match[0]] if match is not None else None
+            results.append({
+                'message': message,
+                'normalized_message': query,
+                'intent': intent,
+                'answer': self._find_response(intent, question['answer'] if question else None),
+                'question_id': question.get('id', match[0]) if question else None,
+                'score': match[1] if match is not None else None
+            })
+        
+        timings['total'] = time.perf_counter() - start
         
-        return best_match
+        return {
+            'results': results,
+            'timings': timings,
+            'messages_per_second': len(messages) / timings['total'] if timings['total'] > 0 else 0
+        }
     
     def _get_fallback_response(self) -> str:
         """Отримання загальної відповіді"""
@@ -216,10 +589,14 @@ class UkrenergoChatbot:
         }
         
         # Збереження в сесії Streamlit
-        if 'chat_logs' not in st.session_state:
-            st.session_state.chat_logs = []
+        if self.session_logging:
+            if 'chat_logs' not in st.session_state:
+                st.session_state.chat_logs = []
+            
+            st.session_state.chat_logs.append(log_entry)
         
-        st.session_state.chat_logs.append(log_entry)
+        if self.chat_log is not None:
+            self.chat_log.write(dict(log_entry, type='request'))
     
     def _save_to_history(self, user_id: str, message: str, response: str):
         """Збереження в історію розмови"""
@@ -229,43 +606,78 @@ class UkrenergoChatbot:
             'user_message': message,
             'bot_response': response
         }
-        self.conversation_history.append(entry)
-    
-    def _update_stats(self, start_time: datetime, message: str, response: str):
-        """Оновлення статистики"""
-        self.stats['total_questions'] += 1
-        
-        if response not in self.intents.get('unknown', {}).get('responses', []):
-            self.stats['answered_questions'] += 1
+        self.conversation_history.append(user_id or 'anonymous', entry)
         
-        # Час відповіді
-        response_time = (datetime.now() - start_time).total_seconds()
-        self.stats['response_times'].append(response_time)
-        
-        # Популярні питання (спрощено)
-        normalized_message = self._normalize_text(message)
-        if normalized_message in self.stats['common_questions']:
-            self.stats['common_questions'][normalized_message] += 1
-        else:
-            self.stats['common_questions'][normalized_message] = 1
+        if self.chat_log is not None:
+            self.chat_log.write(dict(entry, type='history'))
+    
+    def _update_stats(self, display_message: str, response: str, stages: Dict[str, int]):
+        """Оновлення статистики (display_message - запит для звітів про популярні питання)"""
+        answered = response not in self.intents.get('unknown', {}).get('responses', ())
+        
+        # Запит, відповідь, час і етапи - у смузі поточного потоку
+        self.request_stats.record(display_message, answered, stages['total'] / 1e9, stages)
+        
+        for hook in self.stage_hooks:
+            try:
+                hook(stages)
+            except Exception:
+                # Помилка обробника метрик не повинна зривати відповідь користувачу
+                logger.exception("Помилка обробника тривалостей етапів %r", hook)
+    
+    @property
+    def stats(self) -> Dict:
+        """Знімок лічильників запитів, об'єднаний з усіх смуг"""
+        # Спершу відповіді, потім загальна кількість: частка не перевищить 100%
+        answered = self.request_stats.answered_questions
+        return {
+            'total_questions': self.request_stats.total_questions,
+            'answered_questions': answered,
+            'response_times': self.request_stats.response_times()
+        }
     
     def get_statistics(self) -> Dict:
         """Отримання статистики чат-бота"""
-        total = self.stats['total_questions']
-        answered = self.stats['answered_questions']
+        counters = self.stats
+        total = counters['total_questions']
+        answered = counters['answered_questions']
+        response_times = counters['response_times']
+        common_questions = self.request_stats.common_questions(5)
         
         stats = {
             'total_questions': total,
             'answered_questions': answered,
             'answer_rate': (answered / total) * 100 if total > 0 else 0,
-            'avg_response_time': sum(self.stats['response_times']) / len(self.stats['response_times']) if self.stats['response_times'] else 0,
-            'common_questions': dict(sorted(self.stats['common_questions'].items(), key=lambda item: item[1], reverse=True)[:5])
+            'avg_response_time': response_times.mean,
+            'response_time': response_times.get_statistics(),
+            # Розподіл тривалостей кожного етапу обробки в секундах
+            'stages': {
+                stage: histogram.get_statistics()
+                for stage, histogram in self.request_stats.stage_times().items()
+            },
+            'common_questions': {question: count for question, count, _ in common_questions},
+            # Оцінки частот можуть бути завищені не більше ніж на похибку
+            'common_questions_errors': {question: error for question, _, error in common_questions},
+            'response_cache': self.response_cache.get_statistics()
         }
+        if self.chat_log is not None:
+            stats['chat_log'] = self.chat_log.get_statistics()
         return stats
     
-    def get_conversation_history(self) -> List[Dict]:
-        """Отримання історії розмови"""
-        return self.conversation_history
+    def get_conversation_history(self, user_id: Optional[str] = None, offset: int = 0,
+                                 limit: Optional[int] = None) -> List[Dict]:
+        """
+        Отримання історії розмови користувача посторінково
+        
+        Args:
+            user_id: Ідентифікатор користувача
+            offset: Кількість пропущених найдавніших реплік
+            limit: Розмір сторінки (None - до кінця)
+            
+        Returns:
+            Список реплік від давніших до новіших
+        """
+        return self.conversation_history.get_history(user_id or 'anonymous', offset, limit)
     
     def generate_daily_report(self) -> str:
         """Генерація щоденного звіту"""
@@ -280,25 +692,48 @@ class UkrenergoChatbot:
         • Кількість відповідей: {stats['answered_questions']}
         • Відсоток відповідей: {stats['answer_rate']:.1f}%
         • Середній час відповіді: {stats['avg_response_time']:.2f} сек
+        • Час відповіді p50/p90/p99: {stats['response_time']['p50']:.2f} / {stats['response_time']['p90']:.2f} / {stats['response_time']['p99']:.2f} сек
         
         Топ-5 популярних питань:
         """
         
         for i, (q, count) in enumerate(stats['common_questions'].items(), 1):
-            report += f"{i}. {q} ({count} разів)\n"
+            # Для наближених оцінок показується діапазон частоти
+            error = stats['common_questions_errors'].get(q, 0)
+            frequency = f"{count - error}-{count}" if error else f"{count}"
+            report += f"{i}. {q} ({frequency} разів)\n"
         
         report += "\nКінець звіту."
         return report
 
 # Глобальний екземпляр чат-бота
 chatbot_instance = None
+_chatbot_lock = threading.Lock()
 
 def get_chatbot():
     """Отримання глобального екземпляру чат-бота"""
     global chatbot_instance
-    if chatbot_instance is None:
-        from config import config
-        chatbot_instance = UkrenergoChatbot(
-            faq_file=str(config.DATA_DIR / 'faq.json')
-        )
+    # Подвійна перевірка: блокування потрібне лише під час першого створення
+    if chatbot_instance is not None:
+        return chatbot_instance
+    
+    with _chatbot_lock:
+        if chatbot_instance is None:
+            from config import config
+            chatbot_instance = UkrenergoChatbot(
+                faq_file=str(config.DATA_DIR / 'faq.json'),
+                faq_matcher=config.CHATBOT_SETTINGS['faq_matcher'],
+                response_cache_size=config.CHATBOT_SETTINGS['response_cache_size'],
+                faq_reload_interval=config.CHATBOT_SETTINGS['faq_reload_interval'],
+                common_questions_capacity=config.CHATBOT_SETTINGS['common_questions_capacity'],
+                max_history=config.CHATBOT_SETTINGS['max_history'],
+                history_dir=str(config.CONVERSATIONS_DIR),
+                chat_log_file=str(config.CHAT_LOG_FILE),
+                faq_workers=config.CHATBOT_SETTINGS['faq_workers'],
+                spell_correction=config.CHATBOT_SETTINGS['spell_correction']
+            )
+            # Залишок черг журналу та історії дописується при завершенні процесу
+            atexit.register(chatbot_instance.conversation_history.close)
+            if chatbot_instance.chat_log is not None:
+                atexit.register(chatbot_instance.chat_log.close)
     return chatbot_instance
@@ -0,0 +1,264 @@
+"""
+Модуль зберігання історії розмов з обмеженим обсягом пам'яті
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import queue
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Кількість користувачів, чиї останні репліки тримаються в пам'яті
+MAX_USERS_IN_MEMORY = 1000
+
+# Кількість незалежних смуг (користувачі розподіляються між ними за хешем)
+HISTORY_STRIPES = 16
+
+# Ознака завершення роботи потоку вивантаження
+_STOP = object()
+
+
+class ConversationStore:
+    """
+    Історія розмов окремо для кожного користувача
+
+    У пам'яті зберігаються лише останні max_history реплік кожного з
+    max_users найактивніших користувачів. Старіші репліки дописуються у
+    JSONL-файл користувача (якщо задано spill_dir) або відкидаються.
+
+    Користувачі розподілені між смугами з окремими блокуваннями, тому
+    паралельні сесії різних користувачів не чекають одна на одну.
+
+    Запит не пише на диск: витіснені репліки переходять у чергу
+    вивантаження смуги, а файли дописує фоновий потік без блокування
+    смуги. Поки запис не завершено, репліки читаються з черги, а файл -
+    лише до підтвердженого потоком розміру, тому історія не втрачає і не
+    повторює реплік.
+    """
+
+    def __init__(self, max_history: int = 10, spill_dir: Optional[str] = None,
+                 max_users: int = MAX_USERS_IN_MEMORY, stripes: int = HISTORY_STRIPES):
+        """
+        Args:
+            max_history: Кількість останніх реплік користувача в пам'яті
+            spill_dir: Каталог для старіших реплік (None - не зберігати)
+            max_users: Кількість користувачів з репліками в пам'яті
+            stripes: Кількість смуг
+        """
+        self.max_history = max_history
+        self.spill_dir = spill_dir
+        self.max_users = max_users
+        # Ліміт користувачів ділиться між смугами
+        self._users_per_stripe = max(1, -(-max_users // stripes))
+        # Смуга: (блокування, користувач -> останні репліки від давно активних до недавніх,
+        #         користувач -> репліки в черзі вивантаження,
+        #         користувач -> розмір файлу, записаний фоновим потоком)
+        self._stripes = [(threading.Lock(), OrderedDict(), {}, {}) for _ in range(stripes)]
+
+        self.stats = {'spilled': 0, 'errors': 0}
+        self._spill_queue = queue.Queue()
+        self._spill_thread = None
+        if spill_dir is not None:
+            self._spill_thread = threading.Thread(target=self._run_spill, name='history-spill', daemon=True)
+            self._spill_thread.start()
+
+    def _stripe(self, user_id: str) -> Tuple[threading.Lock, OrderedDict, Dict, Dict]:
+        """Смуга користувача"""
+        return self._stripes[hash(user_id) % len(self._stripes)]
+
+    def _spill_path(self, user_id: str) -> str:
+        """Шлях до файлу реплік користувача"""
+        digest = hashlib.sha1(user_id.encode('utf-8')).hexdigest()
+        return os.path.join(self.spill_dir, f"{digest}.jsonl")
+
+    def _spill(self, user_id: str, entries: List[Dict], pending: Dict[str, List[Dict]]):
+        """Передача реплік у чергу вивантаження (викликається під блокуванням смуги)"""
+        if self.spill_dir is None or not entries:
+            return
+
+        queued = pending.get(user_id)
+        if queued is None:
+            queued = pending[user_id] = []
+            # Користувач стає в чергу потоку один раз, доки його репліки не записано
+            self._spill_queue.put(user_id)
+        queued.extend(entries)
+
+    def _write_spilled(self, user_id: str):
+        """Дописування реплік користувача з черги у файл (фоновий потік)"""
+        lock, _, pending, committed = self._stripe(user_id)
+        path = self._spill_path(user_id)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+
+        with lock:
+            entries = list(pending.get(user_id, ()))
+            # Читачі бачать файл лише до цього розміру, доки запис не підтверджено
+            committed.setdefault(user_id, size)
+
+        lines = ''.join(
+            json.dumps(dict(entry, timestamp=entry['timestamp'].isoformat()), ensure_ascii=False) + '\n'
+            for entry in entries
+        ).encode('utf-8')
+        try:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            with open(path, 'ab') as f:
+                f.write(lines)
+                size = f.tell()
+            self.stats['spilled'] += len(entries)
+        except OSError:
+            # Недоступний диск не повинен зупиняти потік; репліки відкидаються,
+            # а частково дописаний рядок обрізається
+            self.stats['errors'] += len(entries)
+            try:
+                os.truncate(path, size)
+            except OSError:
+                pass
+
+        with lock:
+            queued = pending[user_id]
+            del queued[:len(entries)]
+            committed[user_id] = size
+            if queued:
+                # Нові репліки надійшли під час запису
+                self._spill_queue.put(user_id)
+            else:
+                del pending[user_id]
+                # Без запису в процесі розмір файлу знову точний
+                del committed[user_id]
+
+    def _run_spill(self):
+        """Цикл фонового потоку вивантаження"""
+        while True:
+            user_id = self._spill_queue.get()
+            try:
+                if user_id is _STOP:
+                    return
+                self._write_spilled(user_id)
+            finally:
+                self._spill_queue.task_done()
+
+    def flush(self):
+        """Очікування запису всіх витіснених до виклику реплік"""
+        if self._spill_thread is not None:
+            self._spill_queue.join()
+
+    def close(self, timeout: Optional[float] = None):
+        """
+        Запис залишку черги та зупинка фонового потоку
+
+        Args:
+            timeout: Найдовше очікування зупинки в секундах
+        """
+        if self._spill_thread is not None and self._spill_thread.is_alive():
+            self.flush()
+            self._spill_queue.put(_STOP)
+            self._spill_thread.join(timeout)
+
+    def append(self, user_id: str, entry: Dict):
+        """
+        Додавання репліки
+
+        Args:
+            user_id: Ідентифікатор користувача
+            entry: Репліка з полем 'timestamp' (datetime)
+        """
+        lock, users, pending, _ = self._stripe(user_id)
+        with lock:
+            recent = users.get(user_id)
+            if recent is None:
+                recent = users[user_id] = deque()
+            users.move_to_end(user_id)
+
+            recent.append(entry)
+            if len(recent) > self.max_history:
+                self._spill(user_id, [recent.popleft()], pending)
+
+            # Найдавніше активні користувачі вивантажуються повністю
+            while len(users) > self._users_per_stripe:
+                evicted_user, evicted = users.popitem(last=False)
+                self._spill(evicted_user, list(evicted), pending)
+
+    def _spilled_size(self, user_id: str, committed: Dict[str, int]) -> int:
+        """Розмір записаної частини файлу реплік користувача в байтах (під блокуванням смуги)"""
+        if self.spill_dir is None:
+            return 0
+        if user_id in committed:
+            return committed[user_id]
+        try:
+            return os.path.getsize(self._spill_path(user_id))
+        except OSError:
+            return 0
+
+    def _iter_spilled(self, user_id: str, size: int) -> Iterator[Dict]:
+        """Послідовне читання перших size байтів вивантажених реплік користувача"""
+        if not size:
+            return
+
+        with open(self._spill_path(user_id), 'rb') as f:
+            position = 0
+            while position < size:
+                line = f.readline()
+                if not line:
+                    break
+                position += len(line)
+                entry = json.loads(line)
+                entry['timestamp'] = datetime.fromisoformat(entry['timestamp'])
+                yield entry
+
+    def iter_history(self, user_id: str) -> Iterator[Dict]:
+        """
+        Усі репліки користувача від найдавнішої, з читанням файлу на вимогу
+
+        Args:
+            user_id: Ідентифікатор користувача
+
+        Returns:
+            Ітератор реплік
+        """
+        lock, users, pending, committed = self._stripe(user_id)
+        with lock:
+            recent = list(users.get(user_id, ()))
+            queued = list(pending.get(user_id, ()))
+            # Файл читається лише до межі, узгодженої зі знімком пам'яті та черги
+            spilled_size = self._spilled_size(user_id, committed)
+
+        return itertools.chain(self._iter_spilled(user_id, spilled_size), queued, recent)
+
+    def get_history(self, user_id: str, offset: int = 0, limit: Optional[int] = None) -> List[Dict]:
+        """
+        Сторінка історії користувача
+
+        Args:
+            user_id: Ідентифікатор користувача
+            offset: Кількість пропущених найдавніших реплік
+            limit: Розмір сторінки (None - до кінця)
+
+        Returns:
+            Список реплік від давніших до новіших
+        """
+        stop = None if limit is None else offset + limit
+        return list(itertools.islice(self.iter_history(user_id), offset, stop))
+
+    def get_recent(self, user_id: str) -> List[Dict]:
+        """
+        Останні репліки користувача з пам'яті
+
+        Args:
+            user_id: Ідентифікатор користувача
+
+        Returns:
+            Не більше max_history реплік
+        """
+        lock, users, _, _ = self._stripe(user_id)
+        with lock:
+            return list(users.get(user_id, ()))
+
+    def __len__(self) -> int:
+        """Кількість реплік у пам'яті"""
+        return sum(len(recent) for _, users, _, _ in self._stripes for recent in list(users.values()))
@@ -0,0 +1,298 @@
+"""
+Модуль компіляції FAQ у бінарний артефакт для швидкого холодного старту
+
+Артефакт містить нормалізовані питання, таблиці ключових слів, автомат
+пошуку ключових слів, словник виправлення помилок і пошукові індекси. Файл відкривається через mmap, тому час запуску не залежить від
+розміру FAQ, а кілька процесів ділять одні й ті самі сторінки пам'яті.
+
+Компіляція:
+    python -m modules.faq_artifact data/faq.json data/faq.faqidx
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import Mapping, Sequence
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from modules.aho_corasick import FLAT_ARRAYS, FlatAhoCorasick
+from modules.faq_index import FaqIndex
+from modules.faq_matchers import build_tfidf_arrays
+
+ARTIFACT_SUFFIX = '.faqidx'
+ARTIFACT_MAGIC = b'UKFAQIDX'
+FORMAT_VERSION = 6
+
+# Вирівнювання секцій для прямого доступу до масивів через mmap
+SECTION_ALIGNMENT = 64
+
+
+class StringTable(Sequence):
+    """Рядки, що зберігаються як спільний UTF-8 буфер та масив зміщень"""
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        """
+        Args:
+            blob: Байти всіх рядків поспіль (uint8)
+            offsets: Зміщення початку кожного рядка та кінця останнього (int64)
+        """
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        start, end = self.offsets[position], self.offsets[position + 1]
+        return self.blob[start:end].tobytes().decode('utf-8')
+
+    @staticmethod
+    def encode(strings: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Кодування рядків у (buffer, offsets)"""
+        encoded = [string.encode('utf-8') for string in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(item) for item in encoded], out=offsets[1:])
+        return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+
+class QuestionTable(Sequence):
+    """Записи питань FAQ, що декодуються з JSON лише при зверненні"""
+
+    def __init__(self, records: StringTable):
+        self.records = records
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+        return json.loads(self.records[int(position)])
+
+
+class SortedKeyTable(Mapping):
+    """Відображення ключ -> список значень з відсортованими ключами (бінарний пошук)"""
+
+    def __init__(self, keys: StringTable, pointers: np.ndarray, values: List):
+        """
+        Args:
+            keys: Відсортовані ключі
+            pointers: Межі значень кожного ключа (int64, довжина на 1 більша за ключі)
+            values: Паралельні масиви значень; значення ключа - кортежі з них
+        """
+        self.keys_table = keys
+        self.pointers = pointers
+        self.values_arrays = values
+
+    def __len__(self) -> int:
+        return len(self.keys_table)
+
+    def __iter__(self):
+        return iter(self.keys_table)
+
+    def _find(self, key: str) -> int:
+        """Позиція ключа або -1"""
+        low, high = 0, len(self.keys_table)
+        while low < high:
+            middle = (low + high) // 2
+            if self.keys_table[middle] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self.keys_table) and self.keys_table[low] == key:
+            return low
+        return -1
+
+    def __getitem__(self, key: str) -> List:
+        position = self._find(key)
+        if position < 0:
+            raise KeyError(key)
+
+        start, end = self.pointers[position], self.pointers[position + 1]
+        columns = [
+            values[start:end] if isinstance(values, StringTable) else values[start:end].tolist()
+            for values in self.values_arrays
+        ]
+        if len(columns) == 1:
+            return columns[0]
+        return list(zip(*columns))
+
+
+def _flatten_key_table(table: Dict[str, List]) -> Tuple[List[str], np.ndarray, List[List]]:
+    """Перетворення dict ключ -> список значень на відсортовані ключі, межі та значення"""
+    keys = sorted(table)
+    pointers = np.zeros(len(keys) + 1, dtype=np.int64)
+    np.cumsum([len(table[key]) for key in keys], out=pointers[1:])
+    values = [value for key in keys for value in table[key]]
+    return keys, pointers, values
+
+
+def compile_faq(faq_data: dict, artifact_path: str):
+    """
+    Компіляція FAQ у бінарний артефакт
+
+    Файл записується у тимчасовий і атомарно підміняє попередній, тому
+    процеси, що вже відобразили старий артефакт у пам'ять, працюють далі.
+
+    Args:
+        faq_data: Дані FAQ
+        artifact_path: Шлях до артефакту
+    """
+    index = FaqIndex(faq_data)
+    sections: Dict[str, np.ndarray] = {}
+
+    def add_strings(name: str, strings: Iterable[str]):
+        sections[f'{name}.blob'], sections[f'{name}.offsets'] = StringTable.encode(strings)
+
+    add_strings('questions', (json.dumps(question, ensure_ascii=False) for question in index.questions))
+    add_strings('normalized', index.normalized_questions)
+
+    keys, pointers, positions = _flatten_key_table(index.token_index)
+    add_strings('token_keys', keys)
+    sections['token_pointers'] = pointers
+    sections['token_positions'] = np.asarray(positions, dtype=np.int32)
+
+    keys, pointers, positions = _flatten_key_table(index.keyword_index)
+    add_strings('keyword_keys', keys)
+    sections['keyword_pointers'] = pointers
+    sections['keyword_positions'] = np.asarray(positions, dtype=np.int32)
+    
+    # Автомат ключових слів у плоских масивах: значення шаблону - номер ключа в keyword_keys
+    keyword_ids = {keyword: position for position, keyword in enumerate(keys)}
+    for name, array in index._get_keyword_automaton().to_arrays(keyword_ids.__getitem__).items():
+        sections[f'keyword_automaton.{name}'] = array
+
+    for name, array in build_tfidf_arrays(index.normalized_questions).items():
+        sections[f'tfidf.{name}'] = array
+
+    # Словник виправлення помилок: без нього довелося б декодувати всі записи питань
+    vocabulary = index.vocabulary()
+    words = sorted(vocabulary)
+    add_strings('vocabulary_words', words)
+    sections['vocabulary_counts'] = np.asarray([vocabulary[word] for word in words], dtype=np.int32)
+
+    # Розмітка секцій: зміщення рахуються після заголовка
+    layout = {}
+    header = {
+        'format_version': FORMAT_VERSION,
+        'version': index.version,
+        'categories': faq_data.get('categories', {}),
+        'sections': layout,
+    }
+    for name, array in sections.items():
+        layout[name] = {'dtype': array.dtype.str, 'count': int(array.size), 'offset': 0}
+
+    def align(offset: int) -> int:
+        return (offset + SECTION_ALIGNMENT - 1) // SECTION_ALIGNMENT * SECTION_ALIGNMENT
+
+    # Довжина заголовка залежить від зміщень, тому рахуємо до стабілізації
+    header_bytes = b''
+    while True:
+        offset = align(len(ARTIFACT_MAGIC) + 8 + len(header_bytes))
+        for name, array in sections.items():
+            layout[name]['offset'] = offset
+            offset = align(offset + array.nbytes)
+        new_header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+        if new_header_bytes == header_bytes:
+            break
+        header_bytes = new_header_bytes
+
+    directory = os.path.dirname(os.path.abspath(artifact_path))
+    with tempfile.NamedTemporaryFile('wb', dir=directory, delete=False) as f:
+        f.write(ARTIFACT_MAGIC)
+        f.write(struct.pack('<Q', len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in sections.items():
+            f.write(b'\0' * (layout[name]['offset'] - f.tell()))
+            f.write(np.ascontiguousarray(array).tobytes())
+        temp_path = f.name
+
+    os.replace(temp_path, artifact_path)
+
+
+def load_faq_artifact(artifact_path: str) -> FaqIndex:
+    """
+    Завантаження індексу FAQ зі скомпільованого артефакту через mmap
+
+    Args:
+        artifact_path: Шлях до артефакту
+
+    Returns:
+        FaqIndex, таблиці якого читаються безпосередньо з файлу
+    """
+    with open(artifact_path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if buffer[:len(ARTIFACT_MAGIC)] != ARTIFACT_MAGIC:
+        raise ValueError(f"Файл не є артефактом FAQ: {artifact_path}")
+
+    header_start = len(ARTIFACT_MAGIC) + 8
+    header_length, = struct.unpack('<Q', buffer[len(ARTIFACT_MAGIC):header_start])
+    header = json.loads(buffer[header_start:header_start + header_length].decode('utf-8'))
+    if header['format_version'] != FORMAT_VERSION:
+        raise ValueError(f"Непідтримувана версія артефакту FAQ: {header['format_version']}")
+
+    def section(name: str) -> np.ndarray:
+        info = header['sections'][name]
+        return np.frombuffer(buffer, dtype=np.dtype(info['dtype']), count=info['count'], offset=info['offset'])
+
+    def strings(name: str) -> StringTable:
+        return StringTable(section(f'{name}.blob'), section(f'{name}.offsets'))
+
+    tfidf = {
+        name.split('.', 1)[1]: section(name)
+        for name in header['sections'] if name.startswith('tfidf.')
+    }
+
+    keyword_keys = strings('keyword_keys')
+    faq_data = {
+        'categories': header['categories'],
+        'questions': QuestionTable(strings('questions')),
+    }
+
+    return FaqIndex(
+        faq_data,
+        version=header['version'],
+        normalized_questions=strings('normalized'),
+        token_index=SortedKeyTable(
+            strings('token_keys'), section('token_pointers'), [section('token_positions')]
+        ),
+        keyword_index=SortedKeyTable(
+            keyword_keys, section('keyword_pointers'), [section('keyword_positions')]
+        ),
+        keyword_automaton=FlatAhoCorasick(
+            {name: section(f'keyword_automaton.{name}') for name in FLAT_ARRAYS}, keyword_keys
+        ),
+        precomputed={
+            'tfidf': tfidf,
+            'vocabulary': {'words': strings('vocabulary_words'), 'counts': section('vocabulary_counts')},
+        },
+    )
+
+
+def main():
+    """Точка входу командного рядка"""
+    parser = argparse.ArgumentParser(description="Компіляція FAQ у бінарний артефакт")
+    parser.add_argument('faq_file', help="Шлях до faq.json")
+    parser.add_argument('artifact_file', nargs='?', help=f"Шлях до артефакту (за замовчуванням *{ARTIFACT_SUFFIX})")
+    args = parser.parse_args()
+
+    artifact_path = args.artifact_file or os.path.splitext(args.faq_file)[0] + ARTIFACT_SUFFIX
+    with open(args.faq_file, 'r', encoding='utf-8') as f:
+        faq_data = json.load(f)
+
+    compile_faq(faq_data, artifact_path)
+    print(f"Артефакт FAQ збережено: {artifact_path} ({len(faq_data.get('questions', []))} питань)")
+
+
+if __name__ == '__main__':
+    main()
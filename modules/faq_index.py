@@ -0,0 +1,184 @@
+"""
+Модуль індексації FAQ для швидкого пошуку відповідей
+"""
+
+import hashlib
+import heapq
+import json
+import math
+from collections import Counter
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from modules.aho_corasick import AhoCorasick, FlatAhoCorasick
+from modules.text_processing import normalize_text, prepare_text, tokenize
+
+# Довжина префікса токена, за яким будується індекс (стійкість до закінчень)
+TOKEN_PREFIX_LENGTH = 4
+
+# Токени, що трапляються в більшій частці питань, вважаються стоп-словами
+STOPWORD_DF_RATIO = 0.1
+STOPWORD_MIN_DF = 20
+
+# Максимальна кількість кандидатів для точного порівняння
+MAX_CANDIDATES = 50
+
+
+class FaqIndex:
+    """Інвертований індекс питань FAQ"""
+
+    def __init__(self, faq_data: dict, version: Optional[str] = None,
+                 normalized_questions: Optional[Sequence[str]] = None,
+                 token_index: Optional[Mapping] = None,
+                 keyword_index: Optional[Mapping] = None,
+                 keyword_automaton: Optional[FlatAhoCorasick] = None,
+                 precomputed: Optional[Dict[str, Dict]] = None):
+        """
+        Побудова індексу
+
+        Готові таблиці передаються при завантаженні скомпільованого артефакту
+        (див. modules/faq_artifact.py); інакше вони будуються з faq_data.
+
+        Args:
+            faq_data: Дані FAQ у форматі {'categories': ..., 'questions': [...]}
+            version: Версія вмісту FAQ
+            normalized_questions: Нормалізовані тексти питань (основи слів)
+            token_index: Префікс токена -> позиції питань
+            keyword_index: Основа ключового слова -> позиції питань
+            keyword_automaton: Готовий автомат ключових слів (значення шаблону - саме слово)
+            precomputed: Готові структури алгоритмів порівняння (наприклад, 'tfidf') та словник 'vocabulary'
+        """
+        self.faq_data = faq_data
+        self.questions = faq_data.get('questions', [])
+        self.precomputed = precomputed or {}
+
+        # Версія вмісту: змінюється разом із даними FAQ
+        self.version = version or hashlib.sha1(
+            json.dumps(faq_data, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        ).hexdigest()
+
+        # Нормалізовані тексти питань зі стемінгом (обчислюються один раз)
+        if normalized_questions is None:
+            normalized_questions = [prepare_text(question['question']) for question in self.questions]
+        self.normalized_questions = normalized_questions
+
+        # Префікс токена -> позиції питань
+        if token_index is None:
+            token_index = {}
+            for position, question_text in enumerate(self.normalized_questions):
+                for key in {self._index_key(token) for token in tokenize(question_text)}:
+                    token_index.setdefault(key, []).append(position)
+        self.token_index = token_index
+
+        # Основа ключового слова -> позиції питань (усі словоформи зводяться до однієї)
+        self._keyword_automaton: Optional[Union[AhoCorasick, FlatAhoCorasick]] = keyword_automaton
+        if keyword_index is None:
+            keyword_index = {}
+            for position, question in enumerate(self.questions):
+                keywords = {prepare_text(keyword) for keyword in question.get('keywords', [])}
+                for keyword in keywords - {''}:
+                    keyword_index.setdefault(keyword, []).append(position)
+            self.keyword_index = keyword_index
+            # Автомат будується разом з індексом
+            self._get_keyword_automaton()
+        else:
+            # Артефакт передає автомат, відображений у пам'ять; інакше він будується при першому запиті
+            self.keyword_index = keyword_index
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    @staticmethod
+    def _index_key(token: str) -> str:
+        """Ключ індексу для токена"""
+        return token[:TOKEN_PREFIX_LENGTH]
+
+    def _get_keyword_automaton(self) -> Union[AhoCorasick, FlatAhoCorasick]:
+        """Скомпільований автомат усіх ключових слів FAQ"""
+        if self._keyword_automaton is None:
+            self._keyword_automaton = AhoCorasick((keyword, keyword) for keyword in self.keyword_index)
+        return self._keyword_automaton
+
+    def vocabulary(self) -> Counter:
+        """
+        Слова питань і ключових слів FAQ (словник виправлення помилок розпізнавання)
+
+        Returns:
+            Нормалізоване слово -> кількість входжень
+        """
+        precomputed = self.precomputed.get('vocabulary')
+        if precomputed is not None:
+            # Артефакт містить готовий словник: записи питань не декодуються
+            return Counter(dict(zip(precomputed['words'], precomputed['counts'].tolist())))
+
+        texts = [question.get('question', '') for question in self.questions]
+        texts += [keyword for question in self.questions for keyword in question.get('keywords', [])]
+        return Counter(word for text in texts for word in tokenize(normalize_text(text)))
+
+    def _keyword_specificity(self, keyword: str) -> float:
+        """Специфічність ключового слова: довші та рідші слова важать більше"""
+        document_frequency = len(self.keyword_index[keyword])
+        return len(keyword) * math.log(1 + len(self.questions) / document_frequency)
+
+    def keyword_matches(self, query: str) -> List[Tuple[int, int, float]]:
+        """
+        Пошук питань, ключові слова яких входять у запит, за один прохід автомата
+
+        Args:
+            query: Нормалізований запит
+
+        Returns:
+            Список (позиція питання, кількість ключових слів, специфічність),
+            від найкращого збігу; при рівності - за порядком у FAQ
+        """
+        matched_keywords = {keyword for _, keyword, _ in self._get_keyword_automaton().iter_matches(query)}
+
+        scores: Dict[int, List] = {}
+        for keyword in matched_keywords:
+            specificity = self._keyword_specificity(keyword)
+            for position in self.keyword_index[keyword]:
+                score = scores.setdefault(position, [0, 0.0])
+                score[0] += 1
+                score[1] += specificity
+
+        ranked = [(position, count, specificity) for position, (count, specificity) in scores.items()]
+        ranked.sort(key=lambda item: (-item[1], -item[2], item[0]))
+        return ranked
+
+    def find_keyword_match(self, query: str) -> Optional[int]:
+        """
+        Пошук питання з найбільшою кількістю та специфічністю ключових слів у запиті
+
+        Args:
+            query: Нормалізований запит
+
+        Returns:
+            Позиція питання або None
+        """
+        matches = self.keyword_matches(query)
+        return matches[0][0] if matches else None
+
+    def candidates(self, query: str, limit: int = MAX_CANDIDATES) -> List[int]:
+        """
+        Відбір питань, що мають спільні токени із запитом
+
+        Args:
+            query: Нормалізований запит
+            limit: Максимальна кількість кандидатів
+
+        Returns:
+            Позиції кандидатів у порядку FAQ
+        """
+        max_df = max(STOPWORD_MIN_DF, int(len(self.questions) * STOPWORD_DF_RATIO))
+        counts = Counter()
+
+        for key in {self._index_key(token) for token in tokenize(query)}:
+            postings = self.token_index.get(key)
+            # Надто поширені токени не звужують пошук
+            if postings and len(postings) <= max_df:
+                counts.update(postings)
+
+        if len(counts) > limit:
+            best = heapq.nlargest(limit, counts.items(), key=lambda item: (item[1], -item[0]))
+            return sorted(position for position, _ in best)
+
+        return sorted(counts)
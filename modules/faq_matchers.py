@@ -0,0 +1,413 @@
+"""
+Модуль алгоритмів порівняння запиту з питаннями FAQ
+"""
+
+import math
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from modules.faq_index import FaqIndex
+from modules.semantic_search import HashingEmbedder, RandomProjectionLSH, signature_bits
+from modules.similarity import DifflibSimilarity, SimilarityBackend
+
+# Довжина символьної n-грами для TF-IDF
+NGRAM_SIZE = 3
+NGRAM_DTYPE = f'<U{NGRAM_SIZE}'
+
+# Максимальна кількість оцінок (запити x питання) в одному блоці пакетного пошуку
+BATCH_SCORES_LIMIT = 4_000_000
+
+# Максимальний розмір щільної матриці TF-IDF для пакетного пошуку (~64 МБ float32)
+DENSE_MATRIX_LIMIT = 16_000_000
+
+
+class FaqMatcher:
+    """Базовий інтерфейс пошуку найближчих питань FAQ"""
+
+    # Мінімальна оцінка, за якої питання вважається знайденим
+    threshold = 0.0
+
+    def __init__(self, index: FaqIndex):
+        """
+        Args:
+            index: Індекс FAQ
+        """
+        self.index = index
+
+    def top_k(self, query: str, k: int = 5) -> List[Tuple[int, float]]:
+        """
+        Пошук найближчих питань
+
+        Args:
+            query: Нормалізований запит
+            k: Кількість результатів
+
+        Returns:
+            Список (позиція питання, оцінка) за спаданням оцінки
+        """
+        raise NotImplementedError
+
+    def match(self, query: str) -> Optional[Tuple[int, float]]:
+        """
+        Пошук найкращого питання з оцінкою вище порогу
+
+        Args:
+            query: Нормалізований запит
+
+        Returns:
+            (позиція питання, оцінка) або None
+        """
+        results = self.top_k(query, k=1)
+        if results and results[0][1] > self.threshold:
+            return results[0]
+        return None
+
+    def match_batch(self, queries: List[str]) -> List[Optional[Tuple[int, float]]]:
+        """
+        Пошук найкращих питань для списку запитів
+
+        Args:
+            queries: Нормалізовані запити
+
+        Returns:
+            Результат match() для кожного запиту
+        """
+        return [self.match(query) for query in queries]
+
+
+class SequenceFaqMatcher(FaqMatcher):
+    """Порівняння з кандидатами з інвертованого індексу через SequenceMatcher"""
+
+    threshold = 0.7
+
+    def __init__(self, index: FaqIndex, similarity: Optional[SimilarityBackend] = None):
+        """
+        Args:
+            index: Індекс FAQ
+            similarity: Алгоритм оцінки схожості рядків
+        """
+        super().__init__(index)
+        self.similarity = similarity or DifflibSimilarity()
+
+    def _candidates(self, query: str):
+        """Пари (позиція, нормалізоване питання) у порядку FAQ"""
+        return self._pairs(self.index.candidates(query))
+
+    def _pairs(self, positions: Iterable[int]):
+        """Пари (позиція, нормалізоване питання) для заданих позицій"""
+        questions = self.index.normalized_questions
+        return ((position, questions[position]) for position in positions)
+
+    def top_k(self, query: str, k: int = 5) -> List[Tuple[int, float]]:
+        return self.top_k_candidates(query, self.index.candidates(query), k)
+
+    def top_k_candidates(self, query: str, positions: Sequence[int], k: int = 5) -> List[Tuple[int, float]]:
+        """
+        Найкращі k питань серед заданих кандидатів
+
+        Args:
+            query: Нормалізований запит
+            positions: Позиції кандидатів у порядку FAQ
+            k: Кількість результатів
+
+        Returns:
+            Список (позиція питання, оцінка) за спаданням оцінки
+        """
+        scored = [
+            (position, self.similarity.ratio(query, question_text))
+            for position, question_text in self._pairs(positions)
+        ]
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:k]
+
+    def match(self, query: str) -> Optional[Tuple[int, float]]:
+        return self.similarity.best_match(query, self._candidates(query), self.threshold)
+
+    def match_batch(self, queries: List[str]) -> List[Optional[Tuple[int, float]]]:
+        # Повторні запити оцінюються один раз
+        unique = list(dict.fromkeys(queries))
+        results = self.match_candidates_batch(unique, [self.index.candidates(query) for query in unique])
+        by_query = dict(zip(unique, results))
+        return [by_query[query] for query in queries]
+
+    def match_candidates_batch(self, queries: List[str],
+                               candidate_lists: Sequence[Sequence[int]]) -> List[Optional[Tuple[int, float]]]:
+        """
+        Найкраще питання вище порогу серед заданих кандидатів кожного запиту
+
+        Args:
+            queries: Нормалізовані запити
+            candidate_lists: Позиції кандидатів у порядку FAQ для кожного запиту
+
+        Returns:
+            (позиція питання, оцінка) або None для кожного запиту
+        """
+        # Оцінювання - пакетом алгоритму схожості
+        return self.similarity.best_match_batch(
+            queries, [list(self._pairs(positions)) for positions in candidate_lists], self.threshold
+        )
+
+
+def char_ngrams(text: str, size: int = NGRAM_SIZE) -> List[str]:
+    """
+    Символьні n-грами тексту з межами слів
+
+    Args:
+        text: Нормалізований текст
+        size: Довжина n-грами
+
+    Returns:
+        Список n-грам
+    """
+    padded = f' {text} '
+    return [padded[i:i + size] for i in range(len(padded) - size + 1)]
+
+
+def build_tfidf_arrays(texts: Sequence[str]) -> Dict[str, np.ndarray]:
+    """
+    Побудова розрідженої матриці TF-IDF символьних n-грам
+
+    Args:
+        texts: Нормалізовані тексти питань
+
+    Returns:
+        Масиви 'ngrams' (відсортований словник), 'idf' та матриця у форматі CSC:
+        'column_pointers', 'row_indices', 'data'
+    """
+    question_count = len(texts)
+    ngram_counts = [Counter(char_ngrams(text)) for text in texts]
+
+    # Відсортований словник фіксованої ширини: пошук через searchsorted без dict
+    ngrams = np.array(sorted(set().union(*ngram_counts)), dtype=NGRAM_DTYPE)
+    vocabulary = {ngram: column for column, ngram in enumerate(ngrams.tolist())}
+
+    document_frequency = np.zeros(len(ngrams), dtype=np.int64)
+    rows, columns, values = [], [], []
+    for row, counts in enumerate(ngram_counts):
+        for ngram, count in counts.items():
+            column = vocabulary[ngram]
+            document_frequency[column] += 1
+            rows.append(row)
+            columns.append(column)
+            # Сублінійна частота n-грами
+            values.append(1.0 + math.log(count))
+
+    # Згладжений IDF
+    idf = (np.log((1 + question_count) / (1 + document_frequency)) + 1.0).astype(np.float32)
+
+    rows = np.asarray(rows, dtype=np.int32)
+    columns = np.asarray(columns, dtype=np.int32)
+    values = np.asarray(values, dtype=np.float32) * idf[columns]
+
+    # L2-нормалізація рядків, щоб добуток давав косинус
+    norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=question_count))
+    norms[norms == 0] = 1.0
+    values = values / norms[rows].astype(np.float32)
+
+    # Матриця зберігається по стовпцях (CSC): запит зачіпає лише свої n-грами
+    order = np.argsort(columns, kind='stable')
+    column_pointers = np.zeros(len(ngrams) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(columns, minlength=len(ngrams)), out=column_pointers[1:])
+
+    return {
+        'ngrams': ngrams,
+        'idf': idf,
+        'column_pointers': column_pointers,
+        'row_indices': rows[order],
+        'data': values[order],
+    }
+
+
+class TfidfFaqMatcher(FaqMatcher):
+    """Косинусна схожість символьних триграм TF-IDF"""
+
+    threshold = 0.5
+
+    def __init__(self, index: FaqIndex, threshold: Optional[float] = None):
+        """
+        Побудова розрідженої матриці TF-IDF питань
+
+        Якщо індекс завантажено зі скомпільованого артефакту, готові масиви
+        беруться з нього без перебудови.
+
+        Args:
+            index: Індекс FAQ
+            threshold: Поріг косинусної схожості
+        """
+        super().__init__(index)
+        if threshold is not None:
+            self.threshold = threshold
+
+        arrays = index.precomputed.get('tfidf') or build_tfidf_arrays(index.normalized_questions)
+        self.ngrams = arrays['ngrams']
+        self.idf = arrays['idf']
+        self.column_pointers = arrays['column_pointers']
+        self.row_indices = arrays['row_indices']
+        self.data = arrays['data']
+
+        self.question_count = len(index)
+        self.unseen_idf = math.log(1 + self.question_count) + 1.0
+
+        # Щільна копія для пакетного пошуку будується лише за потреби
+        self._dense_matrix = None
+
+    def _query_vector(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Стовпці та нормовані ваги TF-IDF запиту"""
+        counts = Counter(char_ngrams(query))
+        if not counts or not len(self.ngrams):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+        query_ngrams = np.array(list(counts), dtype=NGRAM_DTYPE)
+        columns = np.minimum(np.searchsorted(self.ngrams, query_ngrams), len(self.ngrams) - 1)
+        known = self.ngrams[columns] == query_ngrams
+
+        # Невідомі n-грами не дають збігів, але входять у норму запиту
+        frequencies = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+        weights = frequencies * np.where(known, self.idf[columns], np.float32(self.unseen_idf))
+        weights /= np.sqrt(np.dot(weights, weights))
+
+        return columns[known], weights[known]
+
+    def scores(self, query: str) -> np.ndarray:
+        """
+        Косинусна схожість запиту з усіма питаннями
+
+        Args:
+            query: Нормалізований запит
+
+        Returns:
+            Масив оцінок довжиною в кількість питань
+        """
+        columns, weights = self._query_vector(query)
+        if not len(columns):
+            return np.zeros(self.question_count, dtype=np.float32)
+
+        starts = self.column_pointers[columns]
+        lengths = self.column_pointers[columns + 1] - starts
+        # Позиції ненульових елементів усіх стовпців запиту одним масивом
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        products = self.data[offsets] * np.repeat(weights, lengths)
+        return np.bincount(self.row_indices[offsets], weights=products, minlength=self.question_count)
+
+    def match_batch(self, queries: List[str]) -> List[Optional[Tuple[int, float]]]:
+        if not self.question_count or not queries:
+            return [None] * len(queries)
+
+        # Щільна матриця завелика - оцінюємо розрідженим добутком по одному запиту
+        if self.question_count * len(self.ngrams) > DENSE_MATRIX_LIMIT:
+            return super().match_batch(queries)
+
+        if self._dense_matrix is None:
+            dense_matrix = np.zeros((len(self.ngrams), self.question_count), dtype=np.float32)
+            columns = np.repeat(np.arange(len(self.ngrams)), np.diff(self.column_pointers))
+            dense_matrix[columns, self.row_indices] = self.data
+            self._dense_matrix = dense_matrix
+
+        results = []
+        # Блоки запитів, щоб матриця оцінок лишалась обмеженою
+        block_size = max(1, BATCH_SCORES_LIMIT // self.question_count)
+
+        for block_start in range(0, len(queries), block_size):
+            block = queries[block_start:block_start + block_size]
+            query_matrix = np.zeros((len(block), len(self.ngrams)), dtype=np.float32)
+            for row, query in enumerate(block):
+                columns, weights = self._query_vector(query)
+                query_matrix[row, columns] = weights
+
+            # Один матричний добуток (BLAS) для всього блоку запитів
+            scores = query_matrix @ self._dense_matrix
+            best_positions = scores.argmax(axis=1)
+            best_scores = scores[np.arange(len(block)), best_positions]
+            for position, score in zip(best_positions, best_scores):
+                results.append((int(position), float(score)) if score > self.threshold else None)
+
+        return results
+
+    def top_k(self, query: str, k: int = 5) -> List[Tuple[int, float]]:
+        if not self.question_count:
+            return []
+
+        scores = self.scores(query)
+        k = min(k, self.question_count)
+        top = np.argpartition(-scores, k - 1)[:k]
+        # Стабільне сортування: при рівності перемагає раніше питання
+        top = top[np.lexsort((top, -scores[top]))]
+        return [(int(position), float(scores[position])) for position in top if scores[position] > 0]
+
+
+class SemanticFaqMatcher(FaqMatcher):
+    """Косинусна схожість хешованих векторів з кандидатами з індексу LSH"""
+
+    threshold = 0.45
+
+    def __init__(self, index: FaqIndex, concepts: Optional[Iterable[Tuple[str, str]]] = None,
+                 threshold: Optional[float] = None):
+        """
+        Побудова векторів питань та індексу LSH
+
+        Args:
+            index: Індекс FAQ
+            concepts: Пари (нормалізований шаблон, назва поняття), наприклад шаблони інтентів
+            threshold: Поріг косинусної схожості
+        """
+        super().__init__(index)
+        if threshold is not None:
+            self.threshold = threshold
+
+        self.embedder = HashingEmbedder(concepts=concepts).fit(index.normalized_questions)
+        vectors = self.embedder.embed_batch(index.normalized_questions)
+        self.lsh = RandomProjectionLSH(self.embedder.dim, bits=signature_bits(len(index)))
+        self.lsh.add(vectors)
+        # Вектори зберігаються по вимірах: запит читає лише свої ненульові виміри кандидатів
+        self.dimension_vectors = np.ascontiguousarray(vectors.T)
+
+    def top_k(self, query: str, k: int = 5) -> List[Tuple[int, float]]:
+        vector = self.embedder.embed(query)
+        if not vector.any():
+            return []
+
+        # Точна схожість лише для кандидатів з кошиків LSH і лише за ненульовими вимірами запиту
+        candidates = self.lsh.query(vector)
+        if not len(candidates):
+            return []
+        dimensions = np.flatnonzero(vector)
+        scores = vector[dimensions] @ self.dimension_vectors[dimensions[:, np.newaxis], candidates]
+
+        k = min(k, len(candidates))
+        top = np.argpartition(-scores, k - 1)[:k]
+        # Стабільне сортування: при рівності перемагає раніше питання
+        top = top[np.lexsort((candidates[top], -scores[top]))]
+        return [(int(candidates[row]), float(scores[row])) for row in top if scores[row] > 0]
+
+
+FAQ_MATCHERS = {
+    'sequence': SequenceFaqMatcher,
+    'tfidf': TfidfFaqMatcher,
+    'semantic': SemanticFaqMatcher,
+}
+
+
+def create_faq_matcher(name: str, index: FaqIndex,
+                       similarity: Optional[SimilarityBackend] = None,
+                       concepts: Optional[Iterable[Tuple[str, str]]] = None) -> FaqMatcher:
+    """
+    Створення алгоритму порівняння за назвою
+
+    Args:
+        name: Назва ('sequence', 'tfidf' або 'semantic')
+        index: Індекс FAQ
+        similarity: Алгоритм оцінки схожості рядків (для 'sequence')
+        concepts: Пари (шаблон, поняття) для ознак векторів (для 'semantic')
+
+    Returns:
+        Екземпляр FaqMatcher
+    """
+    if name not in FAQ_MATCHERS:
+        raise ValueError(f"Невідомий алгоритм пошуку FAQ: {name}")
+    if name == 'sequence':
+        return SequenceFaqMatcher(index, similarity)
+    if name == 'semantic':
+        return SemanticFaqMatcher(index, concepts)
+    return FAQ_MATCHERS[name](index)
@@ -0,0 +1,213 @@
+"""
+Модуль паралельного пошуку у великих FAQ: питання розподіляються між процесами
+"""
+
+import bisect
+import heapq
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from modules.faq_index import FaqIndex
+from modules.faq_matchers import FAQ_MATCHERS, FaqMatcher, SequenceFaqMatcher, create_faq_matcher
+from modules.similarity import SimilarityBackend
+
+# Алгоритм порівняння поточного процесу-обробника (своя частина FAQ)
+_shard_matcher: Optional[FaqMatcher] = None
+
+
+def _init_shard(matcher_name: str, questions: List[dict], normalized_questions: List[str],
+                version: str, similarity: Optional[SimilarityBackend],
+                concepts: Optional[List[Tuple[str, str]]]):
+    """Побудова індексу частини FAQ у процесі-обробнику"""
+    global _shard_matcher
+    index = FaqIndex({'questions': questions}, version=version,
+                     normalized_questions=normalized_questions)
+    _shard_matcher = create_faq_matcher(matcher_name, index, similarity, concepts)
+
+
+def _shard_size() -> int:
+    """Кількість питань у частині поточного процесу"""
+    return len(_shard_matcher.index)
+
+
+def _shard_top_k(queries: List[str], k: int) -> List[List[Tuple[int, float]]]:
+    """Найкращі k питань частини для кожного запиту"""
+    return [_shard_matcher.top_k(query, k) for query in queries]
+
+
+def _shard_match(queries: List[str]) -> List[Optional[Tuple[int, float]]]:
+    """Найкраще питання частини вище порогу для кожного запиту"""
+    return _shard_matcher.match_batch(queries)
+
+
+def _shard_top_k_candidates(queries: List[str], candidate_lists: List[List[int]],
+                            k: int) -> List[List[Tuple[int, float]]]:
+    """Найкращі k питань частини серед заданих кандидатів кожного запиту"""
+    return [_shard_matcher.top_k_candidates(query, positions, k)
+            for query, positions in zip(queries, candidate_lists)]
+
+
+def _shard_match_candidates(queries: List[str],
+                            candidate_lists: List[List[int]]) -> List[Optional[Tuple[int, float]]]:
+    """Найкраще питання частини вище порогу серед заданих кандидатів кожного запиту"""
+    return _shard_matcher.match_candidates_batch(queries, candidate_lists)
+
+
+def _shutdown(executors: List[ProcessPoolExecutor]):
+    """Зупинка процесів-обробників"""
+    for executor in executors:
+        executor.shutdown(wait=False)
+
+
+class ShardedFaqMatcher(FaqMatcher):
+    """
+    Пошук у FAQ, розподіленому між процесами
+
+    Питання діляться на workers суцільних частин. Кожна частина живе в
+    окремому процесі зі своїм індексом і алгоритмом порівняння, тому
+    частини оцінюються паралельно на різних ядрах, а результати
+    об'єднуються за оцінкою (при рівності перемагає раніше питання).
+
+    Ключові слова та відповіді лишаються в повному індексі основного
+    процесу. Для 'sequence' кандидатів відбирає повний індекс (поріг
+    стоп-слів і MAX_CANDIDATES - за всім FAQ), а частини лише оцінюють
+    свої з них, тож результати збігаються з пошуком в одному процесі.
+    Процеси зупиняються, коли знімок FAQ більше не використовується.
+    Статистика алгоритму схожості ведеться в процесах-обробниках, а IDF
+    алгоритмів 'tfidf' та 'semantic' рахується в межах частини.
+    """
+
+    def __init__(self, index: FaqIndex, matcher_name: str = 'sequence', workers: Optional[int] = None,
+                 similarity: Optional[SimilarityBackend] = None,
+                 concepts: Optional[Iterable[Tuple[str, str]]] = None):
+        """
+        Args:
+            index: Повний індекс FAQ
+            matcher_name: Алгоритм порівняння в кожній частині ('sequence', 'tfidf' або 'semantic')
+            workers: Кількість процесів (None - кількість ядер)
+            similarity: Алгоритм оцінки схожості рядків (копіюється в процеси)
+            concepts: Пари (шаблон, поняття) для алгоритму 'semantic'
+        """
+        super().__init__(index)
+        self.workers = max(1, min(workers or os.cpu_count() or 1, max(1, len(index))))
+
+        if matcher_name not in FAQ_MATCHERS:
+            raise ValueError(f"Невідомий алгоритм пошуку FAQ: {matcher_name}")
+        self.threshold = FAQ_MATCHERS[matcher_name].threshold
+        # Частини 'sequence' оцінюють кандидатів, відібраних за всім FAQ
+        self.global_candidates = issubclass(FAQ_MATCHERS[matcher_name], SequenceFaqMatcher)
+
+        # Межі суцільних частин: позиція у частині + зсув = позиція у FAQ
+        bounds = [len(index) * shard // self.workers for shard in range(self.workers + 1)]
+        self.offsets = bounds[:-1]
+
+        # Один процес на частину, щоб частина будувалась і зберігалась лише раз
+        self.executors = [
+            ProcessPoolExecutor(
+                max_workers=1,
+                initializer=_init_shard,
+                initargs=(
+                    matcher_name,
+                    list(index.questions[start:end]),
+                    list(index.normalized_questions[start:end]),
+                    f"{index.version}:{shard}",
+                    similarity,
+                    list(concepts) if concepts is not None else None
+                )
+            )
+            for shard, (start, end) in enumerate(zip(bounds, bounds[1:]))
+        ]
+        self._finalizer = weakref.finalize(self, _shutdown, self.executors)
+
+        # Запуск процесів і побудова частин одразу, а не на першому запиті
+        self.shard_sizes = [future.result() for future in self._submit(_shard_size)]
+
+    def _submit(self, function, *args) -> list:
+        """Виклик функції в усіх частинах"""
+        return [executor.submit(function, *args) for executor in self.executors]
+
+    def _split_candidates(self, queries: Sequence[str]) -> List[List[List[int]]]:
+        """
+        Відбір кандидатів за повним індексом і розподіл між частинами
+
+        Args:
+            queries: Нормалізовані запити
+
+        Returns:
+            Для кожної частини - позиції кандидатів у частині для кожного запиту
+        """
+        shards = [[[] for _ in queries] for _ in self.executors]
+        for row, query in enumerate(queries):
+            for position in self.index.candidates(query):
+                shard = bisect.bisect_right(self.offsets, position) - 1
+                shards[shard][row].append(position - self.offsets[shard])
+        return shards
+
+    def _submit_per_shard(self, function, queries: Sequence[str], *args) -> list:
+        """Виклик функції в усіх частинах з кандидатами кожної частини"""
+        queries = list(queries)
+        return [
+            executor.submit(function, queries, candidate_lists, *args)
+            for executor, candidate_lists in zip(self.executors, self._split_candidates(queries))
+        ]
+
+    def top_k(self, query: str, k: int = 5) -> List[Tuple[int, float]]:
+        return self.top_k_batch([query], k)[0]
+
+    def top_k_batch(self, queries: Sequence[str], k: int = 5) -> List[List[Tuple[int, float]]]:
+        """
+        Найкращі k питань для кожного запиту
+
+        Args:
+            queries: Нормалізовані запити
+            k: Кількість результатів
+
+        Returns:
+            Для кожного запиту список (позиція питання, оцінка) за спаданням оцінки
+        """
+        if self.global_candidates:
+            futures = self._submit_per_shard(_shard_top_k_candidates, queries, k)
+        else:
+            futures = self._submit(_shard_top_k, list(queries), k)
+        shard_results = [future.result() for future in futures]
+
+        merged = []
+        for row in range(len(queries)):
+            scored = (
+                (position + offset, score)
+                for offset, results in zip(self.offsets, shard_results)
+                for position, score in results[row]
+            )
+            merged.append(heapq.nsmallest(k, scored, key=lambda item: (-item[1], item[0])))
+        return merged
+
+    def match(self, query: str) -> Optional[Tuple[int, float]]:
+        return self.match_batch([query])[0]
+
+    def match_batch(self, queries: List[str]) -> List[Optional[Tuple[int, float]]]:
+        if not queries:
+            return []
+
+        # Увесь пакет - одне повідомлення на частину
+        if self.global_candidates:
+            futures = self._submit_per_shard(_shard_match_candidates, queries)
+        else:
+            futures = self._submit(_shard_match, list(queries))
+        shard_results = [future.result() for future in futures]
+
+        results = []
+        for row in range(len(queries)):
+            best = None
+            # Частини йдуть у порядку FAQ: строга нерівність зберігає раніше питання
+            for offset, matches in zip(self.offsets, shard_results):
+                match = matches[row]
+                if match is not None and (best is None or match[1] > best[1]):
+                    best = (match[0] + offset, match[1])
+            results.append(best)
+        return results
+
+    def close(self):
+        """Зупинка процесів-обробників"""
+        self._finalizer()
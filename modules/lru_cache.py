@@ -0,0 +1,219 @@
+"""
+Модуль обмеженого LRU-кешу з лічильниками влучань
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+# Кількість смуг кешу з окремими блокуваннями (ключі розподіляються за хешем)
+CACHE_STRIPES = 16
+
+
+class LRUCache:
+    """Кеш з витісненням найдавніше використаних записів"""
+
+    def __init__(self, maxsize: int = 256):
+        """
+        Args:
+            maxsize: Максимальна кількість записів (0 вимикає кеш)
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Отримання значення з кешу
+
+        Args:
+            key: Ключ
+            default: Значення за відсутності ключа
+
+        Returns:
+            Збережене значення або default
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Збереження значення з витісненням найстаріших записів
+
+        Args:
+            key: Ключ
+            value: Значення
+        """
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Очищення кешу"""
+        with self._lock:
+            self._data.clear()
+
+    def get_statistics(self) -> Dict:
+        """Статистика використання кешу"""
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / lookups) * 100 if lookups > 0 else 0
+        }
+
+
+class SizedLRUCache(LRUCache):
+    """Кеш з витісненням найдавніше використаних записів за сумарним розміром значень"""
+
+    def __init__(self, max_bytes: int, sizeof: Callable[[Any], int] = len):
+        """
+        Args:
+            max_bytes: Найбільший сумарний розмір значень у байтах (0 вимикає кеш)
+            sizeof: Функція розміру значення в байтах
+        """
+        super().__init__(maxsize=max_bytes)
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.bytes = 0
+        # Сумарний розмір значень, повернутих з кешу замість повторного обчислення
+        self.bytes_saved = 0
+        self._sizes = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                self.bytes_saved += self._sizes[key]
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key: Hashable, value: Any):
+        size = self.sizeof(value)
+        # Значення, більше за весь бюджет, не витісняє решту кешу
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._data:
+                self.bytes -= self._sizes[key]
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._sizes[key] = size
+            self.bytes += size
+
+            while self.bytes > self.max_bytes:
+                evicted_key, _ = self._data.popitem(last=False)
+                self.bytes -= self._sizes.pop(evicted_key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.bytes = 0
+
+    def get_statistics(self) -> Dict:
+        """Статистика використання кешу з розмірами в байтах"""
+        statistics = super().get_statistics()
+        statistics.update(bytes=self.bytes, max_bytes=self.max_bytes, bytes_saved=self.bytes_saved)
+        return statistics
+
+
+class StripedLRUCache:
+    """
+    LRU-кеш, розподілений між смугами за хешем ключа
+
+    Кожна смуга - окремий LRUCache зі своїм блокуванням, тому запити з
+    різними ключами з паралельних потоків не чекають одне на одного.
+    Витіснення відбувається в межах смуги (наближений LRU для всього кешу).
+    """
+
+    def __init__(self, maxsize: int = 256, stripes: int = CACHE_STRIPES):
+        """
+        Args:
+            maxsize: Максимальна сумарна кількість записів (0 вимикає кеш)
+            stripes: Кількість смуг (не більше maxsize)
+        """
+        self.maxsize = maxsize
+        stripes = max(1, min(stripes, maxsize))
+        # Ліміт ділиться між смугами з округленням донизу, щоб не перевищити maxsize
+        self.stripes = [LRUCache(maxsize // stripes) for _ in range(stripes)]
+
+    def _stripe(self, key: Hashable) -> LRUCache:
+        return self.stripes[hash(key) % len(self.stripes)]
+
+    def __len__(self) -> int:
+        return sum(len(stripe) for stripe in self.stripes)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._stripe(key)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Отримання значення з кешу (блокується лише смуга ключа)
+
+        Args:
+            key: Ключ
+            default: Значення за відсутності ключа
+
+        Returns:
+            Збережене значення або default
+        """
+        return self._stripe(key).get(key, default)
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Збереження значення з витісненням найстаріших записів смуги
+
+        Args:
+            key: Ключ
+            value: Значення
+        """
+        self._stripe(key).put(key, value)
+
+    def clear(self):
+        """Очищення кешу"""
+        for stripe in self.stripes:
+            stripe.clear()
+
+    @property
+    def hits(self) -> int:
+        return sum(stripe.hits for stripe in self.stripes)
+
+    @property
+    def misses(self) -> int:
+        return sum(stripe.misses for stripe in self.stripes)
+
+    def get_statistics(self) -> Dict:
+        """Статистика використання кешу, об'єднана зі смуг"""
+        hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            'size': len(self),
+            'maxsize': self.maxsize,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': (hits / lookups) * 100 if lookups > 0 else 0
+        }
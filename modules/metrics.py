@@ -0,0 +1,382 @@
+"""
+Модуль метрик з фіксованим обсягом пам'яті
+"""
+
+import heapq
+import itertools
+import math
+import threading
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+# Найменше значення, що розрізняється гістограмою (1 мкс)
+HISTOGRAM_MIN_VALUE = 1e-6
+
+# Найбільше значення до переповнення останнього кошика (~100 с)
+HISTOGRAM_MAX_VALUE = 100.0
+
+# Кількість кошиків на подвоєння значення (похибка квантилів ~4%)
+HISTOGRAM_BUCKETS_PER_OCTAVE = 8
+
+# Кількість елементів, що відстежуються лічильником популярних запитів
+TOP_K_CAPACITY = 1000
+
+# Кількість смуг статистики запитів (потоки розподіляються між ними по колу)
+STATS_STRIPES = 8
+
+
+class LatencyHistogram:
+    """Гістограма тривалостей з логарифмічними кошиками"""
+
+    def __init__(self, min_value: float = HISTOGRAM_MIN_VALUE, max_value: float = HISTOGRAM_MAX_VALUE,
+                 buckets_per_octave: int = HISTOGRAM_BUCKETS_PER_OCTAVE):
+        """
+        Args:
+            min_value: Межа першого кошика (менші значення потрапляють до нього)
+            max_value: Межа останнього кошика (більші значення потрапляють до нього)
+            buckets_per_octave: Кількість кошиків на кожне подвоєння значення
+        """
+        self.min_value = min_value
+        self.growth = 2.0 ** (1.0 / buckets_per_octave)
+        self._log_growth = math.log(self.growth)
+        bucket_count = int(math.ceil(math.log(max_value / min_value) / self._log_growth)) + 1
+
+        self.counts: List[int] = [0] * bucket_count
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def _bucket(self, value: float) -> int:
+        """Номер кошика для значення"""
+        if value <= self.min_value:
+            return 0
+        bucket = int(math.ceil(math.log(value / self.min_value) / self._log_growth))
+        return min(bucket, len(self.counts) - 1)
+
+    def _upper_bound(self, bucket: int) -> float:
+        """Верхня межа кошика"""
+        return self.min_value * self.growth ** bucket
+
+    def record(self, value: float):
+        """
+        Додавання значення
+
+        Args:
+            value: Тривалість у секундах
+        """
+        bucket = self._bucket(value)
+        with self._lock:
+            self.counts[bucket] += 1
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+
+    def merge(self, other: 'LatencyHistogram'):
+        """
+        Додавання значень іншої гістограми з тими самими кошиками
+
+        Args:
+            other: Гістограма для об'єднання
+        """
+        if len(other.counts) != len(self.counts) or other.growth != self.growth:
+            raise ValueError("Гістограми мають різні кошики")
+
+        # Знімок іншої гістограми під її блокуванням, щоб не тримати два одночасно
+        with other._lock:
+            counts = list(other.counts)
+            count, total, maximum = other.count, other.total, other.max
+
+        with self._lock:
+            for bucket, bucket_count in enumerate(counts):
+                self.counts[bucket] += bucket_count
+            self.count += count
+            self.total += total
+            self.max = max(self.max, maximum)
+
+    def percentile(self, percent: float) -> float:
+        """
+        Оцінка квантиля за O(кількість кошиків)
+
+        Args:
+            percent: Квантиль у відсотках (0-100)
+
+        Returns:
+            Верхня межа кошика, що містить квантиль (не більше максимуму)
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = max(1, int(math.ceil(self.count * percent / 100)))
+        cumulative = 0
+        for bucket, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                # Останній кошик не має верхньої межі
+                if bucket == len(self.counts) - 1:
+                    return self.max
+                return min(self._upper_bound(bucket), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        """Середнє значення"""
+        return self.total / self.count if self.count else 0.0
+
+    def get_statistics(self) -> Dict:
+        """Зведення: кількість, середнє, p50/p90/p99 та максимум у секундах"""
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': self.max
+        }
+
+
+class SpaceSaving:
+    """
+    Наближений підрахунок найчастіших елементів потоку (алгоритм Space-Saving)
+
+    Зберігає не більше capacity лічильників. Для кожного елемента відома
+    похибка: справжня частота лежить у межах [count - error, count].
+    Кожен елемент з частотою понад total / capacity гарантовано відстежується.
+    """
+
+    def __init__(self, capacity: int = TOP_K_CAPACITY):
+        """
+        Args:
+            capacity: Максимальна кількість лічильників
+        """
+        if capacity <= 0:
+            raise ValueError("Місткість має бути додатною")
+
+        self.capacity = capacity
+        self.total = 0
+        # Елемент -> [частота, похибка]
+        self._counters: Dict[Hashable, List[int]] = {}
+        # Частота -> елементи з такою частотою (порядок додавання)
+        self._buckets: Dict[int, Dict[Hashable, None]] = {}
+        self._min_count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._counters
+
+    def _move(self, item: Hashable, old_count: int, new_count: int):
+        """Перенесення елемента між кошиками частот"""
+        bucket = self._buckets[old_count]
+        del bucket[item]
+        if not bucket:
+            del self._buckets[old_count]
+            if self._min_count == old_count:
+                self._min_count = new_count
+        self._buckets.setdefault(new_count, {})[item] = None
+
+    def add(self, item: Hashable):
+        """
+        Врахування елемента за O(1)
+
+        Args:
+            item: Елемент потоку
+        """
+        with self._lock:
+            self.total += 1
+            counter = self._counters.get(item)
+
+            if counter is not None:
+                counter[0] += 1
+                self._move(item, counter[0] - 1, counter[0])
+                return
+
+            if len(self._counters) < self.capacity:
+                self._counters[item] = [1, 0]
+                self._buckets.setdefault(1, {})[item] = None
+                self._min_count = 1
+                return
+
+            # Новий елемент займає місце найдавнішого з мінімальною частотою
+            # і успадковує його лічильник як похибку
+            min_count = self._min_count
+            bucket = self._buckets[min_count]
+            evicted = next(iter(bucket))
+            del bucket[evicted]
+            del self._counters[evicted]
+
+            self._counters[item] = [min_count + 1, min_count]
+            bucket[item] = None
+            self._move(item, min_count, min_count + 1)
+
+    def top(self, k: int) -> List[Tuple[Hashable, int, int]]:
+        """
+        Найчастіші елементи
+
+        Args:
+            k: Кількість елементів
+
+        Returns:
+            Список (елемент, оцінка частоти, похибка) за спаданням частоти
+        """
+        with self._lock:
+            counters = list(self._counters.items())
+        best = heapq.nlargest(k, counters, key=lambda item: item[1][0])
+        return [(item, count, error) for item, (count, error) in best]
+
+    @property
+    def max_error(self) -> int:
+        """Найбільша можлива переоцінка частоти будь-якого елемента"""
+        return self._min_count if len(self._counters) >= self.capacity else 0
+
+    def snapshot(self) -> Tuple[Dict[Hashable, Tuple[int, int]], int]:
+        """Узгоджена копія лічильників: (елемент -> (частота, похибка), max_error)"""
+        with self._lock:
+            counters = {item: (count, error) for item, (count, error) in self._counters.items()}
+            return counters, self.max_error
+
+
+def merge_top(summaries: Iterable[SpaceSaving], k: int) -> List[Tuple[Hashable, int, int]]:
+    """
+    Найчастіші елементи за кількома незалежними лічильниками Space-Saving
+
+    Якщо елемент не відстежується в якомусь лічильнику, його частота там
+    не перевищує max_error цього лічильника - ця межа додається і до оцінки,
+    і до похибки, тож гарантія [count - error, count] зберігається.
+
+    Args:
+        summaries: Лічильники
+        k: Кількість елементів
+
+    Returns:
+        Список (елемент, оцінка частоти, похибка) за спаданням частоти
+    """
+    snapshots = [summary.snapshot() for summary in summaries]
+    candidates = set().union(*(counters for counters, _ in snapshots))
+
+    merged = []
+    for item in candidates:
+        count = error = 0
+        for counters, max_error in snapshots:
+            item_count, item_error = counters.get(item, (max_error, max_error))
+            count += item_count
+            error += item_error
+        merged.append((item, count, error))
+
+    return heapq.nlargest(k, merged, key=lambda entry: entry[1])
+
+
+class RequestStats:
+    """Лічильники запитів однієї смуги"""
+
+    def __init__(self, common_questions_capacity: int = TOP_K_CAPACITY):
+        """
+        Args:
+            common_questions_capacity: Кількість відстежуваних популярних запитів
+        """
+        self.total_questions = 0
+        self.answered_questions = 0
+        self.response_times = LatencyHistogram()
+        self.common_questions = SpaceSaving(common_questions_capacity)
+        # Етап обробки -> гістограма тривалостей
+        self.stage_times: Dict[str, LatencyHistogram] = {}
+        self.lock = threading.Lock()
+
+    def record(self, question: str, answered: bool, response_time: float,
+               stages: Optional[Dict[str, int]] = None):
+        """
+        Врахування обробленого запиту
+
+        Args:
+            question: Нормалізований запит
+            answered: Чи надано змістовну відповідь
+            response_time: Час відповіді в секундах
+            stages: Тривалості етапів обробки в наносекундах
+        """
+        with self.lock:
+            self.total_questions += 1
+            if answered:
+                self.answered_questions += 1
+            stage_times = []
+            for stage, duration in (stages or {}).items():
+                histogram = self.stage_times.get(stage)
+                if histogram is None:
+                    histogram = self.stage_times[stage] = LatencyHistogram()
+                stage_times.append((histogram, duration))
+        self.response_times.record(response_time)
+        self.common_questions.add(question)
+        for histogram, duration in stage_times:
+            histogram.record(duration / 1e9)
+
+
+class StripedRequestStats:
+    """
+    Статистика запитів, розподілена між смугами з окремими блокуваннями
+
+    Кожен потік закріплюється за однією смугою, тому паралельні сесії
+    майже не конкурують за блокування. Смуги об'єднуються лише під час читання.
+    """
+
+    def __init__(self, stripes: int = STATS_STRIPES, common_questions_capacity: int = TOP_K_CAPACITY):
+        """
+        Args:
+            stripes: Кількість смуг
+            common_questions_capacity: Кількість відстежуваних популярних запитів у кожній смузі
+        """
+        self.stripes = [RequestStats(common_questions_capacity) for _ in range(stripes)]
+        self._next_stripe = itertools.count()
+        self._local = threading.local()
+
+    def _stripe(self) -> RequestStats:
+        """Смуга поточного потоку"""
+        stripe = getattr(self._local, 'stripe', None)
+        if stripe is None:
+            # next() для itertools.count атомарний під GIL
+            stripe = self._local.stripe = self.stripes[next(self._next_stripe) % len(self.stripes)]
+        return stripe
+
+    def record(self, question: str, answered: bool, response_time: float,
+               stages: Optional[Dict[str, int]] = None):
+        """
+        Врахування обробленого запиту у смузі поточного потоку
+
+        Args:
+            question: Нормалізований запит
+            answered: Чи надано змістовну відповідь
+            response_time: Час відповіді в секундах
+            stages: Тривалості етапів обробки в наносекундах
+        """
+        self._stripe().record(question, answered, response_time, stages)
+
+    @property
+    def total_questions(self) -> int:
+        """Загальна кількість запитів"""
+        return sum(stripe.total_questions for stripe in self.stripes)
+
+    @property
+    def answered_questions(self) -> int:
+        """Кількість запитів зі змістовною відповіддю"""
+        return sum(stripe.answered_questions for stripe in self.stripes)
+
+    def response_times(self) -> LatencyHistogram:
+        """Об'єднана гістограма часу відповіді"""
+        merged = LatencyHistogram()
+        for stripe in self.stripes:
+            merged.merge(stripe.response_times)
+        return merged
+
+    def stage_times(self) -> Dict[str, LatencyHistogram]:
+        """Об'єднані гістограми тривалостей етапів обробки"""
+        merged: Dict[str, LatencyHistogram] = {}
+        for stripe in self.stripes:
+            with stripe.lock:
+                stage_times = list(stripe.stage_times.items())
+            for stage, histogram in stage_times:
+                merged.setdefault(stage, LatencyHistogram()).merge(histogram)
+        return merged
+
+    def common_questions(self, k: int) -> List[Tuple[Hashable, int, int]]:
+        """Найчастіші запити: (запит, оцінка частоти, похибка)"""
+        return merge_top((stripe.common_questions for stripe in self.stripes), k)
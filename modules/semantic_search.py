@@ -0,0 +1,224 @@
+"""
+Модуль офлайн-семантичного пошуку: хешовані вектори текстів та
+наближений пошук найближчих сусідів (LSH випадковими проєкціями)
+"""
+
+import zlib
+from collections import Counter
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from modules.aho_corasick import AhoCorasick
+from modules.text_processing import tokenize
+
+# Розмірність хешованого вектора (степінь двійки)
+EMBEDDING_DIM = 1024
+
+# Ваги ознак: основа слова, символьна триграма основи, поняття (група шаблонів)
+TOKEN_WEIGHT = 1.0
+NGRAM_WEIGHT = 0.3
+CONCEPT_WEIGHT = 2.0
+
+# Кількість таблиць LSH та найбільша кількість бітів підпису в кожній
+LSH_TABLES = 16
+LSH_MAX_BITS = 12
+
+# Середня кількість векторів у кошику, за якою обирається довжина підпису
+LSH_BUCKET_SIZE = 32
+
+# Кількість найменш певних бітів, що інвертуються при пошуку (multi-probe)
+LSH_PROBES = 3
+
+
+def _feature_hash(feature: str) -> int:
+    """Стабільний між процесами хеш ознаки"""
+    return zlib.crc32(feature.encode('utf-8'))
+
+
+class HashingEmbedder:
+    """
+    Вектор тексту за хешами ознак, без словника та зовнішніх моделей
+
+    Ознаки - основи слів, їх символьні триграми та поняття: назви груп
+    шаблонів (наприклад, інтентів), знайдених у тексті. Поняття зближують
+    перефразування без спільних слів ("світла нема" та "відключення
+    електроенергії"). Ваги вимірів множаться на IDF, обчислений на
+    корпусі (fit), а вектор нормується до одиничної довжини.
+    """
+
+    def __init__(self, dim: int = EMBEDDING_DIM, concepts: Optional[Iterable[Tuple[str, str]]] = None):
+        """
+        Args:
+            dim: Розмірність вектора
+            concepts: Пари (нормалізований шаблон, назва поняття)
+        """
+        self.dim = dim
+        self.concept_automaton = AhoCorasick(concepts or ())
+        self.idf = np.ones(dim, dtype=np.float32)
+
+    def features(self, text: str) -> Counter:
+        """
+        Зважені ознаки тексту
+
+        Args:
+            text: Нормалізований текст (основи слів)
+
+        Returns:
+            Ознака -> вага
+        """
+        features = Counter()
+        for token in tokenize(text):
+            features['w:' + token] += TOKEN_WEIGHT
+            padded = f'<{token}>'
+            for i in range(len(padded) - 2):
+                features['n:' + padded[i:i + 3]] += NGRAM_WEIGHT
+
+        concepts = {concept for _, _, concept in self.concept_automaton.iter_matches(text)}
+        for concept in concepts:
+            features['c:' + concept] = CONCEPT_WEIGHT
+        return features
+
+    def _raw_vector(self, text: str) -> np.ndarray:
+        """Вектор ознак без IDF та нормування (знак виміру - з біта хеша)"""
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for feature, weight in self.features(text).items():
+            hashed = _feature_hash(feature)
+            vector[hashed % self.dim] += weight if hashed & 0x80000000 else -weight
+        return vector
+
+    def fit(self, texts: Sequence[str]) -> 'HashingEmbedder':
+        """
+        Обчислення IDF вимірів на корпусі
+
+        Args:
+            texts: Нормалізовані тексти корпусу
+
+        Returns:
+            self
+        """
+        document_frequency = np.zeros(self.dim, dtype=np.float32)
+        for text in texts:
+            document_frequency += self._raw_vector(text) != 0
+        # Згладжений IDF, як у TF-IDF
+        self.idf = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1.0).astype(np.float32)
+        return self
+
+    def embed(self, text: str) -> np.ndarray:
+        """
+        Одиничний вектор тексту
+
+        Args:
+            text: Нормалізований текст
+
+        Returns:
+            Вектор довжиною dim (нульовий для тексту без ознак)
+        """
+        vector = self._raw_vector(text) * self.idf
+        norm = np.sqrt(np.dot(vector, vector))
+        return vector / norm if norm else vector
+
+    def embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """Матриця векторів текстів (рядок на текст)"""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            matrix[row] = self.embed(text)
+        return matrix
+
+
+def signature_bits(size: int, bucket_size: int = LSH_BUCKET_SIZE) -> int:
+    """
+    Довжина підпису LSH для колекції заданого розміру
+
+    Малі колекції потрапляють в один кошик (точний перебір), у великих
+    кожен біт удвічі зменшує кошик.
+
+    Args:
+        size: Кількість векторів
+        bucket_size: Бажана середня кількість векторів у кошику
+
+    Returns:
+        Кількість бітів від 0 до LSH_MAX_BITS
+    """
+    return min(LSH_MAX_BITS, max(0, (size // bucket_size).bit_length() - 1))
+
+
+class RandomProjectionLSH:
+    """
+    Наближений пошук за косинусною схожістю
+
+    Кожна таблиця зберігає вектори за підписом зі знаків проєкцій на
+    bits випадкових гіперплощин: схожі вектори частіше мають однаковий
+    підпис. Пошук переглядає лише відповідні кошики всіх таблиць
+    (і сусідні кошики за найменш певними бітами), тому кількість
+    кандидатів зростає повільніше за розмір колекції.
+    """
+
+    def __init__(self, dim: int, tables: int = LSH_TABLES, bits: int = LSH_MAX_BITS,
+                 probes: int = LSH_PROBES, seed: int = 0):
+        """
+        Args:
+            dim: Розмірність векторів
+            tables: Кількість таблиць
+            bits: Кількість бітів підпису
+            probes: Кількість додатково переглянутих сусідніх кошиків у таблиці
+            seed: Зерно генератора гіперплощин
+        """
+        self.tables = tables
+        self.bits = bits
+        self.probes = min(probes, bits)
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((tables * bits, dim)).astype(np.float32)
+        self._powers = 1 << np.arange(bits, dtype=np.int64)
+        self.buckets = [{} for _ in range(tables)]
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _projections(self, vectors: np.ndarray) -> np.ndarray:
+        """Проєкції векторів на гіперплощини, форма (векторів, таблиць, бітів)"""
+        return (vectors @ self.planes.T).reshape(len(vectors), self.tables, self.bits)
+
+    def add(self, vectors: np.ndarray):
+        """
+        Додавання векторів (позиції продовжують уже додані)
+
+        Args:
+            vectors: Матриця векторів
+        """
+        signatures = (self._projections(vectors) > 0) @ self._powers
+        rows = np.arange(self.size, self.size + len(vectors), dtype=np.int64)
+        for table, table_signatures in zip(self.buckets, signatures.T):
+            # Кошики зберігаються масивами позицій: пошук об'єднує їх без циклу по позиціях
+            order = np.argsort(table_signatures, kind='stable')
+            keys, starts = np.unique(table_signatures[order], return_index=True)
+            for key, bucket in zip(keys.tolist(), np.split(rows[order], starts[1:])):
+                existing = table.get(key)
+                table[key] = bucket if existing is None else np.concatenate((existing, bucket))
+        self.size += len(vectors)
+
+    def query(self, vector: np.ndarray) -> np.ndarray:
+        """
+        Кандидати в найближчі сусіди
+
+        Args:
+            vector: Вектор запиту
+
+        Returns:
+            Відсортований масив позицій без повторів
+        """
+        projections = self._projections(vector[np.newaxis])[0]
+        signatures = (projections > 0) @ self._powers
+        # Найменш певні біти - з найменшою за модулем проєкцією
+        uncertain = np.argsort(np.abs(projections), axis=1)[:, :self.probes]
+
+        candidates: List[np.ndarray] = []
+        for table, signature, bits in zip(self.buckets, signatures.tolist(), uncertain.tolist()):
+            for probe in [signature] + [signature ^ (1 << bit) for bit in bits]:
+                bucket = table.get(probe)
+                if bucket is not None:
+                    candidates.append(bucket)
+        if not candidates:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(candidates))
@@ -0,0 +1,268 @@
+"""
+Модуль оцінки нечіткої схожості рядків
+"""
+
+import itertools
+import threading
+from collections import Counter
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Кількість смуг лічильників відсіювання (потоки розподіляються між ними по колу)
+STATS_STRIPES = 8
+
+
+@lru_cache(maxsize=8192)
+def _char_bag(text: str) -> Counter:
+    """Мультимножина символів рядка (кешується для шаблонів і питань)"""
+    return Counter(text)
+
+
+class SimilarityBackend:
+    """Базовий інтерфейс оцінки схожості"""
+
+    def ratio(self, a: str, b: str) -> float:
+        """
+        Оцінка схожості двох рядків
+
+        Args:
+            a: Перший рядок (запит)
+            b: Другий рядок (шаблон або питання)
+
+        Returns:
+            Оцінка від 0 до 1
+        """
+        return SequenceMatcher(None, a, b).ratio()
+
+    def best_match(self, query: str, candidates: Iterable[Tuple[Any, str]],
+                   threshold: float) -> Optional[Tuple[Any, float]]:
+        """
+        Пошук найсхожішого кандидата з оцінкою вище порогу
+
+        При рівних оцінках перемагає перший кандидат.
+
+        Args:
+            query: Запит
+            candidates: Пари (ключ, текст кандидата)
+            threshold: Поріг схожості
+
+        Returns:
+            (ключ, оцінка) або None
+        """
+        best_key = None
+        best_score = 0
+
+        for key, text in candidates:
+            similarity = self.ratio(query, text)
+            if similarity > best_score and similarity > threshold:
+                best_score = similarity
+                best_key = key
+
+        if best_key is None:
+            return None
+        return best_key, best_score
+
+
+    def best_match_batch(self, queries: Sequence[str], candidates: Sequence[Sequence[Tuple[Any, str]]],
+                         threshold: float) -> List[Optional[Tuple[Any, float]]]:
+        """
+        Пошук найсхожіших кандидатів для списку запитів
+
+        Args:
+            queries: Запити
+            candidates: Для кожного запиту пари (ключ, текст кандидата)
+            threshold: Поріг схожості
+
+        Returns:
+            Результат best_match() для кожного запиту
+        """
+        return [self.best_match(query, pairs, threshold) for query, pairs in zip(queries, candidates)]
+
+
+class DifflibSimilarity(SimilarityBackend):
+    """
+    SequenceMatcher з відсіюванням кандидатів за дешевими верхніми оцінками
+
+    Лічильники відсіювання розподілені між фіксованими смугами з окремими
+    блокуваннями (як StripedRequestStats): потоки закріплюються за смугами
+    по колу, тож паралельні сесії майже не конкурують, а пам'ять не росте з
+    кількістю потоків. Смуги об'єднуються лише під час читання stats.
+    Лічильники не серіалізуються: процеси пошуку отримують екземпляр з
+    нульовою статистикою.
+    """
+
+    STAT_NAMES = ('compared', 'pruned_by_length', 'pruned_by_chars')
+
+    def __init__(self, stripes: int = STATS_STRIPES):
+        """
+        Args:
+            stripes: Кількість смуг лічильників
+        """
+        # Смуга: (блокування, назва лічильника -> значення)
+        self._stripes = [(threading.Lock(), dict.fromkeys(self.STAT_NAMES, 0)) for _ in range(stripes)]
+        self._next_stripe = itertools.count()
+        self._local = threading.local()
+
+    def __getstate__(self) -> Dict:
+        # Блокування та threading.local не серіалізуються
+        return {'stripes': len(self._stripes)}
+
+    def __setstate__(self, state: Dict):
+        self.__init__(state['stripes'])
+
+    def _stripe(self) -> Tuple[threading.Lock, Dict[str, int]]:
+        """Смуга поточного потоку"""
+        stripe = getattr(self._local, 'stripe', None)
+        if stripe is None:
+            # next() для itertools.count атомарний під GIL
+            stripe = self._local.stripe = self._stripes[next(self._next_stripe) % len(self._stripes)]
+        return stripe
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Лічильники відсіювання, об'єднані з усіх смуг"""
+        totals = dict.fromkeys(self.STAT_NAMES, 0)
+        for lock, counters in self._stripes:
+            with lock:
+                for name in self.STAT_NAMES:
+                    totals[name] += counters[name]
+        return totals
+
+    def best_match(self, query: str, candidates: Iterable[Tuple[Any, str]],
+                   threshold: float) -> Optional[Tuple[Any, float]]:
+        best_key = None
+        best_score = 0
+        query_length = len(query)
+        query_bag = _char_bag(query)
+        compared = pruned_by_length = pruned_by_chars = 0
+
+        for key, text in candidates:
+            # Кандидат має перевершити і поріг, і поточний найкращий результат
+            bound = max(best_score, threshold)
+            total_length = query_length + len(text)
+
+            if total_length:
+                # Оцінка за довжинами (real_quick_ratio)
+                if 2.0 * min(query_length, len(text)) / total_length <= bound:
+                    pruned_by_length += 1
+                    continue
+
+                # Оцінка за спільними символами (quick_ratio)
+                common = sum((query_bag & _char_bag(text)).values())
+                if 2.0 * common / total_length <= bound:
+                    pruned_by_chars += 1
+                    continue
+
+            compared += 1
+            similarity = SequenceMatcher(None, query, text).ratio()
+            if similarity > best_score and similarity > threshold:
+                best_score = similarity
+                best_key = key
+
+        lock, counters = self._stripe()
+        with lock:
+            counters['compared'] += compared
+            counters['pruned_by_length'] += pruned_by_length
+            counters['pruned_by_chars'] += pruned_by_chars
+
+        if best_key is None:
+            return None
+        return best_key, best_score
+
+    def best_match_batch(self, queries: Sequence[str], candidates: Sequence[Sequence[Tuple[Any, str]]],
+                         threshold: float) -> List[Optional[Tuple[Any, float]]]:
+        """
+        Пакетний best_match з векторизованими верхніми оцінками
+
+        Кількості символів запитів і кандидатів зводяться в матриці, тож
+        оцінка за спільними символами для всіх кандидатів запиту рахується
+        однією операцією numpy. Кандидати перевіряються від найбільшої
+        оцінки: щойно вона не перевищує знайдену схожість, решту відкинуто.
+        SequenceMatcher кожного тексту кандидата будується раз на пакет.
+        Результати збігаються з best_match, зокрема при рівних оцінках.
+        """
+        texts: Dict[str, int] = {}
+        for pairs in candidates:
+            for _, text in pairs:
+                texts.setdefault(text, len(texts))
+        if not texts:
+            return [None] * len(queries)
+
+        # Символ -> стовпець матриці кількостей
+        columns: Dict[str, int] = {}
+        for text in itertools.chain(texts, queries):
+            for char in text:
+                columns.setdefault(char, len(columns))
+
+        def count_matrix(strings: Iterable[str], rows: int) -> np.ndarray:
+            matrix = np.zeros((rows, len(columns)), dtype=np.int32)
+            for row, text in enumerate(strings):
+                for char, count in _char_bag(text).items():
+                    matrix[row, columns[char]] = count
+            return matrix
+
+        text_counts = count_matrix(texts, len(texts))
+        text_lengths = text_counts.sum(axis=1)
+        query_counts = count_matrix(queries, len(queries))
+        matchers: Dict[int, SequenceMatcher] = {}
+
+        results = []
+        compared = pruned_by_length = pruned_by_chars = 0
+        for query, query_row, pairs in zip(queries, query_counts, candidates):
+            if not pairs:
+                results.append(None)
+                continue
+
+            rows = np.fromiter((texts[text] for _, text in pairs), dtype=np.int64, count=len(pairs))
+            total_lengths = text_lengths[rows] + len(query)
+            # Порожні рядки мають схожість 1 (як у SequenceMatcher)
+            safe_totals = np.maximum(total_lengths, 1)
+            common = np.minimum(text_counts[rows], query_row).sum(axis=1)
+            char_bounds = np.where(total_lengths > 0, 2.0 * common / safe_totals, 1.0)
+            length_bounds = np.where(total_lengths > 0,
+                                     2.0 * np.minimum(text_lengths[rows], len(query)) / safe_totals, 1.0)
+
+            best = None
+            best_score = 0
+            examined = np.zeros(len(pairs), dtype=bool)
+            # Від найбільшої оцінки; при рівних - у порядку кандидатів
+            for order in np.lexsort((np.arange(len(pairs)), -char_bounds)).tolist():
+                bound = char_bounds[order]
+                if bound <= threshold or bound < best_score:
+                    break
+                # Рівна оцінка може лише зрівнятися зі знайденим, а перемагає раніший кандидат
+                if best is not None and bound == best_score and order > best:
+                    continue
+
+                examined[order] = True
+                row = rows[order]
+                matcher = matchers.get(row)
+                if matcher is None:
+                    matcher = matchers[row] = SequenceMatcher(None, '', pairs[order][1])
+                matcher.set_seq1(query)
+                similarity = matcher.ratio()
+                if similarity > threshold and (best is None or similarity > best_score
+                                               or (similarity == best_score and order < best)):
+                    best_score = similarity
+                    best = order
+
+            # Непорівняні кандидати: відкинуті вже за довжиною або лише за символами
+            skipped = ~examined
+            by_length = int((skipped & (length_bounds <= max(best_score, threshold))).sum())
+            compared += int(examined.sum())
+            pruned_by_length += by_length
+            pruned_by_chars += int(skipped.sum()) - by_length
+            results.append((pairs[best][0], best_score) if best is not None else None)
+
+        lock, counters = self._stripe()
+        with lock:
+            counters['compared'] += compared
+            counters['pruned_by_length'] += pruned_by_length
+            counters['pruned_by_chars'] += pruned_by_chars
+
+        return results
+
@@ -6,21 +6,59 @@ import azure.cognitiveservices.speech as speechsdk
 import streamlit as st
 import io
 import base64
+import hashlib
+import logging
 import tempfile
 from pathlib import Path
 from typing import Optional, Tuple, List, Dict
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from modules.audio_disk_cache import DISK_CACHE_BYTES, DiskAudioCache, audio_cache_key
+from modules.lru_cache import SizedLRUCache
+from modules.synthesizer_pool import IDLE_TIMEOUT, POOL_SIZE, SynthesizerPool
+
+logger = logging.getLogger(__name__)
+
+# Бюджет пам'яті кешу синтезованого аудіо (байтів)
+AUDIO_CACHE_BYTES = 64 * 1024 * 1024
+
+# Кількість потоків фонового синтезу (text_to_speech_async)
+SYNTHESIS_WORKERS = 4
+
+
+def canonicalize_text(text: str) -> str:
+    """Текст для ключа кешу: без різниці в регістрі та пробілах"""
+    return ' '.join(text.split()).casefold()
+
+
+class SynthesisError(Exception):
+    """Помилка синтезу мовлення; повідомлення призначене для показу користувачу"""
+
 
 class UkrenergoSpeechModule:
     """Модуль обробки мовлення для УкрЕнерго"""
     
-    def __init__(self, speech_key: str, region: str = "eastus"):
+    def __init__(self, speech_key: str, region: str = "eastus",
+                 audio_cache_bytes: int = AUDIO_CACHE_BYTES,
+                 audio_cache_dir: Optional[str] = None,
+                 disk_cache_bytes: int = DISK_CACHE_BYTES,
+                 synthesizer_pool_size: int = POOL_SIZE,
+                 synthesizer_idle_timeout: float = IDLE_TIMEOUT,
+                 synthesis_workers: int = SYNTHESIS_WORKERS):
         """
         Ініціалізація модулю мовлення
         
         Args:
             speech_key: Ключ Azure Speech Services
             region: Регіон Azure
+            audio_cache_bytes: Бюджет пам'яті кешу синтезованого аудіо в байтах
+            audio_cache_dir: Каталог дискового кешу аудіо, спільного для процесів (None вимикає)
+            disk_cache_bytes: Бюджет дискового кешу аудіо в байтах
+            synthesizer_pool_size: Кількість вільних синтезаторів на голос
+            synthesizer_idle_timeout: Простій у секундах, після якого з'єднання синтезатора відкривається заново
+            synthesis_workers: Кількість потоків фонового синтезу
         """
         self.speech_key = speech_key
         self.region = region
@@ -33,15 +71,34 @@ class UkrenergoSpeechModule:
         
         # Налаштування для української мови
         self.speech_config.speech_recognition_language = "uk-UA"
-        self.speech_config.speech_synthesis_voice_name = "uk-UA-PolinaNeural"
+        self.default_voice = "uk-UA-PolinaNeural"
+        self.speech_config.speech_synthesis_voice_name = self.default_voice
         
         # Налаштування якості синтезу
-        self.speech_config.set_speech_synthesis_output_format(
-            speechsdk.SpeechSynthesisOutputFormat.Riff24Khz16BitMonoPcm
+        self.output_format = speechsdk.SpeechSynthesisOutputFormat.Riff24Khz16BitMonoPcm
+        self.speech_config.set_speech_synthesis_output_format(self.output_format)
+        
+        # Окрема конфігурація синтезу для кожного голосу: після створення не змінюється,
+        # тому сесії з різними голосами синтезують паралельно без спільного стану
+        self._voice_configs: Dict[str, speechsdk.SpeechConfig] = {}
+        self._lock = threading.Lock()
+        
+        # Кеш синтезованого аудіо з обмеженням сумарного розміру
+        self.audio_cache = SizedLRUCache(audio_cache_bytes)
+        
+        # Другий рівень: дисковий кеш, що переживає перезапуски
+        self.disk_cache = self._create_disk_cache(audio_cache_dir, disk_cache_bytes) if audio_cache_dir else None
+        
+        # Синтезатори з відкритими з'єднаннями за голосом і форматом аудіо
+        self.synthesizer_pool = SynthesizerPool(
+            self._create_synthesizer,
+            connect=self._open_connection,
+            size=synthesizer_pool_size,
+            idle_timeout=synthesizer_idle_timeout
         )
         
-        # Кеш для синтезованих аудіо
-        self.audio_cache = {}
+        # Потоки фонового синтезу: відповідь показується, поки готується аудіо
+        self._executor = ThreadPoolExecutor(max_workers=synthesis_workers, thread_name_prefix='tts')
         
         # Статистика використання
         self.usage_stats = {
@@ -51,14 +108,14 @@ class UkrenergoSpeechModule:
             'audio_duration': 0
         }
     
-    def _create_ssml(self, text: str, rate: int, pitch: int) -> str:
+    def _create_ssml(self, text: str, rate: int, pitch: int, voice: str = None) -> str:
         """Створення SSML для контролю параметрів"""
         rate_str = f"{rate}%" if rate != 0 else "default"
         pitch_str = f"{pitch}%" if pitch != 0 else "default"
         
         ssml = f"""
         <speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="uk-UA">
-            <voice name="{self.speech_config.speech_synthesis_voice_name}">
+            <voice name="{voice or self.default_voice}">
                 <prosody rate="{rate_str}" pitch="{pitch_str}">
                     {text}
                 </prosody>
@@ -67,6 +124,59 @@ class UkrenergoSpeechModule:
         """
         return ssml.strip()
     
+    def _synthesis_config(self, voice: str) -> 'speechsdk.SpeechConfig':
+        """Незмінна конфігурація синтезу для голосу (створюється один раз)"""
+        with self._lock:
+            voice_config = self._voice_configs.get(voice)
+            if voice_config is None:
+                voice_config = speechsdk.SpeechConfig(subscription=self.speech_key, region=self.region)
+                voice_config.speech_synthesis_voice_name = voice
+                voice_config.set_speech_synthesis_output_format(self.output_format)
+                self._voice_configs[voice] = voice_config
+            return voice_config
+    
+    @staticmethod
+    def _create_disk_cache(directory: str, max_bytes: int) -> Optional[DiskAudioCache]:
+        """Дисковий кеш аудіо; недоступний каталог вимикає лише цей рівень кешу"""
+        try:
+            return DiskAudioCache(directory, max_bytes)
+        except OSError as e:
+            logger.warning("Дисковий кеш аудіо вимкнено: каталог %s недоступний (%s)", directory, e)
+            return None
+    
+    def _create_synthesizer(self, key: Tuple[str, str]) -> 'speechsdk.SpeechSynthesizer':
+        """Створення синтезатора для ключа пулу (голос, формат аудіо)"""
+        voice, _ = key
+        return speechsdk.SpeechSynthesizer(
+            speech_config=self._synthesis_config(voice),
+            audio_config=None
+        )
+    
+    @staticmethod
+    def _open_connection(synthesizer: 'speechsdk.SpeechSynthesizer') -> 'speechsdk.Connection':
+        """Попереднє відкриття з'єднання синтезатора зі службою"""
+        connection = speechsdk.Connection.from_speech_synthesizer(synthesizer)
+        connection.open(True)
+        return connection
+    
+    def _pool_key(self, voice: str) -> Tuple[str, str]:
+        return voice, str(self.output_format)
+    
+    def warm_up(self, voices: Optional[List[str]] = None):
+        """
+        Підготовка синтезаторів з відкритими з'єднаннями до перших запитів
+        
+        Args:
+            voices: Голоси (за замовчуванням - поточний голос)
+        """
+        voices = voices or [self.default_voice]
+        self.synthesizer_pool.warm_up(self._pool_key(voice) for voice in voices)
+    
+    def _audio_cache_key(self, text: str, voice: str, rate: int, pitch: int) -> str:
+        """Ключ кешу: хеш канонічного тексту, голосу, просодії та формату аудіо"""
+        key_source = '\x1f'.join((canonicalize_text(text), voice, str(rate), str(pitch), str(self.output_format)))
+        return hashlib.sha1(key_source.encode('utf-8')).hexdigest()
+    
     def text_to_speech(self, text: str, voice: str = None, 
                       rate: int = 0, pitch: int = 0) -> Optional[bytes]:
         """
@@ -80,50 +190,103 @@ class UkrenergoSpeechModule:
             
         Returns:
             Аудіо дані у форматі WAV або None при помилці
+            
+        Безпечний для одночасних викликів з різних потоків: кожен синтез
+        отримує власний синтезатор з пулу з конфігурацією свого голосу.
+        Помилка показується через st.error, тому викликати слід з потоку
+        сценарію Streamlit; для фонового синтезу - text_to_speech_async.
         """
         try:
-            # Перевірка кешу
-            cache_key = f"{text}_{voice}_{rate}_{pitch}"
-            if cache_key in self.audio_cache:
-                return self.audio_cache[cache_key]
+            return self._synthesize(text, voice, rate, pitch)
+        except SynthesisError as e:
+            st.error(str(e))
+            return None
+    
+    def _synthesize(self, text: str, voice: Optional[str], rate: int, pitch: int) -> bytes:
+        """
+        Синтез мовлення без звернень до Streamlit (виконується і в потоках executor)
+        
+        Returns:
+            Аудіо дані у форматі WAV
             
-            # Налаштування голосу
-            if voice:
-                self.speech_config.speech_synthesis_voice_name = voice
+        Raises:
+            SynthesisError: Синтез не вдався (повідомлення для користувача)
+        """
+        try:
+            # Голос запиту; спільна конфігурація не змінюється
+            voice = voice or self.default_voice
             
-            # Створення синтезатора
-            synthesizer = speechsdk.SpeechSynthesizer(
-                speech_config=self.speech_config,
-                audio_config=None
-            )
+            # Перевірка кешу
+            cache_key = self._audio_cache_key(text, voice, rate, pitch)
+            audio_data = self.audio_cache.get(cache_key)
+            if audio_data is not None:
+                return audio_data
             
             # Використання SSML для контролю параметрів
-            ssml_text = self._create_ssml(text, rate, pitch)
+            ssml_text = self._create_ssml(text, rate, pitch, voice)
+            
+            # Перевірка дискового кешу за адресою запиту на синтез
+            disk_key = None
+            if self.disk_cache is not None:
+                disk_key = audio_cache_key(ssml_text, voice, str(self.output_format))
+                audio_data = self.disk_cache.get(disk_key)
+                if audio_data is not None:
+                    self.audio_cache.put(cache_key, audio_data)
+                    return audio_data
             
-            # Синтез мовлення
-            result = synthesizer.speak_ssml_async(ssml_text).get()
+            # Синтез мовлення синтезатором з пулу (з'єднання вже відкрите)
+            with self.synthesizer_pool.acquire(self._pool_key(voice)) as synthesizer:
+                result = synthesizer.speak_ssml_async(ssml_text).get()
             
             if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
                 audio_data = result.audio_data
                 
                 # Оновлення статистики
-                self.usage_stats['tts_requests'] += 1
-                self.usage_stats['characters_synthesized'] += len(text)
-                self.usage_stats['audio_duration'] += len(audio_data) / (16000 * 2)  # Приблизно
+                with self._lock:
+                    self.usage_stats['tts_requests'] += 1
+                    self.usage_stats['characters_synthesized'] += len(text)
+                    self.usage_stats['audio_duration'] += len(audio_data) / (16000 * 2)  # Приблизно
                 
                 # Кешування результату
-                self.audio_cache[cache_key] = audio_data
+                self.audio_cache.put(cache_key, audio_data)
+                if disk_key is not None:
+                    self.disk_cache.put(disk_key, audio_data)
                 
                 return audio_data
             else:
-                st.error(f"Помилка синтезу: {result.reason}")
-                return None
+                raise SynthesisError(f"Помилка синтезу: {result.reason}")
                 
+        except SynthesisError:
+            raise
         except Exception as e:
-            st.error(f"Помилка TTS: {str(e)}")
-            return None
-    
+            raise SynthesisError(f"Помилка TTS: {str(e)}") from e
     
+    def text_to_speech_async(self, text: str, voice: str = None,
+                             rate: int = 0, pitch: int = 0) -> Future:
+        """
+        Синтез мовлення без блокування викликача
+        
+        Args:
+            text: Текст для синтезу
+            voice: Голос (за замовчуванням український жіночий)
+            rate: Швидкість (-100 до 100)
+            pitch: Висота тону (-100 до 100)
+            
+        Returns:
+            Future з аудіо; для asyncio - asyncio.wrap_future(...). Помилка
+            синтезу не показується в потоці executor (у ньому немає контексту
+            сценарію Streamlit), а передається через Future: future.result()
+            піднімає SynthesisError у потоці викликача. Аудіо з кешу в пам'яті
+            повертається вже завершеним Future без передачі в потік.
+        """
+        cache_key = self._audio_cache_key(text, voice or self.default_voice, rate, pitch)
+        # Перевірка без лічильника промахів: промах врахує синтез у потоці
+        audio_data = self.audio_cache.get(cache_key) if cache_key in self.audio_cache else None
+        if audio_data is not None:
+            future = Future()
+            future.set_result(audio_data)
+            return future
+        return self._executor.submit(self._synthesize, text, voice, rate, pitch)
     
     def speech_to_text(self, audio_data: bytes = None, use_microphone: bool = False) -> Optional[str]:
         """
@@ -156,7 +319,8 @@ class UkrenergoSpeechModule:
             result = recognizer.recognize_once()
 
             if result.reason == speechsdk.ResultReason.RecognizedSpeech:
-                self.usage_stats['stt_requests'] += 1
+                with self._lock:
+                    self.usage_stats['stt_requests'] += 1
                 return result.text
             elif result.reason == speechsdk.ResultReason.NoMatch:
                 st.warning("Мовлення не розпізнано")
@@ -232,8 +396,39 @@ class UkrenergoSpeechModule:
             return []
     
     def get_usage_statistics(self) -> Dict:
-        """Отримання статистики використання"""
-        return self.usage_stats
+        """Отримання статистики використання, включно з ефективністю кешу аудіо"""
+        cache_stats = self.audio_cache.get_statistics()
+        with self._lock:
+            usage_stats = dict(self.usage_stats)
+        return dict(
+            usage_stats,
+            audio_cache_hit_rate=cache_stats['hit_rate'],
+            audio_cache_bytes_saved=cache_stats['bytes_saved'],
+            audio_cache_bytes=cache_stats['bytes'],
+            audio_cache_entries=cache_stats['size'],
+            **self._disk_cache_statistics(),
+            **self._synthesizer_pool_statistics()
+        )
+    
+    def _synthesizer_pool_statistics(self) -> Dict:
+        """Повторне використання синтезаторів та оцінка зекономленої затримки"""
+        pool_stats = self.synthesizer_pool.get_statistics()
+        return {
+            'synthesizers_created': pool_stats['created'],
+            'synthesizers_reused': pool_stats['reused'],
+            'synthesizer_latency_saved_ms': pool_stats['latency_saved_ms']
+        }
+    
+    def _disk_cache_statistics(self) -> Dict:
+        """Статистика дискового кешу аудіо (порожня, якщо його вимкнено)"""
+        if self.disk_cache is None:
+            return {}
+        disk_stats = self.disk_cache.get_statistics()
+        return {
+            'disk_cache_hit_rate': disk_stats['hit_rate'],
+            'disk_cache_bytes_saved': disk_stats['bytes_saved'],
+            'disk_cache_bytes': disk_stats['bytes']
+        }
     
     def generate_announcement_audio(self, announcement_type: str, **kwargs) -> Optional[bytes]:
         """
@@ -276,14 +471,30 @@ class UkrenergoSpeechModule:
 
 # Глобальний екземпляр модулю мовлення
 speech_module = None
+_speech_module_lock = threading.Lock()
 
 def get_speech_module():
     """Отримання глобального екземпляру модулю мовлення"""
     global speech_module
-    if speech_module is None:
-        from config import config
-        speech_module = UkrenergoSpeechModule(
-            speech_key=config.AZURE_SPEECH_KEY,
-            region=config.AZURE_SPEECH_REGION
-        )
+    # Подвійна перевірка, як у get_chatbot: блокування потрібне лише під час першого створення
+    if speech_module is not None:
+        return speech_module
+    
+    with _speech_module_lock:
+        if speech_module is None:
+            from config import config
+            module = UkrenergoSpeechModule(
+                speech_key=config.AZURE_SPEECH_KEY,
+                region=config.AZURE_SPEECH_REGION,
+                audio_cache_bytes=config.TTS_SETTINGS['audio_cache_bytes'],
+                audio_cache_dir=str(config.TTS_CACHE_DIR),
+                disk_cache_bytes=config.TTS_SETTINGS['disk_cache_bytes'],
+                synthesizer_pool_size=config.TTS_SETTINGS['synthesizer_pool_size'],
+                synthesizer_idle_timeout=config.TTS_SETTINGS['synthesizer_idle_timeout'],
+                synthesis_workers=config.TTS_SETTINGS['synthesis_workers']
+            )
+            # З'єднання відкриваються до першого запиту користувача; екземпляр
+            # стає видимим іншим потокам лише після прогріву
+            module.warm_up()
+            speech_module = module
     return speech_module
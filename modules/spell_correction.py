@@ -0,0 +1,204 @@
+"""
+Модуль виправлення помилок розпізнавання мовлення за словником предметної області
+"""
+
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+
+from modules.lru_cache import LRUCache
+from modules.text_processing import stem, tokenize
+
+# Найбільша кількість редагувань між словом запиту та словом словника
+MAX_EDIT_DISTANCE = 2
+
+# Довжина префікса, з якого будуються варіанти видалень (як у SymSpell)
+PREFIX_LENGTH = 7
+
+# Коротші слова не виправляються: для них забагато схожих слів
+MIN_WORD_LENGTH = 4
+
+# Слова довші за цю межу допускають MAX_EDIT_DISTANCE редагувань, коротші - одне
+LONG_WORD_LENGTH = 8
+
+# Кількість запам'ятованих виправлень слів
+CORRECTION_CACHE_SIZE = 4096
+
+
+def delete_levels(word: str, max_distance: int) -> List[Set[str]]:
+    """
+    Варіанти слова за кількістю видалених символів
+
+    Args:
+        word: Слово
+        max_distance: Найбільша кількість видалень
+
+    Returns:
+        Список множин: елемент i - варіанти рівно з i видаленнями
+    """
+    levels = [{word}]
+    for _ in range(max_distance):
+        levels.append({
+            variant[:i] + variant[i + 1:] for variant in levels[-1] for i in range(len(variant))
+        })
+    return levels
+
+
+def deletes(word: str, max_distance: int) -> Set[str]:
+    """
+    Усі варіанти слова з видаленими не більше ніж max_distance символами
+
+    Args:
+        word: Слово
+        max_distance: Найбільша кількість видалень
+
+    Returns:
+        Множина варіантів, включно з самим словом
+    """
+    return set().union(*delete_levels(word, max_distance))
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> int:
+    """
+    Відстань Дамерау-Левенштейна (з перестановкою сусідніх символів)
+
+    Args:
+        a: Перше слово
+        b: Друге слово
+        max_distance: Межа, після якої обчислення припиняється
+
+    Returns:
+        Відстань або max_distance + 1, якщо вона більша за межу
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    # Спільні початок і кінець не впливають на відстань
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a = a[start:len(a) - end]
+    b = b[start:len(b) - end]
+    if not a or not b:
+        return len(a) + len(b) if len(a) + len(b) <= max_distance else max_distance + 1
+
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous_previous is not None and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+
+    return previous[-1] if previous[-1] <= max_distance else max_distance + 1
+
+
+class SpellCorrector:
+    """
+    Виправлення слів за словником з попередньо обчисленим індексом видалень
+
+    Для кожного слова словника зберігаються варіанти його префікса з
+    видаленими символами. Слово запиту з тими самими видаленнями
+    потрапляє до тих самих ключів, тому кандидати знаходяться кількома
+    звертаннями до словника незалежно від його розміру, а точна відстань
+    обчислюється лише для них.
+
+    Слова, основа яких є у словнику (інші словоформи відомих слів),
+    не змінюються.
+    """
+
+    def __init__(self, words: Iterable[str], max_distance: int = MAX_EDIT_DISTANCE,
+                 prefix_length: int = PREFIX_LENGTH):
+        """
+        Args:
+            words: Нормалізовані слова предметної області (частота - кількість повторів)
+                або словник слово -> частота
+            max_distance: Найбільша кількість редагувань
+            prefix_length: Довжина префікса для індексу видалень
+        """
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.cache = LRUCache(CORRECTION_CACHE_SIZE)
+
+        self.frequencies = Counter(words)
+        self.stems = {stem(word) for word in self.frequencies}
+
+        # Варіант видалень префікса -> слова словника
+        self.delete_index: Dict[str, List[str]] = {}
+        for word in self.frequencies:
+            if len(word) < MIN_WORD_LENGTH:
+                continue
+            for variant in deletes(word[:prefix_length], max_distance):
+                self.delete_index.setdefault(variant, []).append(word)
+
+    def __len__(self) -> int:
+        return len(self.frequencies)
+
+    def correct_word(self, word: str) -> str:
+        """
+        Найближче слово словника
+
+        Args:
+            word: Нормалізоване слово
+
+        Returns:
+            Виправлене слово або саме слово, якщо воно відоме чи кандидатів немає
+        """
+        if len(word) < MIN_WORD_LENGTH or word in self.frequencies:
+            return word
+
+        corrected = self.cache.get(word)
+        if corrected is None:
+            corrected = self._lookup(word)
+            self.cache.put(word, corrected)
+        return corrected
+
+    def _lookup(self, word: str) -> str:
+        """Пошук найближчого слова в індексі видалень"""
+        if stem(word) in self.stems:
+            return word
+
+        max_distance = self.max_distance if len(word) >= LONG_WORD_LENGTH else min(1, self.max_distance)
+        best: Optional[tuple] = None
+        checked = set()
+
+        for deleted, variants in enumerate(delete_levels(word[:self.prefix_length], max_distance)):
+            # Кандидати з більшою кількістю видалень не ближчі за вже знайдений
+            if best is not None and deleted > best[0]:
+                break
+            for variant in variants:
+                for candidate in self.delete_index.get(variant, ()):
+                    if candidate in checked:
+                        continue
+                    checked.add(candidate)
+
+                    limit = max_distance if best is None else best[0]
+                    distance = edit_distance(word, candidate, limit)
+                    if distance > limit:
+                        continue
+                    # Менша відстань, потім частіше слово, потім алфавітний порядок
+                    key = (distance, -self.frequencies[candidate], candidate)
+                    if best is None or key < best:
+                        best = key
+
+        return best[2] if best else word
+
+    def correct_text(self, text: str) -> str:
+        """
+        Виправлення кожного слова нормалізованого тексту
+
+        Args:
+            text: Нормалізований текст
+
+        Returns:
+            Текст з виправленими словами
+        """
+        return ' '.join(self.correct_word(word) for word in tokenize(text))
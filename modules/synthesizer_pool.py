@@ -0,0 +1,232 @@
+"""
+Модуль пулу синтезаторів мовлення з попередньо відкритими з'єднаннями
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, Optional
+
+# Кількість вільних синтезаторів, що зберігаються для одного ключа (голос і формат)
+POOL_SIZE = 2
+
+# Час простою, після якого з'єднання синтезатора відкривається заново (секунд)
+IDLE_TIMEOUT = 300.0
+
+# Період перевірки вільних синтезаторів фоновим потоком (секунд)
+REFRESH_INTERVAL = 60.0
+
+
+class _PooledSynthesizer:
+    """Синтезатор з його з'єднанням і часом останнього використання"""
+
+    __slots__ = ('synthesizer', 'connection', 'last_used')
+
+    def __init__(self, synthesizer: Any, connection: Any, last_used: float):
+        self.synthesizer = synthesizer
+        self.connection = connection
+        self.last_used = last_used
+
+
+class SynthesizerPool:
+    """
+    Обмежений пул синтезаторів за ключем (голос і формат аудіо)
+
+    Синтезатор видається одному запиту (acquire) і повертається в пул
+    після нього, тому з'єднання зі службою встановлюється один раз і
+    використовується повторно. Служба закриває з'єднання після простою,
+    тому фоновий потік заздалегідь відкриває заново з'єднання вільних
+    синтезаторів, що простоюють майже idle_timeout, а старі закриває:
+    запит не чекає на підключення. Якщо всі синтезатори
+    ключа зайняті, створюється додатковий, а зайві після повернення
+    відкидаються: у пулі лишається не більше size вільних.
+
+    Зекономлена затримка оцінюється як кількість повторних використань,
+    помножена на середній виміряний час створення й підключення синтезатора.
+    """
+
+    def __init__(self, create: Callable[[Hashable], Any], connect: Optional[Callable[[Any], Any]] = None,
+                 size: int = POOL_SIZE, idle_timeout: float = IDLE_TIMEOUT,
+                 refresh_interval: Optional[float] = REFRESH_INTERVAL,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            create: Створення синтезатора для ключа
+            connect: Попереднє відкриття з'єднання синтезатора (повертає з'єднання)
+            size: Найбільша кількість вільних синтезаторів на ключ
+            idle_timeout: Простій у секундах, після якого з'єднання відкривається заново
+            refresh_interval: Період фонового оновлення з'єднань у секундах
+                (None - без фонового потоку, оновлення викликом refresh_idle)
+            clock: Джерело часу в секундах
+        """
+        self.create = create
+        self.connect = connect
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.refresh_interval = refresh_interval
+        self.clock = clock
+
+        self._idle: Dict[Hashable, List[_PooledSynthesizer]] = {}
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+        self.stats = {
+            'created': 0,
+            'reused': 0,
+            'preconnected': 0,
+            'reconnected': 0,
+            'connect_errors': 0,
+            'setup_seconds': 0.0
+        }
+
+    def _open(self, synthesizer: Any) -> Any:
+        """Попереднє відкриття з'єднання; помилка не заважає синтезу без нього"""
+        if self.connect is None:
+            return None
+        try:
+            return self.connect(synthesizer)
+        except Exception:
+            with self._lock:
+                self.stats['connect_errors'] += 1
+            return None
+
+    @staticmethod
+    def _close(connection: Any):
+        """Закриття з'єднання; помилка закриття не впливає на пул"""
+        if connection is None:
+            return
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _new(self, key: Hashable) -> _PooledSynthesizer:
+        """Створення синтезатора з відкритим з'єднанням"""
+        start = time.perf_counter()
+        synthesizer = self.create(key)
+        connection = self._open(synthesizer)
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self.stats['created'] += 1
+            self.stats['setup_seconds'] += elapsed
+            if connection is not None:
+                self.stats['preconnected'] += 1
+        return _PooledSynthesizer(synthesizer, connection, self.clock())
+
+    def warm_up(self, keys: Iterable[Hashable]):
+        """
+        Заповнення пулу синтезаторами з відкритими з'єднаннями
+
+        Args:
+            keys: Ключі (голоси), для яких готуються синтезатори
+        """
+        for key in keys:
+            with self._lock:
+                missing = self.size - len(self._idle.get(key, ()))
+            for _ in range(missing):
+                self._release(key, self._new(key))
+
+    @contextmanager
+    def acquire(self, key: Hashable) -> Iterator[Any]:
+        """
+        Синтезатор для одного запиту
+
+        Args:
+            key: Ключ (голос і формат аудіо)
+
+        Yields:
+            Синтезатор, що належить викликачу до виходу з контексту
+        """
+        with self._lock:
+            idle = self._idle.get(key)
+            pooled = idle.pop() if idle else None
+            if pooled is not None:
+                self.stats['reused'] += 1
+
+        if pooled is None:
+            pooled = self._new(key)
+
+        try:
+            yield pooled.synthesizer
+        finally:
+            pooled.last_used = self.clock()
+            self._release(key, pooled)
+
+    def _release(self, key: Hashable, pooled: _PooledSynthesizer):
+        """Повернення синтезатора в пул, якщо в ньому є місце"""
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            kept = len(idle) < self.size and not self._closed.is_set()
+            if kept:
+                idle.append(pooled)
+            start_refresh = (kept and self._refresh_thread is None and self.connect is not None
+                             and self.refresh_interval is not None)
+            if start_refresh:
+                self._refresh_thread = threading.Thread(target=self._run_refresh, name='synthesizer-refresh',
+                                                        daemon=True)
+        if start_refresh:
+            self._refresh_thread.start()
+        if not kept:
+            # Зайвий синтезатор відкидається разом із з'єднанням
+            self._close(pooled.connection)
+
+    def refresh_idle(self):
+        """
+        Повторне відкриття з'єднань вільних синтезаторів, що простоюють надто довго
+
+        З'єднання оновлюються з запасом в один період фонового потоку, щоб
+        до наступної перевірки служба не встигла їх закрити. Синтезатор на
+        час підключення вилучається з пулу, тож запити його не отримують.
+        """
+        threshold = self.idle_timeout - (self.refresh_interval or 0)
+        now = self.clock()
+        stale = []
+        with self._lock:
+            for key, idle in self._idle.items():
+                stale.extend((key, pooled) for pooled in idle if now - pooled.last_used > threshold)
+                idle[:] = [pooled for pooled in idle if now - pooled.last_used <= threshold]
+
+        for key, pooled in stale:
+            self._close(pooled.connection)
+            pooled.connection = self._open(pooled.synthesizer)
+            pooled.last_used = self.clock()
+            with self._lock:
+                self.stats['reconnected'] += 1
+            self._release(key, pooled)
+
+    def _run_refresh(self):
+        """Цикл фонового потоку оновлення з'єднань"""
+        while not self._closed.wait(self.refresh_interval):
+            self.refresh_idle()
+
+    def close(self, timeout: Optional[float] = None):
+        """
+        Зупинка фонового потоку та закриття з'єднань вільних синтезаторів
+
+        Args:
+            timeout: Найдовше очікування зупинки потоку в секундах
+        """
+        self._closed.set()
+        if self._refresh_thread is not None:
+            self._refresh_thread.join(timeout)
+        with self._lock:
+            idle = [pooled for pooled_list in self._idle.values() for pooled in pooled_list]
+            self._idle.clear()
+        for pooled in idle:
+            self._close(pooled.connection)
+
+    def idle_count(self, key: Hashable) -> int:
+        """Кількість вільних синтезаторів ключа"""
+        with self._lock:
+            return len(self._idle.get(key, ()))
+
+    def get_statistics(self) -> Dict:
+        """Статистика повторного використання та оцінка зекономленої затримки"""
+        with self._lock:
+            stats = dict(self.stats)
+        average_setup = stats.pop('setup_seconds') / stats['created'] if stats['created'] else 0
+        stats['average_setup_ms'] = average_setup * 1000
+        stats['latency_saved_ms'] = stats['reused'] * average_setup * 1000
+        return stats
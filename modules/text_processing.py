@@ -0,0 +1,133 @@
+"""
+Модуль обробки тексту для чат-бота УкрЕнерго
+"""
+
+import re
+from functools import lru_cache
+from typing import List
+
+# Усе, що не є літерою, цифрою чи пробілом
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+
+# Мінімальна довжина основи після відсікання закінчення
+MIN_STEM_LENGTH = 3
+
+# Зворотні частки дієслів (відсікаються перед закінченням)
+REFLEXIVE_SUFFIXES = ('ся', 'сь')
+
+# Суфікси віддієслівних іменників: від коротких основ не відсікаються,
+# бо інакше різні слова збігаються ("запитання" -> "запит")
+DERIVATIONAL_SUFFIXES = ('ування', 'ювання', 'ання', 'яння', 'ення', 'іння')
+
+# Мінімальна довжина основи після відсікання суфікса віддієслівного іменника
+MIN_DERIVED_STEM_LENGTH = 6
+
+# Закінчення та словотвірні суфікси, від довших до коротших
+UKRAINIAN_SUFFIXES = tuple(sorted({
+    # Віддієслівні іменники та дієслова
+    *DERIVATIONAL_SUFFIXES,
+    'увати', 'ювати', 'ували', 'ювали', 'увала', 'ювала',
+    'ати', 'яти', 'ити', 'іти', 'ать', 'ять', 'ить', 'уть', 'ють',
+    'али', 'яли', 'или', 'іли', 'ала', 'яла', 'ила', 'іла', 'ало', 'яло', 'ило', 'іло',
+    'емо', 'ємо', 'имо', 'ете', 'єте', 'ите', 'ає', 'яє', 'ує', 'еш', 'єш', 'иш',
+    # Прикметники
+    'ого', 'ому', 'ими', 'ій', 'ий', 'ої', 'их', 'им', 'ім', 'ою',
+    # Іменники
+    'ами', 'ями', 'ові', 'еві', 'ах', 'ях', 'ам', 'ям', 'ом', 'ем', 'єм',
+    'ів', 'їв', 'ею', 'єю', 'ію', 'ія', 'ії', 'ей',
+    'а', 'я', 'у', 'ю', 'і', 'ї', 'и', 'е', 'є', 'о', 'ь', 'й',
+}, key=len, reverse=True))
+
+# Кінцівки з випадним голосним: "рахунок" -> "рахунку"
+FLEETING_VOWEL_ENDINGS = ('ок', 'ек')
+
+
+def normalize_text(text: str) -> str:
+    """
+    Нормалізація тексту
+
+    Args:
+        text: Вхідний текст
+
+    Returns:
+        Текст у нижньому регістрі без пунктуації та зайвих пробілів
+    """
+    # Приведення до нижнього регістру
+    text = text.lower()
+
+    # Видалення зайвих пробілів
+    text = ' '.join(text.split())
+
+    # Видалення пунктуації
+    text = PUNCTUATION_PATTERN.sub('', text)
+
+    return text
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Розбиття нормалізованого тексту на токени
+
+    Args:
+        text: Нормалізований текст
+
+    Returns:
+        Список токенів
+    """
+    return text.split()
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """
+    Спрощений стемінг українського слова відсіканням закінчення
+
+    Args:
+        word: Слово в нижньому регістрі
+
+    Returns:
+        Основа слова
+    """
+    for suffix in REFLEXIVE_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_LENGTH:
+            word = word[:-len(suffix)]
+            break
+
+    for suffix in UKRAINIAN_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_LENGTH:
+            if suffix in DERIVATIONAL_SUFFIXES and len(word) - len(suffix) < MIN_DERIVED_STEM_LENGTH:
+                continue
+            word = word[:-len(suffix)]
+            break
+
+    # Випадний голосний: основа "рахунок" зводиться до "рахунк"
+    if word.endswith(FLEETING_VOWEL_ENDINGS) and len(word) > MIN_STEM_LENGTH + 1:
+        word = word[:-2] + word[-1]
+
+    return word
+
+
+def stem_text(text: str) -> str:
+    """
+    Стемінг кожного токена нормалізованого тексту
+
+    Args:
+        text: Нормалізований текст
+
+    Returns:
+        Текст з основ слів
+    """
+    return ' '.join(stem(token) for token in tokenize(text))
+
+
+def prepare_text(text: str) -> str:
+    """
+    Повна обробка тексту для порівняння: нормалізація та стемінг
+
+    Args:
+        text: Вхідний текст
+
+    Returns:
+        Нормалізований текст з основ слів
+    """
+    return stem_text(normalize_text(text))
@@ -0,0 +1,42 @@
+"""
+Тести для модулю aho_corasick.py
+"""
+
+import unittest
+from modules.aho_corasick import AhoCorasick, FlatAhoCorasick
+
+
+class TestAhoCorasick(unittest.TestCase):
+
+    def test_finds_all_overlapping_matches(self):
+        automaton = AhoCorasick([('he', 1), ('she', 2), ('his', 3), ('hers', 4)])
+        matches = sorted(automaton.iter_matches('ushers'))
+        self.assertEqual(matches, [(1, 'she', 2), (2, 'he', 1), (2, 'hers', 4)])
+
+    def test_cyrillic_patterns(self):
+        automaton = AhoCorasick([('світла немає', 'emergency'), ('рахунок', 'payment')])
+        matches = list(automaton.iter_matches('у нас світла немає і рахунок'))
+        self.assertEqual(matches, [(6, 'світла немає', 'emergency'), (21, 'рахунок', 'payment')])
+
+    def test_no_matches(self):
+        automaton = AhoCorasick([('тариф', 'tariff')])
+        self.assertEqual(list(automaton.iter_matches('яка погода')), [])
+        self.assertEqual(len(automaton), 1)
+
+    def test_empty_pattern_ignored(self):
+        automaton = AhoCorasick([('', 'empty')])
+        self.assertEqual(len(automaton), 0)
+        self.assertEqual(list(automaton.iter_matches('текст')), [])
+
+    def test_flat_arrays_match_automaton(self):
+        patterns = ['he', 'she', 'his', 'hers', 'h']
+        automaton = AhoCorasick((pattern, pattern) for pattern in patterns)
+        flat = FlatAhoCorasick(automaton.to_arrays(patterns.index), patterns, values=[1, 2, 3, 4, 5])
+        for text in ('ushers', 'his hers', 'xyz', ''):
+            expected = [(start, pattern, patterns.index(pattern) + 1)
+                        for start, pattern, _ in automaton.iter_matches(text)]
+            self.assertEqual(list(flat.iter_matches(text)), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Тести для модулю audio_disk_cache.py
+"""
+
+import errno
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from modules.audio_disk_cache import DiskAudioCache, audio_cache_key
+
+
+class TestDiskAudioCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = DiskAudioCache(self.directory.name, max_bytes=1000)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_key_is_content_address(self):
+        self.assertEqual(audio_cache_key('<speak/>', 'uk-UA-PolinaNeural'),
+                         audio_cache_key('<speak/>', 'uk-UA-PolinaNeural'))
+        self.assertNotEqual(audio_cache_key('<speak/>', 'uk-UA-PolinaNeural'),
+                            audio_cache_key('<speak/>', 'uk-UA-OstapNeural'))
+
+    def test_put_and_get(self):
+        key = audio_cache_key('привіт')
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, b'audio')
+        self.assertIn(key, self.cache)
+        self.assertEqual(self.cache.get(key), b'audio')
+
+        stats = self.cache.get_statistics()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['bytes'], 5)
+        self.assertEqual(stats['bytes_saved'], 5)
+
+    def test_shared_between_instances(self):
+        key = audio_cache_key('привіт')
+        self.cache.put(key, b'audio')
+        # Інший процес бачить той самий каталог
+        other = DiskAudioCache(self.directory.name, max_bytes=1000)
+        self.assertEqual(other.bytes, 5)
+        self.assertEqual(other.get(key), b'audio')
+
+    def test_no_temporary_files_left(self):
+        self.cache.put(audio_cache_key('привіт'), b'audio')
+        files = [name for _, _, names in os.walk(self.directory.name) for name in names]
+        self.assertEqual(len(files), 1)
+        self.assertTrue(files[0].endswith('.wav'))
+
+    def test_evicts_least_recently_used(self):
+        keys = [audio_cache_key(str(i)) for i in range(4)]
+        for age, key in enumerate(keys[:3]):
+            self.cache.put(key, b'x' * 300)
+            # Явний час використання: перший файл - найстаріший
+            path = self.cache._path(key)
+            os.utime(path, (1000 + age, 1000 + age))
+        # Використання першого файлу робить найстарішим другий
+        self.cache.get(keys[0])
+
+        self.cache.put(keys[3], b'x' * 300)
+        self.assertNotIn(keys[1], self.cache)
+        for key in (keys[0], keys[2], keys[3]):
+            self.assertIn(key, self.cache)
+        self.assertLessEqual(self.cache.bytes, self.cache.max_bytes)
+
+    def test_oversized_value_is_not_stored(self):
+        key = audio_cache_key('довге')
+        self.cache.put(key, b'x' * 2000)
+        self.assertNotIn(key, self.cache)
+        self.assertEqual(self.cache.bytes, 0)
+
+    def test_write_failure_is_counted_and_cleaned_up(self):
+        key = audio_cache_key('привіт')
+        with patch('modules.audio_disk_cache.os.replace', side_effect=OSError(errno.ENOSPC, "No space left on device")):
+            self.cache.put(key, b'audio')
+
+        self.assertNotIn(key, self.cache)
+        self.assertEqual(self.cache.bytes, 0)
+        self.assertEqual(self.cache.get_statistics()['errors'], 1)
+        # Тимчасовий файл видалено
+        files = [name for _, _, names in os.walk(self.directory.name) for name in names]
+        self.assertEqual(files, [])
+
+    def test_read_failure_is_a_miss(self):
+        key = audio_cache_key('привіт')
+        self.cache.put(key, b'audio')
+        with patch('modules.audio_disk_cache.mmap.mmap', side_effect=OSError(errno.EIO, "I/O error")):
+            self.assertIsNone(self.cache.get(key))
+        stats = self.cache.get_statistics()
+        self.assertEqual((stats['misses'], stats['errors']), (1, 1))
+
+    def test_clear(self):
+        self.cache.put(audio_cache_key('привіт'), b'audio')
+        self.cache.clear()
+        self.assertEqual(self.cache.bytes, 0)
+        self.assertIsNone(self.cache.get(audio_cache_key('привіт')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+"""
+Тести для модулю chat_log_writer.py
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+from modules.chat_log_writer import ChatLogWriter
+
+
+class TestChatLogWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'logs', 'chat.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def read_records(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def test_records_are_written_in_order(self):
+        writer = ChatLogWriter(self.path)
+        for number in range(100):
+            self.assertTrue(writer.write({'number': number, 'timestamp': datetime(2024, 1, 1)}))
+        writer.close()
+
+        records = self.read_records()
+        self.assertEqual([record['number'] for record in records], list(range(100)))
+        self.assertEqual(records[0]['timestamp'], '2024-01-01 00:00:00')
+        self.assertEqual(writer.get_statistics()['written'], 100)
+
+    def test_group_commit(self):
+        release = threading.Event()
+        original_write_batch = ChatLogWriter._write_batch
+
+        def slow_write_batch(writer, records):
+            release.wait()
+            original_write_batch(writer, records)
+
+        with patch.object(ChatLogWriter, '_write_batch', slow_write_batch):
+            writer = ChatLogWriter(self.path, batch_size=50)
+            for number in range(101):
+                writer.write({'number': number})
+            release.set()
+            writer.flush()
+
+        # Поки перша група записувалась, решта зібралась у великі групи
+        self.assertEqual(writer.get_statistics()['written'], 101)
+        self.assertLessEqual(writer.get_statistics()['batches'], 4)
+        writer.close()
+
+    def test_backpressure_drops_when_queue_is_full(self):
+        release = threading.Event()
+        original_write_batch = ChatLogWriter._write_batch
+
+        def blocked_write_batch(writer, records):
+            release.wait()
+            original_write_batch(writer, records)
+
+        with patch.object(ChatLogWriter, '_write_batch', blocked_write_batch):
+            writer = ChatLogWriter(self.path, queue_size=2, batch_size=1, put_timeout=0.01)
+            accepted = [writer.write({'number': number}) for number in range(10)]
+            release.set()
+            writer.close()
+
+        self.assertIn(False, accepted)
+        stats = writer.get_statistics()
+        self.assertEqual(stats['written'] + stats['dropped'], 10)
+        self.assertEqual(len(self.read_records()), stats['written'])
+
+    def test_write_after_close_is_rejected(self):
+        writer = ChatLogWriter(self.path)
+        writer.close()
+        self.assertFalse(writer.write({'number': 1}))
+
+
+if __name__ == '__main__':
+    unittest.main()
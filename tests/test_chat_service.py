@@ -0,0 +1,104 @@
+"""
+Тести для модулю chat_service.py
+"""
+
+import asyncio
+import json
+import os
+import unittest
+from unittest.mock import patch
+
+from modules.chat_service import ChatService, create_service_chatbot
+from tests.test_chatbot import FAQ_CONTENT
+
+
+class TestChatService(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.faq_file = "test_service_faq.json"
+        with open(self.faq_file, 'w', encoding='utf-8') as f:
+            json.dump(FAQ_CONTENT, f, ensure_ascii=False)
+        self.service = ChatService(create_service_chatbot(self.faq_file))
+
+    def tearDown(self):
+        os.remove(self.faq_file)
+
+    def test_message(self):
+        status, payload = self.service.handle_request(
+            'POST', '/message', json.dumps({'message': "Як оплатити рахунок?"}).encode('utf-8')
+        )
+        self.assertEqual(status, 200)
+        self.assertIn("Приват24", payload['response'])
+        self.assertFalse(self.service.chatbot.session_logging)
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.service.handle_request('POST', '/message', b'{')[0], 400)
+        self.assertEqual(self.service.handle_request('POST', '/message', b'{}')[0], 400)
+        self.assertEqual(self.service.handle_request('GET', '/message', b'')[0], 405)
+        self.assertEqual(self.service.handle_request('GET', '/unknown', b'')[0], 404)
+
+    def test_user_id_must_be_string(self):
+        for user_id in (5, ['user'], {'id': 'user'}):
+            body = json.dumps({'message': "Привіт", 'user_id': user_id}).encode('utf-8')
+            self.assertEqual(self.service.handle_request('POST', '/message', body)[0], 400)
+
+        body = json.dumps({'message': "Привіт", 'user_id': "user-1"}).encode('utf-8')
+        self.assertEqual(self.service.handle_request('POST', '/message', body)[0], 200)
+
+    async def test_keep_alive_connection(self):
+        server = await asyncio.start_server(self.service.handle_connection, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+
+        responses = []
+        for message in ("Привіт", "Що робити при відключенні?"):
+            body = json.dumps({'message': message}).encode('utf-8')
+            writer.write(
+                f"POST /message HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+            )
+            head = await reader.readuntil(b'\r\n\r\n')
+            length = int(head.split(b'Content-Length: ')[1].split(b'\r\n')[0])
+            responses.append((head.split(b' ')[1], json.loads(await reader.readexactly(length))))
+
+        writer.close()
+        server.close()
+        await server.wait_closed()
+
+        self.assertEqual([status for status, _ in responses], [b'200', b'200'])
+        self.assertIn("104", responses[1][1]['response'])
+        self.assertEqual(self.service.chatbot.stats['total_questions'], 2)
+
+    async def test_unexpected_error_returns_500(self):
+        server = await asyncio.start_server(self.service.handle_connection, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        process_message = self.service.chatbot.process_message
+
+        def failing_once(message, user_id=None):
+            if message == "збій":
+                raise RuntimeError("збій")
+            return process_message(message, user_id)
+
+        statuses = []
+        with patch.object(self.service.chatbot, 'process_message', failing_once), \
+                self.assertLogs('modules.chat_service', level='ERROR'):
+            for message in ("збій", "Привіт"):
+                body = json.dumps({'message': message}).encode('utf-8')
+                writer.write(
+                    f"POST /message HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+                )
+                head = await reader.readuntil(b'\r\n\r\n')
+                length = int(head.split(b'Content-Length: ')[1].split(b'\r\n')[0])
+                await reader.readexactly(length)
+                statuses.append(head.split(b' ')[1])
+
+        writer.close()
+        server.close()
+        await server.wait_closed()
+
+        # З'єднання залишається відкритим після помилки
+        self.assertEqual(statuses, [b'500', b'200'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,9 +2,12 @@
 Тести для модулю chatbot_module.py
 """
 
+import tempfile
+import threading
 import unittest
 from unittest.mock import MagicMock, patch
 from modules.chatbot_module import UkrenergoChatbot
+from modules.text_processing import prepare_text
 import json
 import os
 
@@ -56,20 +59,43 @@ class TestUkrenergoChatbot(unittest.TestCase):
     def test_normalize_text(self):
         text = "Привіт, як справи? (Тест)"
         normalized = self.chatbot._normalize_text(text)
-        self.assertEqual(normalized, "привіт як справи тест")
+        self.assertEqual(normalized, "привіт як справ тест")
     
     def test_detect_intent_greeting(self):
-        intent = self.chatbot._detect_intent("Привіт, бот")
+        intent = self.chatbot._detect_intent(self.chatbot._normalize_text("Привіт, бот"))
         self.assertEqual(intent, 'greeting')
     
     def test_detect_intent_payment(self):
-        intent = self.chatbot._detect_intent("Хочу оплатити рахунок")
+        intent = self.chatbot._detect_intent(self.chatbot._normalize_text("Хочу оплатити рахунок"))
         self.assertEqual(intent, 'payment')
     
     def test_detect_intent_unknown(self):
-        intent = self.chatbot._detect_intent("Яка погода сьогодні?")
+        intent = self.chatbot._detect_intent(self.chatbot._normalize_text("Яка погода сьогодні?"))
         self.assertEqual(intent, 'unknown')
     
+    def test_detect_intent_exact_match_priority(self):
+        # Довший точний збіг важить більше за коротший
+        intent = self.chatbot._detect_intent(self.chatbot._normalize_text("Привіт, як передати показники лічильника"))
+        self.assertEqual(intent, 'meter')
+    
+    def test_detect_intent_fuzzy_fallback(self):
+        # Точного збігу немає, спрацьовує нечітке порівняння
+        intent = self.chatbot._detect_intent(self.chatbot._normalize_text("привт"))
+        self.assertEqual(intent, 'greeting')
+
+    def test_detect_intent_ignores_patterns_inside_longer_words(self):
+        # "нова" -> "нов" не збігається з "новини", "хай" - з "хайп", "запит" - з "запитання"
+        for message in ("новини про оцінку", "хайп", "у мене запитання"):
+            with self.subTest(message=message):
+                intent = self.chatbot._detect_intent(self.chatbot._normalize_text(message))
+                self.assertEqual(intent, 'unknown')
+
+    def test_detect_intent_matches_word_forms(self):
+        intent = self.chatbot._detect_intent(self.chatbot._normalize_text("Нове підключення"))
+        self.assertEqual(intent, 'connection')
+        intent = self.chatbot._detect_intent(self.chatbot._normalize_text("Потрібен запит"))
+        self.assertEqual(intent, 'document')
+
     def test_search_faq_by_keyword(self):
         response = self.chatbot._search_faq("Мені потрібна інформація про аварію")
         self.assertIn("гарячу лінію 104", response)
@@ -78,6 +104,30 @@ class TestUkrenergoChatbot(unittest.TestCase):
         response = self.chatbot._search_faq("як оплатити рахунок")
         self.assertIn("Приват24", response)
     
+    def test_search_faq_tfidf_matcher(self):
+        with patch('modules.chatbot_module.st'):
+            chatbot = UkrenergoChatbot(faq_file=self.faq_file, faq_matcher='tfidf')
+        response = chatbot._search_faq("як оплачувати рахунки")
+        self.assertIn("Приват24", response)
+    
+    def test_search_faq_semantic_matcher(self):
+        with patch('modules.chatbot_module.st'):
+            chatbot = UkrenergoChatbot(faq_file=self.faq_file, faq_matcher='semantic')
+        # Слова 'відключення' в запиті немає: його заміняє поняття інтенту 'emergency'
+        response = chatbot._search_faq(chatbot._normalize_text("світла немає, що робити"))
+        self.assertIn("гарячу лінію 104", response)
+    
+    def test_spell_correction(self):
+        with patch('modules.chatbot_module.st'):
+            chatbot = UkrenergoChatbot(faq_file=self.faq_file, spell_correction=True)
+        self.assertIsNone(self.chatbot.spell_corrector)
+        
+        # Помилки розпізнавання виправляються за словами FAQ та шаблонами інтентів
+        self.assertEqual(chatbot._normalize_text("Як аплатити рахунак?"), prepare_text("як оплатити рахунок"))
+        self.assertIsNone(self.chatbot._search_faq(self.chatbot._normalize_text("відклюшення")))
+        response = chatbot.process_message("відклюшення")
+        self.assertIn("гарячу лінію 104", response)
+    
     def test_process_message_faq(self):
         response = self.chatbot.process_message("Що робити при відключенні?")
         self.assertIn("гарячу лінію 104", response)
@@ -96,6 +146,206 @@ class TestUkrenergoChatbot(unittest.TestCase):
         self.assertEqual(self.chatbot.stats['total_questions'], 1)
         self.assertEqual(self.chatbot.stats['answered_questions'], 0)
     
+    def test_response_cache_hits(self):
+        self.chatbot.process_message("Як оплатити рахунок?")
+        self.chatbot.process_message("як оплатити   рахунок")
+        
+        cache_stats = self.chatbot.get_statistics()['response_cache']
+        self.assertEqual(cache_stats['misses'], 1)
+        self.assertEqual(cache_stats['hits'], 1)
+    
+    def test_response_cache_draws_intent_response_per_call(self):
+        with patch('modules.chatbot_module.random.choice', side_effect=lambda items: items[-1]):
+            first = self.chatbot.process_message("Привіт")
+        with patch('modules.chatbot_module.random.choice', side_effect=lambda items: items[0]):
+            second = self.chatbot.process_message("Привіт")
+        
+        self.assertNotEqual(first, second)
+        self.assertEqual(self.chatbot.response_cache.hits, 1)
+    
+    def test_response_cache_invalidated_on_faq_change(self):
+        self.assertIn("Приват24", self.chatbot.process_message("як оплатити рахунок"))
+        
+        self._rewrite_faq_answer(0, "Оплата через банк.")
+        self.assertTrue(self.chatbot.reload_faq_if_changed(background=False))
+        
+        self.assertEqual(self.chatbot.process_message("як оплатити рахунок"), "Оплата через банк.")
+    
+    def _rewrite_faq_answer(self, position, answer):
+        """Зміна відповіді у файлі FAQ з гарантовано новим часом зміни"""
+        faq_content = json.loads(json.dumps(FAQ_CONTENT))
+        faq_content['questions'][position]['answer'] = answer
+        with open(self.faq_file, 'w', encoding='utf-8') as f:
+            json.dump(faq_content, f, ensure_ascii=False)
+        stat = os.stat(self.faq_file)
+        os.utime(self.faq_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    
+    def test_reload_faq_unchanged_file(self):
+        self.assertFalse(self.chatbot.reload_faq_if_changed())
+    
+    def test_reload_faq_in_background(self):
+        old_matcher = self.chatbot.faq_matcher
+        self._rewrite_faq_answer(1, "Нова відповідь про відключення.")
+        
+        self.assertTrue(self.chatbot.reload_faq_if_changed())
+        self.chatbot._reload_thread.join()
+        
+        self.assertIsNot(self.chatbot.faq_matcher, old_matcher)
+        self.assertEqual(self.chatbot._search_faq("що робити при відключенні"), "Нова відповідь про відключення.")
+        # Старий знімок лишається цілісним для запитів, що вже виконуються
+        self.assertIn("104", self.chatbot._search_faq("що робити при відключенні", old_matcher))
+    
+    def test_reload_faq_keeps_index_on_broken_file(self):
+        with open(self.faq_file, 'w', encoding='utf-8') as f:
+            f.write('{"questions": [')
+        stat = os.stat(self.faq_file)
+        os.utime(self.faq_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        
+        self.chatbot.reload_faq_if_changed(background=False)
+        self.assertEqual(len(self.chatbot.faq_data['questions']), 2)
+    
+    def test_process_messages_batch(self):
+        batch = self.chatbot.process_messages([
+            "Що робити при відключенні?",
+            "Де переглянути мій рахунок",
+            "Привіт"
+        ])
+        results = batch['results']
+        
+        self.assertEqual(len(results), 3)
+        # Словоформа "відключенні" збігається з ключовим словом "відключення";
+        # збіг за ключовим словом не має оцінки схожості
+        self.assertEqual(results[0]['question_id'], 2)
+        self.assertIsNone(results[0]['score'])
+        self.assertEqual(results[1]['question_id'], 1)
+        self.assertIsNone(results[1]['score'])
+        self.assertEqual(results[2]['intent'], 'greeting')
+        self.assertIsNone(results[2]['question_id'])
+        self.assertIn('faq_search', batch['timings'])
+        
+        # Пакетна обробка не змінює статистику та історію
+        self.assertEqual(self.chatbot.stats['total_questions'], 0)
+        self.assertEqual(self.chatbot.get_conversation_history(), [])
+    
+    def test_process_messages_tfidf_matches_single_queries(self):
+        with patch('modules.chatbot_module.st'):
+            chatbot = UkrenergoChatbot(faq_file=self.faq_file, faq_matcher='tfidf')
+        queries = ["як оплачувати рахунки", "що робити при відключеннях", "яка погода"]
+        
+        results = chatbot.process_messages(queries)['results']
+        for query, result in zip(queries, results):
+            match = chatbot._match_faq(chatbot._normalize_text(query))
+            if match is None:
+                self.assertIsNone(result['score'])
+            else:
+                self.assertEqual(result['question_id'], FAQ_CONTENT['questions'][match[0]]['id'])
+                self.assertAlmostEqual(result['score'], match[1], places=5)
+    
+    def test_process_messages_sequence_matches_single_queries(self):
+        queries = ["як оплачувати рахунки", "як оплачувати рахунки", "рахунок де переглянути", "яка погода"]
+        
+        results = self.chatbot.process_messages(queries)['results']
+        self.assertEqual(len(results), 4)
+        self.assertEqual(results[0], dict(results[1], message=queries[0]))
+        for query, result in zip(queries, results):
+            match = self.chatbot._match_faq(self.chatbot._normalize_text(query))
+            expected_id = FAQ_CONTENT['questions'][match[0]]['id'] if match is not None else None
+            self.assertEqual(result['question_id'], expected_id)
+            self.assertEqual(result['score'], match[1] if match is not None else None)
+    
+    def test_conversation_history_per_user(self):
+        with patch('modules.chatbot_module.st'):
+            chatbot = UkrenergoChatbot(faq_file=self.faq_file, max_history=2)
+            for number in range(3):
+                chatbot.process_message(f"як оплатити рахунок {number}", "first")
+            chatbot.process_message("Привіт", "second")
+
+        history = chatbot.get_conversation_history("first")
+        self.assertEqual([entry['user_message'] for entry in history],
+                         ["як оплатити рахунок 1", "як оплатити рахунок 2"])
+        self.assertEqual(len(chatbot.get_conversation_history("second")), 1)
+    
+    def test_concurrent_sessions_keep_exact_counts(self):
+        def session(user_id):
+            for _ in range(50):
+                self.chatbot.process_message("як оплатити рахунок", user_id)
+        
+        with patch('modules.chatbot_module.st'):
+            threads = [threading.Thread(target=session, args=(f"user-{n}",)) for n in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        
+        self.assertEqual(self.chatbot.stats['total_questions'], 400)
+        self.assertEqual(self.chatbot.get_statistics()['common_questions'], {"як оплатити рахунок": 400})
+        self.assertEqual(len(self.chatbot.get_conversation_history("user-3")), 10)
+    
+    def test_unwritable_chat_log_dir_disables_log(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Каталог журналу неможливо створити: на місці батьківського каталогу файл
+            blocker = os.path.join(directory, 'file')
+            with open(blocker, 'w') as f:
+                f.write('')
+            with patch('modules.chatbot_module.st'), self.assertLogs('modules.chatbot_module', level='WARNING'):
+                chatbot = UkrenergoChatbot(faq_file=self.faq_file,
+                                           chat_log_file=os.path.join(blocker, 'logs', 'chat.jsonl'))
+                self.assertIsNone(chatbot.chat_log)
+                self.assertIn("Приват24", chatbot.process_message("як оплатити рахунок"))
+    
+    def test_failing_stage_hook_does_not_break_response(self):
+        received = []
+        self.chatbot.add_stage_hook(lambda stages: 1 / 0)
+        self.chatbot.add_stage_hook(received.append)
+        
+        with self.assertLogs('modules.chatbot_module', level='ERROR'):
+            response = self.chatbot.process_message("як оплатити рахунок")
+        
+        self.assertTrue(response)
+        # Наступні обробники все одно отримують тривалості
+        self.assertEqual(len(received), 1)
+    
+    def test_intents_are_read_only(self):
+        with self.assertRaises(TypeError):
+            self.chatbot.intents['greeting'] = {}
+    
+    def test_stage_timings(self):
+        received = []
+        self.chatbot.add_stage_hook(received.append)
+        
+        self.chatbot.process_message("як оплатити рахунок")
+        self.chatbot.process_message("як оплатити рахунок")
+        
+        self.assertEqual(len(received), 2)
+        self.assertIn('faq_search', received[0])
+        # Повторний запит береться з кешу без пошуку
+        self.assertNotIn('faq_search', received[1])
+        self.assertGreaterEqual(received[0]['total'], sum(
+            duration for stage, duration in received[0].items() if stage != 'total'
+        ))
+        
+        stages = self.chatbot.get_statistics()['stages']
+        self.assertEqual(stages['normalization']['count'], 2)
+        self.assertEqual(stages['intent_detection']['count'], 1)
+        self.assertGreater(stages['total']['p50'], 0)
+    
+    def test_chat_log_file(self):
+        log_file = "test_chat_logs.jsonl"
+        with patch('modules.chatbot_module.st'):
+            chatbot = UkrenergoChatbot(faq_file=self.faq_file, chat_log_file=log_file)
+            chatbot.process_message("як оплатити рахунок", "user")
+        chatbot.chat_log.close()
+        
+        try:
+            with open(log_file, 'r', encoding='utf-8') as f:
+                records = [json.loads(line) for line in f]
+        finally:
+            os.remove(log_file)
+        
+        self.assertEqual([record['type'] for record in records], ['request', 'history'])
+        self.assertEqual(records[1]['user_id'], "user")
+        self.assertEqual(chatbot.get_statistics()['chat_log']['written'], 2)
+    
     def test_get_statistics(self):
         self.chatbot.process_message("Привіт")
         self.chatbot.process_message("як оплатити рахунок")
@@ -108,5 +358,16 @@ class TestUkrenergoChatbot(unittest.TestCase):
         self.assertGreater(stats['avg_response_time'], 0)
         self.assertIn('привіт', stats['common_questions'])
 
+    def test_get_statistics_response_time_percentiles(self):
+        for _ in range(5):
+            self.chatbot.process_message("як оплатити рахунок")
+
+        response_time = self.chatbot.get_statistics()['response_time']
+        self.assertEqual(response_time['count'], 5)
+        self.assertGreater(response_time['p50'], 0)
+        self.assertLessEqual(response_time['p50'], response_time['p90'])
+        self.assertLessEqual(response_time['p99'], response_time['max'])
+        self.assertIn('p99', self.chatbot.generate_daily_report())
+
 if __name__ == '__main__':
     unittest.main()
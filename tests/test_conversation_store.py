@@ -0,0 +1,118 @@
+"""
+Тести для модулю conversation_store.py
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+
+from modules.conversation_store import ConversationStore
+
+
+def make_entry(number: int) -> dict:
+    return {'timestamp': datetime(2024, 1, 1, 12, 0, number), 'user_message': f"питання {number}"}
+
+
+class TestConversationStore(unittest.TestCase):
+
+    def setUp(self):
+        self.spill_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.spill_dir)
+
+    def messages(self, entries):
+        return [entry['user_message'] for entry in entries]
+
+    def test_bounded_without_spill(self):
+        store = ConversationStore(max_history=3)
+        for number in range(10):
+            store.append('user', make_entry(number))
+
+        self.assertEqual(len(store), 3)
+        self.assertEqual(self.messages(store.get_history('user')), ["питання 7", "питання 8", "питання 9"])
+
+    def test_users_are_separate(self):
+        store = ConversationStore(max_history=3)
+        store.append('first', make_entry(1))
+        store.append('second', make_entry(2))
+
+        self.assertEqual(self.messages(store.get_history('first')), ["питання 1"])
+        self.assertEqual(self.messages(store.get_history('second')), ["питання 2"])
+        self.assertEqual(store.get_history('unknown'), [])
+
+    def test_spill_keeps_full_history(self):
+        store = ConversationStore(max_history=3, spill_dir=self.spill_dir)
+        for number in range(10):
+            store.append('user', make_entry(number))
+
+        self.assertEqual(len(store), 3)
+        history = store.get_history('user')
+        self.assertEqual(self.messages(history), [f"питання {number}" for number in range(10)])
+        self.assertEqual(history[0]['timestamp'], datetime(2024, 1, 1, 12, 0, 0))
+
+    def test_paging(self):
+        store = ConversationStore(max_history=3, spill_dir=self.spill_dir)
+        for number in range(10):
+            store.append('user', make_entry(number))
+
+        self.assertEqual(self.messages(store.get_history('user', offset=5, limit=3)),
+                         ["питання 5", "питання 6", "питання 7"])
+        self.assertEqual(self.messages(store.get_history('user', offset=8)), ["питання 8", "питання 9"])
+
+    def test_inactive_users_are_evicted_to_disk(self):
+        store = ConversationStore(max_history=3, spill_dir=self.spill_dir, max_users=2, stripes=1)
+        for user in ('first', 'second', 'third'):
+            store.append(user, make_entry(1))
+
+        self.assertEqual(store.get_recent('first'), [])
+        self.assertEqual(self.messages(store.get_history('first')), ["питання 1"])
+
+    def test_history_snapshot_is_consistent(self):
+        store = ConversationStore(max_history=2, spill_dir=self.spill_dir)
+        for number in range(4):
+            store.append('user', make_entry(number))
+
+        history = store.iter_history('user')
+        store.append('user', make_entry(4))
+        self.assertEqual(self.messages(history), ["питання 0", "питання 1", "питання 2", "питання 3"])
+
+    def test_spill_is_written_in_background(self):
+        store = ConversationStore(max_history=2, spill_dir=self.spill_dir)
+        # Фоновий потік чекає дозволу: запит не повинен чекати на запис
+        release = threading.Event()
+        write_spilled = store._write_spilled
+        store._write_spilled = lambda user_id: (release.wait(5), write_spilled(user_id))
+
+        for number in range(5):
+            store.append('user', make_entry(number))
+        self.assertEqual(os.listdir(self.spill_dir), [])
+        # Репліки з черги вивантаження вже видно в історії
+        self.assertEqual(self.messages(store.get_history('user')), [f"питання {number}" for number in range(5)])
+
+        release.set()
+        store.flush()
+        self.assertEqual(store.stats['spilled'], 3)
+        self.assertEqual(len(os.listdir(self.spill_dir)), 1)
+        self.assertEqual(self.messages(store.get_history('user')), [f"питання {number}" for number in range(5)])
+        store.close()
+
+    def test_spill_errors_do_not_stop_writer(self):
+        store = ConversationStore(max_history=1, spill_dir=os.path.join(self.spill_dir, 'file'))
+        # Каталог вивантаження неможливо створити: на його місці файл
+        with open(os.path.join(self.spill_dir, 'file'), 'w') as f:
+            f.write('')
+        store.append('user', make_entry(1))
+        store.append('user', make_entry(2))
+        store.flush()
+
+        self.assertEqual(store.stats['errors'], 1)
+        self.assertEqual(self.messages(store.get_history('user')), ["питання 2"])
+        store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
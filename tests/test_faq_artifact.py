@@ -0,0 +1,88 @@
+"""
+Тести для модулю faq_artifact.py
+"""
+
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from modules.aho_corasick import FlatAhoCorasick
+from modules.chatbot_module import UkrenergoChatbot
+from modules.faq_artifact import QuestionTable, compile_faq, load_faq_artifact, main
+from modules.faq_index import FaqIndex
+from modules.faq_matchers import TfidfFaqMatcher
+from modules.text_processing import prepare_text
+from tests.test_faq_index import FAQ_CONTENT
+
+
+class TestFaqArtifact(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.artifact_path = os.path.join(self.directory.name, 'faq.faqidx')
+        compile_faq(FAQ_CONTENT, self.artifact_path)
+        self.index = load_faq_artifact(self.artifact_path)
+        self.reference = FaqIndex(FAQ_CONTENT)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip_tables(self):
+        self.assertEqual(self.index.version, self.reference.version)
+        self.assertEqual(list(self.index.normalized_questions), self.reference.normalized_questions)
+        self.assertEqual(list(self.index.questions), FAQ_CONTENT['questions'])
+        self.assertEqual(dict(self.index.token_index), self.reference.token_index)
+        self.assertEqual(dict(self.index.keyword_index), self.reference.keyword_index)
+
+    def test_lookups_match_json_index(self):
+        for query in ("де мій рахунок", "у нас світла немає", "як передати показання", "погода"):
+            self.assertEqual(self.index.find_keyword_match(query), self.reference.find_keyword_match(query))
+            self.assertEqual(self.index.candidates(query), self.reference.candidates(query))
+
+    def test_keyword_automaton_is_memory_mapped(self):
+        automaton = self.index._get_keyword_automaton()
+        self.assertIsInstance(automaton, FlatAhoCorasick)
+        for query in ("у нас аварія і відключення", "рахунок за світло", "погода"):
+            query = prepare_text(query)
+            self.assertEqual(list(automaton.iter_matches(query)),
+                             list(self.reference._get_keyword_automaton().iter_matches(query)))
+
+    def test_tfidf_uses_precomputed_arrays(self):
+        matcher = TfidfFaqMatcher(self.index)
+        reference = TfidfFaqMatcher(self.reference)
+        self.assertIs(matcher.data, self.index.precomputed['tfidf']['data'])
+        self.assertEqual(matcher.match("як оплачувати рахунки"), reference.match("як оплачувати рахунки"))
+
+    def test_vocabulary_is_precomputed(self):
+        self.assertIn('vocabulary', self.index.precomputed)
+        with patch.object(QuestionTable, '__getitem__', side_effect=AssertionError("записи питань не декодуються")):
+            vocabulary = self.index.vocabulary()
+        self.assertEqual(vocabulary, self.reference.vocabulary())
+
+    def test_chatbot_loads_artifact(self):
+        with patch('modules.chatbot_module.st'):
+            chatbot = UkrenergoChatbot(faq_file=self.artifact_path)
+        self.assertEqual(len(chatbot.faq_data['questions']), 3)
+        self.assertEqual(chatbot._search_faq("як оплатити рахунок"), "Через Приват24.")
+
+    def test_invalid_file(self):
+        invalid_path = os.path.join(self.directory.name, 'invalid.faqidx')
+        with open(invalid_path, 'wb') as f:
+            f.write(b'not an artifact')
+        with self.assertRaises(ValueError):
+            load_faq_artifact(invalid_path)
+
+    def test_command_line(self):
+        faq_path = os.path.join(self.directory.name, 'faq.json')
+        with open(faq_path, 'w', encoding='utf-8') as f:
+            json.dump(FAQ_CONTENT, f, ensure_ascii=False)
+
+        with patch('sys.argv', ['faq_artifact', faq_path]), patch('builtins.print'):
+            main()
+        self.assertEqual(len(load_faq_artifact(os.path.join(self.directory.name, 'faq.faqidx'))), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Тести для модулю faq_index.py
+"""
+
+import unittest
+from modules.faq_index import FaqIndex
+from modules.text_processing import prepare_text
+
+FAQ_CONTENT = {
+    "categories": {},
+    "questions": [
+        {
+            "id": 1,
+            "question": "Як оплатити рахунок?",
+            "answer": "Через Приват24.",
+            "keywords": ["оплата", "рахунок"]
+        },
+        {
+            "id": 2,
+            "question": "Що робити при відключенні?",
+            "answer": "Телефонуйте 104.",
+            "keywords": ["відключення", "аварія", "світла немає"]
+        },
+        {
+            "id": 3,
+            "question": "Як передати показники лічильника?",
+            "answer": "Через особистий кабінет.",
+            "keywords": ["рахунок"]
+        }
+    ]
+}
+
+
+class TestFaqIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = FaqIndex(FAQ_CONTENT)
+
+    def test_normalized_questions(self):
+        self.assertEqual(len(self.index), 3)
+        self.assertEqual(self.index.normalized_questions[0], "як оплат рахунк")
+
+    def test_keyword_match_returns_first_in_faq_order(self):
+        self.assertEqual(self.index.find_keyword_match(prepare_text("де мій рахунок")), 0)
+
+    def test_multiword_keyword_match(self):
+        self.assertEqual(self.index.find_keyword_match(prepare_text("у нас світла немає")), 1)
+
+    def test_keyword_match_inside_word(self):
+        self.assertEqual(self.index.find_keyword_match(prepare_text("передоплата")), 0)
+
+    def test_keyword_match_prefers_more_keywords(self):
+        index = FaqIndex({"questions": [
+            {"question": "Рахунок", "answer": "a", "keywords": ["рахунок"]},
+            {"question": "Оплата рахунку", "answer": "b", "keywords": ["рахунок", "оплата"]},
+        ]})
+        self.assertEqual(index.find_keyword_match(prepare_text("оплата за рахунок")), 1)
+
+    def test_keyword_match_prefers_specific_keywords(self):
+        index = FaqIndex({"questions": [
+            {"question": "Загальне", "answer": "a", "keywords": ["світло"]},
+            {"question": "Інше", "answer": "b", "keywords": ["світло"]},
+            {"question": "Графік", "answer": "c", "keywords": ["графік"]},
+        ]})
+        # "графік" трапляється рідше, тому специфічніше за "світло"
+        self.assertEqual(index.keyword_matches(prepare_text("графік світло"))[0][0], 2)
+        self.assertEqual([position for position, _, _ in index.keyword_matches(prepare_text("світло"))], [0, 1])
+
+    def test_keywords_are_normalized(self):
+        index = FaqIndex({"questions": [
+            {"question": "Тарифи", "answer": "a", "keywords": ["Тариф, кВт"]},
+        ]})
+        self.assertEqual(index.find_keyword_match(prepare_text("який тариф квт")), 0)
+
+    def test_no_keyword_match(self):
+        self.assertIsNone(self.index.find_keyword_match(prepare_text("яка погода")))
+
+    def test_candidates_share_tokens(self):
+        self.assertEqual(self.index.candidates(prepare_text("як передати показання")), [0, 2])
+        self.assertEqual(self.index.candidates(prepare_text("погода")), [])
+
+    def test_candidates_limit(self):
+        self.assertEqual(self.index.candidates(prepare_text("як передати показання"), limit=1), [2])
+
+
+if __name__ == '__main__':
+    unittest.main()
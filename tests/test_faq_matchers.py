@@ -0,0 +1,85 @@
+"""
+Тести для модулю faq_matchers.py
+"""
+
+import unittest
+from modules.faq_index import FaqIndex
+from modules.faq_matchers import (
+    SequenceFaqMatcher, TfidfFaqMatcher, char_ngrams, create_faq_matcher
+)
+from modules.text_processing import prepare_text
+from tests.test_faq_index import FAQ_CONTENT
+
+
+class TestSequenceFaqMatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.matcher = SequenceFaqMatcher(FaqIndex(FAQ_CONTENT))
+
+    def test_match_exact_question(self):
+        position, score = self.matcher.match(prepare_text("як оплатити рахунок"))
+        self.assertEqual(position, 0)
+        self.assertAlmostEqual(score, 1.0)
+
+    def test_match_below_threshold(self):
+        self.assertIsNone(self.matcher.match(prepare_text("як справи")))
+
+
+class TestTfidfFaqMatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.matcher = TfidfFaqMatcher(FaqIndex(FAQ_CONTENT))
+
+    def test_char_ngrams(self):
+        self.assertEqual(char_ngrams("як"), [" як", "як "])
+
+    def test_exact_question_scores_one(self):
+        position, score = self.matcher.match(prepare_text("як оплатити рахунок"))
+        self.assertEqual(position, 0)
+        self.assertAlmostEqual(score, 1.0, places=5)
+
+    def test_inflected_query(self):
+        position, _ = self.matcher.match(prepare_text("як оплачувати рахунки"))
+        self.assertEqual(position, 0)
+
+    def test_top_k_sorted(self):
+        results = self.matcher.top_k(prepare_text("як передати показники"), k=3)
+        self.assertEqual(results[0][0], 2)
+        scores = [score for _, score in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_unknown_query(self):
+        self.assertEqual(self.matcher.top_k(prepare_text("жук")), [])
+        self.assertIsNone(self.matcher.match(prepare_text("яка погода")))
+
+    def test_empty_faq(self):
+        matcher = TfidfFaqMatcher(FaqIndex({'questions': []}))
+        self.assertEqual(matcher.top_k(prepare_text("як оплатити")), [])
+
+    def test_unknown_matcher_name(self):
+        with self.assertRaises(ValueError):
+            create_faq_matcher("bm25", FaqIndex(FAQ_CONTENT))
+
+
+class TestSemanticFaqMatcher(unittest.TestCase):
+
+    def setUp(self):
+        concepts = [(prepare_text("відключення"), 'emergency'), (prepare_text("світла немає"), 'emergency')]
+        self.matcher = create_faq_matcher('semantic', FaqIndex(FAQ_CONTENT), concepts=concepts)
+
+    def test_exact_question_scores_one(self):
+        position, score = self.matcher.match(prepare_text("як оплатити рахунок"))
+        self.assertEqual(position, 0)
+        self.assertAlmostEqual(score, 1.0, places=5)
+
+    def test_paraphrase_by_concept(self):
+        position, _ = self.matcher.match(prepare_text("світла нема що робити"))
+        self.assertEqual(position, 1)
+
+    def test_unknown_query(self):
+        self.assertEqual(self.matcher.top_k(""), [])
+        self.assertIsNone(self.matcher.match(prepare_text("яка погода")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Тести для модулю faq_sharding.py
+"""
+
+import unittest
+from modules.faq_index import FaqIndex
+from modules.faq_matchers import SequenceFaqMatcher
+from modules.faq_sharding import ShardedFaqMatcher
+from modules.text_processing import prepare_text
+from tests.test_faq_index import FAQ_CONTENT
+
+
+class TestShardedFaqMatcher(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Схожі питання в різних частинах, щоб перевірити об'єднання результатів
+        questions = [
+            dict(question, question=f"{question['question']} {suffix}")
+            for suffix in ("вдень", "вночі", "у місті", "у селі", "взимку")
+            for question in FAQ_CONTENT['questions'] * 3
+        ]
+        cls.index = FaqIndex({'questions': questions})
+        cls.matcher = ShardedFaqMatcher(cls.index, 'sequence', workers=3)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.matcher.close()
+
+    def test_shards_cover_faq(self):
+        self.assertEqual(self.matcher.offsets, [0, 15, 30])
+        self.assertEqual(sum(self.matcher.shard_sizes), len(self.index))
+
+    def test_same_results_as_single_process(self):
+        single = SequenceFaqMatcher(self.index)
+        queries = [
+            prepare_text(f"{question['question']} {suffix}")
+            for question in FAQ_CONTENT['questions']
+            for suffix in ("вночі", "у селі", "влітку")
+        ]
+
+        self.assertEqual(self.matcher.match_batch(queries), single.match_batch(queries))
+        for query in queries[:5]:
+            self.assertEqual(self.matcher.top_k(query, k=3), single.top_k(query, k=3))
+
+    def test_candidates_selected_over_whole_faq(self):
+        # Слова запиту є в 45 питаннях останньої частини: за всім FAQ (600 питань)
+        # це не стоп-слова, а за частиною з 200 питань - стоп-слова
+        questions = [{'question': f"загальне питання {number}", 'answer': ''} for number in range(400)]
+        questions += [{'question': "тарифи на опалення взимку", 'answer': ''} for _ in range(45)]
+        questions += [{'question': f"інше питання {number}", 'answer': ''} for number in range(155)]
+        index = FaqIndex({'questions': questions})
+        query = prepare_text("тарифи на опалення взимку")
+
+        matcher = ShardedFaqMatcher(index, 'sequence', workers=3)
+        try:
+            self.assertEqual(matcher.match(query), (400, 1.0))
+            self.assertEqual(matcher.match(query), SequenceFaqMatcher(index).match(query))
+            self.assertEqual(matcher.top_k(query, k=2), SequenceFaqMatcher(index).top_k(query, k=2))
+        finally:
+            matcher.close()
+
+    def test_workers_limited_by_faq_size(self):
+        matcher = ShardedFaqMatcher(FaqIndex(FAQ_CONTENT), 'tfidf', workers=16)
+        try:
+            self.assertEqual(matcher.workers, len(FAQ_CONTENT['questions']))
+            position, _ = matcher.match(prepare_text("як оплатити рахунок"))
+            self.assertEqual(position, 0)
+        finally:
+            matcher.close()
+
+    def test_unknown_matcher_name(self):
+        with self.assertRaises(ValueError):
+            ShardedFaqMatcher(self.index, 'unknown', workers=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
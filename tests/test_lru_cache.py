@@ -0,0 +1,123 @@
+"""
+Тести для модулю lru_cache.py
+"""
+
+import unittest
+from modules.lru_cache import LRUCache, SizedLRUCache, StripedLRUCache
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_get_put_and_counters(self):
+        cache = LRUCache(maxsize=2)
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+
+        stats = cache.get_statistics()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hit_rate'], 50)
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_zero_size_disables_cache(self):
+        cache = LRUCache(maxsize=0)
+        cache.put('a', 1)
+        self.assertEqual(len(cache), 0)
+
+    def test_clear(self):
+        cache = LRUCache()
+        cache.put('a', 1)
+        cache.clear()
+        self.assertNotIn('a', cache)
+
+
+
+class TestSizedLRUCache(unittest.TestCase):
+
+    def test_evicts_by_total_size(self):
+        cache = SizedLRUCache(max_bytes=10)
+        cache.put('a', b'aaaa')
+        cache.put('b', b'bbbb')
+        cache.get('a')
+        cache.put('c', b'cccc')
+
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(cache.bytes, 8)
+
+    def test_replacing_value_updates_size(self):
+        cache = SizedLRUCache(max_bytes=10)
+        cache.put('a', b'aaaa')
+        cache.put('a', b'aa')
+        self.assertEqual(cache.bytes, 2)
+
+    def test_value_above_budget_is_not_cached(self):
+        cache = SizedLRUCache(max_bytes=4)
+        cache.put('a', b'aaa')
+        cache.put('b', b'bbbbb')
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+
+    def test_bytes_saved(self):
+        cache = SizedLRUCache(max_bytes=100)
+        cache.put('a', b'aaaa')
+        cache.get('a')
+        cache.get('a')
+        cache.get('missing')
+
+        stats = cache.get_statistics()
+        self.assertEqual(stats['bytes_saved'], 8)
+        self.assertEqual(stats['bytes'], 4)
+        self.assertAlmostEqual(stats['hit_rate'], 200 / 3)
+
+
+class TestStripedLRUCache(unittest.TestCase):
+
+    def test_get_put_and_counters(self):
+        cache = StripedLRUCache(maxsize=64, stripes=4)
+        self.assertIsNone(cache.get('a'))
+        cache.put('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIn('a', cache)
+
+        stats = cache.get_statistics()
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (1, 1, 1))
+
+    def test_bounded_by_maxsize(self):
+        cache = StripedLRUCache(maxsize=16, stripes=4)
+        for key in range(100):
+            cache.put(key, key)
+        self.assertLessEqual(len(cache), 16)
+        # Останній записаний ключ не витісняється
+        self.assertEqual(cache.get(99), 99)
+
+    def test_keys_use_separate_locks(self):
+        cache = StripedLRUCache(maxsize=64, stripes=4)
+        stripe = cache._stripe('a')
+        with stripe._lock:
+            # Ключ іншої смуги доступний, поки смуга 'a' заблокована
+            other = next(key for key in range(100) if cache._stripe(key) is not stripe)
+            cache.put(other, 1)
+            self.assertEqual(cache.get(other), 1)
+
+    def test_zero_size_disables_cache(self):
+        cache = StripedLRUCache(maxsize=0)
+        cache.put('a', 1)
+        self.assertEqual(len(cache), 0)
+        cache.clear()
+
+
+if __name__ == '__main__':
+    unittest.main()
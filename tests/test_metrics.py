@@ -0,0 +1,131 @@
+"""
+Тести для модулю metrics.py
+"""
+
+import random
+import threading
+import unittest
+from collections import Counter
+from modules.metrics import (
+    HISTOGRAM_BUCKETS_PER_OCTAVE, LatencyHistogram, SpaceSaving, StripedRequestStats, merge_top
+)
+
+
+class TestLatencyHistogram(unittest.TestCase):
+
+    def test_empty(self):
+        stats = LatencyHistogram().get_statistics()
+        self.assertEqual(stats['count'], 0)
+        self.assertEqual(stats['p99'], 0.0)
+        self.assertEqual(stats['mean'], 0.0)
+
+    def test_percentiles_within_bucket_error(self):
+        rng = random.Random(7)
+        values = [rng.lognormvariate(-4, 1) for _ in range(5000)]
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        values.sort()
+        relative_error = 2.0 ** (1.0 / HISTOGRAM_BUCKETS_PER_OCTAVE)
+        for percent in (50, 90, 99):
+            exact = values[int(len(values) * percent / 100) - 1]
+            estimate = histogram.percentile(percent)
+            self.assertGreaterEqual(estimate * relative_error, exact)
+            self.assertLessEqual(estimate, exact * relative_error)
+
+        self.assertEqual(histogram.max, values[-1])
+        self.assertAlmostEqual(histogram.mean, sum(values) / len(values))
+
+    def test_fixed_memory(self):
+        histogram = LatencyHistogram()
+        bucket_count = len(histogram.counts)
+        for value in (0.0, 1e-9, 0.5, 1e6):
+            histogram.record(value)
+        self.assertEqual(len(histogram.counts), bucket_count)
+        self.assertEqual(histogram.percentile(100), 1e6)
+
+    def test_merge(self):
+        first, second = LatencyHistogram(), LatencyHistogram()
+        first.record(0.01)
+        second.record(0.02)
+        first.merge(second)
+        self.assertEqual(first.count, 2)
+        self.assertEqual(first.max, 0.02)
+
+        with self.assertRaises(ValueError):
+            first.merge(LatencyHistogram(buckets_per_octave=4))
+
+
+class TestSpaceSaving(unittest.TestCase):
+
+    def test_exact_below_capacity(self):
+        counter = SpaceSaving(capacity=10)
+        for item in "абвабаа":
+            counter.add(item)
+        self.assertEqual(counter.top(2), [("а", 4, 0), ("б", 2, 0)])
+        self.assertEqual(counter.max_error, 0)
+
+    def test_bounded_with_error_guarantees(self):
+        rng = random.Random(3)
+        counter = SpaceSaving(capacity=20)
+        exact = Counter()
+        for _ in range(5000):
+            # Кілька популярних запитів серед довгого хвоста унікальних
+            item = rng.choice("абвг") if rng.random() < 0.5 else rng.randrange(100000)
+            counter.add(item)
+            exact[item] += 1
+
+        self.assertEqual(len(counter), 20)
+        self.assertEqual(counter.total, 5000)
+        top = counter.top(4)
+        self.assertEqual({item for item, _, _ in top}, set("абвг"))
+        for item, count, error in counter.top(20):
+            self.assertLessEqual(count - error, exact[item])
+            self.assertGreaterEqual(count, exact[item])
+        self.assertLessEqual(counter.max_error, counter.total / counter.capacity)
+
+    def test_invalid_capacity(self):
+        with self.assertRaises(ValueError):
+            SpaceSaving(capacity=0)
+
+
+    def test_merge_top_keeps_error_bounds(self):
+        rng = random.Random(5)
+        summaries = [SpaceSaving(capacity=10) for _ in range(3)]
+        exact = Counter()
+        for _ in range(3000):
+            item = rng.choice("абв") if rng.random() < 0.4 else rng.randrange(1000)
+            rng.choice(summaries).add(item)
+            exact[item] += 1
+
+        merged = merge_top(summaries, 5)
+        self.assertEqual({item for item, _, _ in merged[:3]}, set("абв"))
+        for item, count, error in merged:
+            self.assertLessEqual(count - error, exact[item])
+            self.assertGreaterEqual(count, exact[item])
+
+
+class TestStripedRequestStats(unittest.TestCase):
+
+    def test_concurrent_updates_are_not_lost(self):
+        stats = StripedRequestStats(stripes=4)
+
+        def worker():
+            for number in range(500):
+                stats.record("питання", number % 2 == 0, 0.001)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(stats.total_questions, 4000)
+        self.assertEqual(stats.answered_questions, 2000)
+        self.assertEqual(stats.response_times().count, 4000)
+        self.assertEqual(stats.common_questions(1), [("питання", 4000, 0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
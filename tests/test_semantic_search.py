@@ -0,0 +1,77 @@
+"""
+Тести для модулю semantic_search.py
+"""
+
+import unittest
+
+import numpy as np
+
+from modules.semantic_search import HashingEmbedder, RandomProjectionLSH, signature_bits
+from modules.text_processing import prepare_text
+
+CONCEPTS = [
+    (prepare_text("відключення"), 'emergency'),
+    (prepare_text("світла немає"), 'emergency'),
+]
+
+
+class TestHashingEmbedder(unittest.TestCase):
+
+    def setUp(self):
+        self.embedder = HashingEmbedder(concepts=CONCEPTS)
+
+    def test_unit_vector(self):
+        vector = self.embedder.embed(prepare_text("як оплатити рахунок"))
+        self.assertAlmostEqual(float(np.dot(vector, vector)), 1.0, places=5)
+
+    def test_empty_text(self):
+        self.assertFalse(self.embedder.embed("").any())
+
+    def test_concepts_bring_paraphrases_closer(self):
+        question = self.embedder.embed(prepare_text("відключення електроенергії"))
+        paraphrase = self.embedder.embed(prepare_text("світла нема"))
+        unrelated = self.embedder.embed(prepare_text("тарифи для населення"))
+
+        self.assertIn('c:emergency', self.embedder.features(prepare_text("світла нема")))
+        self.assertGreater(np.dot(question, paraphrase), 0.3)
+        self.assertGreater(np.dot(question, paraphrase), np.dot(question, unrelated))
+
+    def test_fit_downweights_common_words(self):
+        texts = [prepare_text(text) for text in ("як оплатити", "як передати", "як підключити")]
+        self.embedder.fit(texts)
+
+        common = self.embedder.embed(prepare_text("як"))
+        rare = self.embedder.embed(prepare_text("оплатити"))
+        vector = self.embedder.embed(prepare_text("як оплатити"))
+        self.assertGreater(np.dot(vector, rare), np.dot(vector, common))
+
+
+class TestRandomProjectionLSH(unittest.TestCase):
+
+    def test_signature_bits(self):
+        self.assertEqual(signature_bits(10), 0)
+        self.assertEqual(signature_bits(64, bucket_size=32), 1)
+        self.assertEqual(signature_bits(10 ** 9), 12)
+
+    def test_single_bucket_returns_all(self):
+        lsh = RandomProjectionLSH(dim=8, bits=0)
+        lsh.add(np.eye(8, dtype=np.float32)[:5])
+        self.assertEqual(lsh.query(np.ones(8, dtype=np.float32)).tolist(), [0, 1, 2, 3, 4])
+
+    def test_finds_itself(self):
+        rng = np.random.default_rng(1)
+        vectors = rng.standard_normal((2000, 32)).astype(np.float32)
+        lsh = RandomProjectionLSH(dim=32, bits=signature_bits(len(vectors)))
+        lsh.add(vectors[:1000])
+        lsh.add(vectors[1000:])
+
+        self.assertEqual(len(lsh), 2000)
+        for position in (0, 999, 1000, 1999):
+            candidates = lsh.query(vectors[position])
+            self.assertIn(position, candidates)
+            # Переглядається лише частина колекції
+            self.assertLess(len(candidates), len(vectors))
+
+
+if __name__ == '__main__':
+    unittest.main()
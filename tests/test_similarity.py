@@ -0,0 +1,108 @@
+"""
+Тести для модулю similarity.py
+"""
+
+import pickle
+import random
+import threading
+import unittest
+from modules.similarity import DifflibSimilarity, SimilarityBackend
+
+
+class TestDifflibSimilarity(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = DifflibSimilarity()
+
+    def test_same_result_as_full_comparison(self):
+        rng = random.Random(0)
+        alphabet = 'абвгдеєжзиі '
+        reference = SimilarityBackend()
+
+        for _ in range(200):
+            query = ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 20)))
+            candidates = [
+                (position, ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 30))))
+                for position in range(20)
+            ]
+            for threshold in (0.3, 0.6, 0.7):
+                self.assertEqual(
+                    self.backend.best_match(query, candidates, threshold),
+                    reference.best_match(query, candidates, threshold)
+                )
+
+    def test_batch_matches_single_queries(self):
+        rng = random.Random(1)
+        # Мала абетка дає багато рівних оцінок: перемагати має раніший кандидат
+        alphabet = 'абв '
+        queries, candidate_lists = [], []
+        for _ in range(300):
+            queries.append(''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 8))))
+            candidate_lists.append([
+                (position, ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 8))))
+                for position in range(rng.randint(0, 12))
+            ])
+
+        for threshold in (0.0, 0.3, 0.7):
+            self.assertEqual(
+                self.backend.best_match_batch(queries, candidate_lists, threshold),
+                [self.backend.best_match(query, pairs, threshold)
+                 for query, pairs in zip(queries, candidate_lists)]
+            )
+
+    def test_batch_skips_candidates_below_found_score(self):
+        candidates = [(1, "тариф"), (2, "тарифи"), (3, "дуже довгий текст")]
+        self.assertEqual(self.backend.best_match_batch(["тариф"], [candidates], 0.6), [(1, 1.0)])
+        # Після точного збігу інші кандидати не порівнюються
+        self.assertEqual(self.backend.stats['compared'], 1)
+        self.assertEqual(self.backend.stats['pruned_by_length'] + self.backend.stats['pruned_by_chars'], 2)
+
+    def test_prunes_by_length(self):
+        match = self.backend.best_match("привіт", [(1, "дуже довгий текст без збігів")], 0.6)
+        self.assertIsNone(match)
+        self.assertEqual(self.backend.stats['pruned_by_length'], 1)
+        self.assertEqual(self.backend.stats['compared'], 0)
+
+    def test_prunes_by_chars(self):
+        match = self.backend.best_match("абвгд", [(1, "єжзий")], 0.6)
+        self.assertIsNone(match)
+        self.assertEqual(self.backend.stats['pruned_by_chars'], 1)
+
+    def test_counters_are_exact_across_threads(self):
+        def session():
+            for _ in range(1000):
+                self.backend.best_match("тариф", [(1, "тариф"), (2, "дуже довгий текст")], 0.6)
+
+        threads = [threading.Thread(target=session) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.backend.stats, {'compared': 8000, 'pruned_by_length': 8000, 'pruned_by_chars': 0})
+
+    def test_stripes_do_not_grow_with_threads(self):
+        threads = [threading.Thread(target=self.backend.best_match, args=("тариф", [(1, "тариф")], 0.6))
+                   for _ in range(50)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.backend._stripes), 8)
+        self.assertEqual(self.backend.stats['compared'], 50)
+
+    def test_pickles_without_counters(self):
+        self.backend.best_match("тариф", [(1, "тариф")], 0.6)
+        restored = pickle.loads(pickle.dumps(self.backend))
+        self.assertEqual(restored.stats['compared'], 0)
+        self.assertEqual(restored.best_match("тариф", [(1, "тариф")], 0.6), (1, 1.0))
+        self.assertEqual(restored.stats['compared'], 1)
+
+    def test_first_candidate_wins_ties(self):
+        match = self.backend.best_match("тариф", [('a', "тариф"), ('b', "тариф")], 0.6)
+        self.assertEqual(match, ('a', 1.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,9 +2,16 @@
 Тести для модулю speech_module.py
 """
 
+import errno
+import os
+import tempfile
+import threading
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
-from modules.speech_module import UkrenergoSpeechModule
+from modules import speech_module
+from modules.speech_module import SynthesisError, UkrenergoSpeechModule
 
 # Мокуємо залежності, які вимагають зовнішніх ресурсів
 class MockSpeechConfig:
@@ -50,6 +57,8 @@ class MockSpeechSDK:
     SpeechSynthesizer = MockSpeechSynthesizer
     SpeechRecognizer = MockSpeechRecognizer
     AudioConfig = MagicMock()
+    SpeechSynthesisOutputFormat = MagicMock()
+    Connection = MagicMock()
     ResultReason = MagicMock(
         SynthesizingAudioCompleted=8,
         RecognizedSpeech=1,
@@ -72,7 +81,135 @@ class TestUkrenergoSpeechModule(unittest.TestCase):
         audio_data = self.module.text_to_speech("Привіт")
         self.assertEqual(audio_data, b'mock_audio_data')
         self.assertEqual(self.module.usage_stats['tts_requests'], 1)
-        self.assertIn('Привіт', self.module.audio_cache)
+        self.assertEqual(len(self.module.audio_cache), 1)
+    
+    def test_text_to_speech_cache_key_is_canonical(self):
+        self.module.text_to_speech("Привіт,  як справи?")
+        # Регістр і пробіли не впливають на ключ, голос і просодія - впливають
+        self.assertEqual(self.module.text_to_speech(" привіт, як   справи? "), b'mock_audio_data')
+        self.assertEqual(self.module.usage_stats['tts_requests'], 1)
+        self.module.text_to_speech("Привіт, як справи?", rate=10)
+        self.assertEqual(self.module.usage_stats['tts_requests'], 2)
+        
+        stats = self.module.get_usage_statistics()
+        self.assertEqual(stats['audio_cache_entries'], 2)
+        self.assertEqual(stats['audio_cache_bytes'], 2 * len(b'mock_audio_data'))
+        self.assertEqual(stats['audio_cache_bytes_saved'], len(b'mock_audio_data'))
+        self.assertAlmostEqual(stats['audio_cache_hit_rate'], 100 / 3)
+    
+    def test_audio_cache_byte_budget(self):
+        module = UkrenergoSpeechModule(speech_key="test_key", region="test_region",
+                                       audio_cache_bytes=2 * len(b'mock_audio_data'))
+        for text in ("перше", "друге", "третє"):
+            module.text_to_speech(text)
+        self.assertEqual(len(module.audio_cache), 2)
+        self.assertLessEqual(module.audio_cache.bytes, module.audio_cache.max_bytes)
+    
+    def test_disk_cache_survives_restart(self):
+        with tempfile.TemporaryDirectory() as directory:
+            module = UkrenergoSpeechModule(speech_key="test_key", region="test_region",
+                                           audio_cache_dir=directory)
+            module.text_to_speech("Привіт")
+            self.assertEqual(module.usage_stats['tts_requests'], 1)
+            
+            # Новий процес з порожнім кешем у пам'яті читає аудіо з диска без синтезу
+            restarted = UkrenergoSpeechModule(speech_key="test_key", region="test_region",
+                                              audio_cache_dir=directory)
+            self.assertEqual(restarted.text_to_speech("Привіт"), b'mock_audio_data')
+            self.assertEqual(restarted.usage_stats['tts_requests'], 0)
+            self.assertEqual(restarted.get_usage_statistics()['disk_cache_bytes_saved'], len(b'mock_audio_data'))
+    
+    def test_disk_cache_failure_does_not_fail_synthesis(self):
+        with tempfile.TemporaryDirectory() as directory:
+            module = UkrenergoSpeechModule(speech_key="test_key", region="test_region",
+                                           audio_cache_dir=directory)
+            with patch('modules.audio_disk_cache.os.replace', side_effect=OSError(errno.ENOSPC, "No space left on device")):
+                self.assertEqual(module.text_to_speech("Привіт"), b'mock_audio_data')
+            self.assertEqual(module.disk_cache.errors, 1)
+    
+    def test_unavailable_disk_cache_dir_disables_disk_tier(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Каталог неможливо створити: на місці батьківського каталогу файл
+            blocker = os.path.join(directory, 'file')
+            with open(blocker, 'w') as f:
+                f.write('')
+            with self.assertLogs('modules.speech_module', level='WARNING'):
+                module = UkrenergoSpeechModule(speech_key="test_key", region="test_region",
+                                               audio_cache_dir=os.path.join(blocker, 'tts'))
+            self.assertIsNone(module.disk_cache)
+            self.assertEqual(module.text_to_speech("Привіт"), b'mock_audio_data')
+    
+    def test_synthesizer_is_reused(self):
+        with patch.object(MockSpeechSDK, 'SpeechSynthesizer', wraps=MockSpeechSynthesizer) as synthesizer_class:
+            self.module.warm_up()
+            self.module.text_to_speech("перше")
+            self.module.text_to_speech("друге")
+        
+        # Запити використали синтезатори, підготовлені warm_up, нових не створено
+        self.assertEqual(synthesizer_class.call_count, 2)
+        stats = self.module.get_usage_statistics()
+        self.assertEqual(stats['synthesizers_created'], 2)
+        self.assertEqual(stats['synthesizers_reused'], 2)
+        self.assertGreaterEqual(stats['synthesizer_latency_saved_ms'], 0)
+    
+    def test_voice_does_not_mutate_shared_config(self):
+        self.module.text_to_speech("Привіт", voice="uk-UA-OstapNeural")
+        self.assertEqual(self.module.speech_config.speech_synthesis_voice_name, "uk-UA-PolinaNeural")
+        self.assertEqual(self.module._synthesis_config("uk-UA-OstapNeural").speech_synthesis_voice_name,
+                         "uk-UA-OstapNeural")
+        # Без явного голосу використовується голос за замовчуванням, а не попередній
+        self.assertIn('name="uk-UA-PolinaNeural"', self.module._create_ssml("Привіт", 0, 0))
+    
+    def test_concurrent_synthesis_with_different_voices(self):
+        barrier = threading.Barrier(4)
+        
+        class VoiceSynthesizer(MockSpeechSynthesizer):
+            """Аудіо - назва голосу конфігурації, з якою створено синтезатор"""
+            def __init__(self, speech_config, audio_config):
+                self.voice = speech_config.speech_synthesis_voice_name
+            def speak_ssml_async(self, ssml):
+                barrier.wait(timeout=5)
+                mock_result = MagicMock(reason=8, audio_data=self.voice.encode('utf-8'))
+                return MagicMock(get=MagicMock(return_value=mock_result))
+        
+        voices = ["uk-UA-PolinaNeural", "uk-UA-OstapNeural"] * 2
+        with patch.object(MockSpeechSDK, 'SpeechSynthesizer', VoiceSynthesizer):
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                results = list(executor.map(
+                    lambda item: self.module.text_to_speech(f"Текст {item[0]}", voice=item[1]),
+                    enumerate(voices)
+                ))
+        
+        # Усі чотири синтези виконувались одночасно, кожен - своїм голосом
+        self.assertEqual(results, [voice.encode('utf-8') for voice in voices])
+        self.assertEqual(self.module.usage_stats['tts_requests'], 4)
+    
+    def test_text_to_speech_async(self):
+        future = self.module.text_to_speech_async("Привіт")
+        self.assertEqual(future.result(timeout=5), b'mock_audio_data')
+        self.assertEqual(self.module.usage_stats['tts_requests'], 1)
+        
+        # Аудіо з кешу - одразу завершений Future
+        cached = self.module.text_to_speech_async(" привіт ")
+        self.assertTrue(cached.done())
+        self.assertEqual(cached.result(), b'mock_audio_data')
+        stats = self.module.audio_cache.get_statistics()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+    
+    def test_async_error_is_returned_through_future(self):
+        speech_module.st.error.reset_mock()
+        failing = MagicMock(side_effect=RuntimeError("немає мережі"))
+        with patch.object(MockSpeechSynthesizer, 'speak_ssml_async', failing):
+            future = self.module.text_to_speech_async("Привіт")
+            with self.assertRaises(SynthesisError) as raised:
+                future.result(timeout=5)
+        self.assertIn("немає мережі", str(raised.exception))
+        # Потік executor не звертається до Streamlit: помилку показує викликач
+        speech_module.st.error.assert_not_called()
+        
+        with patch.object(MockSpeechSynthesizer, 'speak_ssml_async', failing):
+            self.assertIsNone(self.module.text_to_speech("Привіт"))
+        speech_module.st.error.assert_called_once()
     
     @patch('modules.speech_module.tempfile.NamedTemporaryFile')
     def test_speech_to_text_success(self, mock_tempfile):
@@ -98,5 +235,23 @@ class TestUkrenergoSpeechModule(unittest.TestCase):
         self.assertIn('<audio controls autoplay', html)
         self.assertIn('data:audio/wav;base64,bW9ja19hdWRpb19kYXRh', html)
 
+    def test_get_speech_module_creates_one_instance(self):
+        created = []
+
+        def slow_module(**kwargs):
+            # Повільне створення розширює вікно для гонки потоків
+            time.sleep(0.05)
+            created.append(MagicMock())
+            return created[-1]
+
+        with patch.object(speech_module, 'speech_module', None), \
+                patch.object(speech_module, 'UkrenergoSpeechModule', side_effect=slow_module):
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                instances = list(executor.map(lambda _: speech_module.get_speech_module(), range(8)))
+
+        self.assertEqual(len(created), 1)
+        self.assertTrue(all(instance is created[0] for instance in instances))
+        created[0].warm_up.assert_called_once_with()
+
 if __name__ == '__main__':
     unittest.main()
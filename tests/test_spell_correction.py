@@ -0,0 +1,62 @@
+"""
+Тести для модулю spell_correction.py
+"""
+
+import unittest
+from modules.spell_correction import SpellCorrector, deletes, edit_distance
+from modules.text_processing import normalize_text
+
+VOCABULARY = normalize_text(
+    "Як оплатити рахунок? Що робити при відключенні електроенергії? "
+    "Як передати показники лічильника? Тарифи квитанція квитанції"
+).split()
+
+
+class TestEditDistance(unittest.TestCase):
+
+    def test_distances(self):
+        self.assertEqual(edit_distance("тариф", "тариф", 2), 0)
+        self.assertEqual(edit_distance("тарф", "тариф", 2), 1)
+        self.assertEqual(edit_distance("тарииф", "тариф", 2), 1)
+        self.assertEqual(edit_distance("тфрив", "тариф", 2), 2)
+        # Перестановка сусідніх символів - одне редагування
+        self.assertEqual(edit_distance("тарфи", "тариф", 2), 1)
+
+    def test_distance_above_limit(self):
+        self.assertEqual(edit_distance("рахунок", "лічильник", 2), 3)
+        self.assertEqual(edit_distance("а", "абвгд", 1), 2)
+
+    def test_deletes(self):
+        self.assertEqual(deletes("абв", 1), {"абв", "бв", "ав", "аб"})
+        self.assertIn("в", deletes("абв", 2))
+
+
+class TestSpellCorrector(unittest.TestCase):
+
+    def setUp(self):
+        self.corrector = SpellCorrector(VOCABULARY)
+
+    def test_corrects_near_misses(self):
+        self.assertEqual(self.corrector.correct_word("рахунак"), "рахунок")
+        self.assertEqual(self.corrector.correct_word("лічильніка"), "лічильника")
+        self.assertEqual(self.corrector.correct_word("електроенергиї"), "електроенергії")
+
+    def test_keeps_known_and_unknown_words(self):
+        # Відома словоформа (основа є у словнику) не змінюється
+        self.assertEqual(self.corrector.correct_word("показникі"), "показникі")
+        self.assertEqual(self.corrector.correct_word("погода"), "погода")
+        self.assertEqual(self.corrector.correct_word("як"), "як")
+
+    def test_prefers_frequent_word(self):
+        corrector = SpellCorrector(["квитанція", "квитанції", "квитанції"])
+        self.assertEqual(corrector.correct_word("квитанціє"), "квитанції")
+
+    def test_correct_text(self):
+        self.assertEqual(
+            self.corrector.correct_text("як аплатити рахунак"),
+            "як оплатити рахунок"
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Тести для модулю synthesizer_pool.py
+"""
+
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from modules.synthesizer_pool import SynthesizerPool
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestSynthesizerPool(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.create = MagicMock(side_effect=lambda key: object())
+        self.connections = []
+        self.connect = MagicMock(side_effect=self.open_connection)
+        # Без фонового потоку: з'єднання оновлюються явним викликом refresh_idle
+        self.pool = SynthesizerPool(self.create, connect=self.connect, size=2,
+                                    idle_timeout=60, refresh_interval=None, clock=self.clock)
+
+    def open_connection(self, synthesizer) -> MagicMock:
+        connection = MagicMock()
+        self.connections.append(connection)
+        return connection
+
+    def test_reuses_released_synthesizer(self):
+        with self.pool.acquire('polina') as first:
+            pass
+        with self.pool.acquire('polina') as second:
+            pass
+        self.assertIs(first, second)
+        self.assertEqual(self.create.call_count, 1)
+
+        stats = self.pool.get_statistics()
+        self.assertEqual(stats['created'], 1)
+        self.assertEqual(stats['reused'], 1)
+        self.assertEqual(stats['preconnected'], 1)
+        self.assertAlmostEqual(stats['latency_saved_ms'], stats['average_setup_ms'])
+
+    def test_keys_are_separate(self):
+        with self.pool.acquire('polina') as polina:
+            pass
+        with self.pool.acquire('ostap') as ostap:
+            pass
+        self.assertIsNot(polina, ostap)
+        self.create.assert_any_call('polina')
+        self.create.assert_any_call('ostap')
+
+    def test_warm_up_preconnects(self):
+        self.pool.warm_up(['polina'])
+        self.assertEqual(self.pool.idle_count('polina'), 2)
+        self.assertEqual(self.connect.call_count, 2)
+        with self.pool.acquire('polina'):
+            pass
+        self.assertEqual(self.create.call_count, 2)
+        self.assertEqual(self.pool.get_statistics()['reused'], 1)
+
+    def test_concurrent_acquire_is_bounded(self):
+        with self.pool.acquire('polina') as first, self.pool.acquire('polina') as second, \
+                self.pool.acquire('polina') as third:
+            self.assertEqual(len({id(first), id(second), id(third)}), 3)
+        # Зайвий синтезатор відкидається після повернення разом із з'єднанням
+        self.assertEqual(self.pool.idle_count('polina'), 2)
+        self.assertEqual(sum(connection.close.call_count for connection in self.connections), 1)
+
+    def test_reconnects_idle_off_request_path(self):
+        with self.pool.acquire('polina'):
+            pass
+        self.clock.now = 30
+        self.pool.refresh_idle()
+        self.assertEqual(self.connect.call_count, 1)
+
+        # Запит після простою не чекає на підключення
+        self.clock.now = 100
+        with self.pool.acquire('polina'):
+            pass
+        self.assertEqual(self.connect.call_count, 1)
+
+        self.clock.now = 200
+        old_connection = self.pool._idle['polina'][0].connection
+        self.pool.refresh_idle()
+        self.assertEqual(self.connect.call_count, 2)
+        old_connection.close.assert_called_once()
+        self.assertEqual(self.pool.idle_count('polina'), 1)
+        self.assertEqual(self.pool.get_statistics()['reconnected'], 1)
+
+    def test_background_refresh(self):
+        pool = SynthesizerPool(self.create, connect=self.connect, size=1, idle_timeout=0.05, refresh_interval=0.01)
+        with pool.acquire('polina'):
+            pass
+        old_connection = pool._idle['polina'][0].connection
+
+        deadline = time.monotonic() + 5
+        while pool.get_statistics()['reconnected'] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        pool.close()
+
+        self.assertGreaterEqual(pool.get_statistics()['reconnected'], 1)
+        old_connection.close.assert_called_once()
+        self.assertEqual(pool.idle_count('polina'), 0)
+
+    def test_connect_error_does_not_block_synthesis(self):
+        self.connect.side_effect = RuntimeError("немає мережі")
+        with self.pool.acquire('polina') as synthesizer:
+            self.assertIsNotNone(synthesizer)
+        stats = self.pool.get_statistics()
+        self.assertEqual(stats['connect_errors'], 1)
+        self.assertEqual(stats['preconnected'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+"""
+Тести для модулю text_processing.py
+"""
+
+import unittest
+from modules.text_processing import normalize_text, prepare_text, stem
+
+
+class TestTextProcessing(unittest.TestCase):
+
+    def test_normalize_text(self):
+        self.assertEqual(normalize_text("Привіт,   як справи?"), "привіт як справи")
+
+    def test_stem_word_forms(self):
+        self.assertEqual(stem("рахунку"), stem("рахунки"))
+        self.assertEqual(stem("рахунок"), stem("рахунків"))
+        self.assertEqual(stem("відключення"), stem("відключили"))
+        self.assertEqual(stem("аварія"), stem("аварію"))
+
+    def test_stem_keeps_derivational_suffix_of_short_stems(self):
+        self.assertNotEqual(stem("запитання"), stem("запит"))
+        self.assertEqual(stem("підключення"), stem("підключити"))
+
+    def test_stem_keeps_short_words(self):
+        self.assertEqual(stem("як"), "як")
+        self.assertEqual(stem("про"), "про")
+
+    def test_prepare_text(self):
+        self.assertEqual(prepare_text("Де мій рахунок?"), "де мій рахунк")
+
+
+if __name__ == '__main__':
+    unittest.main()